@@ -1,7 +1,18 @@
-"""Entry point for the program."""
+"""Entry point for the program.
+
+Cli2Gui and Click2Gui are loaded on first access so that `import cli2gui` stays cheap.
+"""
 
 from __future__ import annotations
 
-from cli2gui.decorators import Cli2Gui, Click2Gui
+__all__ = ["Cli2Gui", "Click2Gui"]
+
+
+def __getattr__(name: str) -> object:
+	"""Load Cli2Gui and Click2Gui from cli2gui.decorators on first access."""
+	if name in __all__:
+		from cli2gui import decorators
 
-_ = (Cli2Gui, Click2Gui)
+		return getattr(decorators, name)
+	msg = f"module {__name__!r} has no attribute {name!r}"
+	raise AttributeError(msg)
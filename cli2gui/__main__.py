@@ -0,0 +1,10 @@
+"""Command line for cli2gui tools, eg. python -m cli2gui inspect module:function."""
+
+from __future__ import annotations
+
+import sys
+
+from cli2gui.inspector import main
+
+if __name__ == "__main__":
+	sys.exit(main())
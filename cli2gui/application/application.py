@@ -4,13 +4,15 @@ from __future__ import annotations
 
 import logging
 import sys
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from cli2gui import models
+from cli2gui import models, trace
 from cli2gui.application.application2args import argFormat
-from cli2gui.gui import helpers
-from cli2gui.gui.dearpygui_wrapper import DearPyGuiWrapper
-from cli2gui.gui.pysimplegui_wrapper import PySimpleGUIWrapper
+from cli2gui.application.worker import JobRunner
+from cli2gui.gui import helpers, registry
+
+if TYPE_CHECKING:
+	from cli2gui.application.batch import BatchRunner
 
 
 def run(buildSpec: models.FullBuildSpec) -> Any:
@@ -26,37 +28,58 @@ def run(buildSpec: models.FullBuildSpec) -> Any:
 	# Set the theme
 	theme = helpers.get_base24_theme(buildSpec.theme, buildSpec.darkTheme)
 
-	buildSpec.gui = buildSpec.gui.replace("pysimplegui", "psg").replace("freesimplegui", "fsg")
-
-	if buildSpec.gui in [
-		"psg",
-		"psgqt",
-		"psgweb",
-		"fsg",
-		# "fsgqt",  # cannot test on windows
-		# "fsgweb", # bug in remi prevents this from working
-	]:
-		gui_wrapper = PySimpleGUIWrapper
-	else:
-		gui_wrapper = DearPyGuiWrapper
-
-	if gui_wrapper is PySimpleGUIWrapper:
-		gui = gui_wrapper(theme, buildSpec.gui)
-	elif gui_wrapper is DearPyGuiWrapper:
-		gui = gui_wrapper(theme)
+	# Only the selected backend (and its dependencies) is imported
+	with trace.span("loadBackend", gui=str(buildSpec.gui)):
+		gui_factory = registry.loadBackend(buildSpec.gui)
+		buildSpec.gui = buildSpec.gui.replace("pysimplegui", "psg").replace("freesimplegui", "fsg")
+		gui = gui_factory(theme, buildSpec.gui)
+
+	runner = JobRunner(gui.concurrentJobs)
+	# Started on the first batch run
+	batchRunners: list[BatchRunner] = []
 
 	def quit_callback() -> None:
+		for batchRunner in batchRunners:
+			batchRunner.shutdown()
+		runner.shutdown()
 		sys.exit(0)
 
-	def run_callback(values: dict[str, Any]) -> None:
-		args = argFormat(values, buildSpec.parser)
+	def run_callback(values: dict[str, Any], decoders: dict[str, models.Decoder]) -> Any:
+		args = argFormat(values, buildSpec.parser, decoders, buildSpec.file_handles)
 		if not buildSpec.run_function:
 			return args
-		buildSpec.run_function(args)
-		return None
+		return runner.submit(buildSpec.run_function, args)
+
+	def batch_callback(
+		values: dict[str, Any], decoders: dict[str, models.Decoder], tablePath: str
+	) -> list[models.BatchRow]:
+		from cli2gui.application import batch
+
+		if not batchRunners:
+			batchRunners.append(
+				batch.BatchRunner(
+					buildSpec.run_function,
+					buildSpec.parser,
+					buildSpec.batch_workers,
+					buildSpec.file_handles,
+				)
+			)
+		return batchRunners[0].submit(batch.readTable(tablePath), values, decoders)
+
+	def poll_callback() -> list[models.Job | models.BatchRow]:
+		finished: list[models.Job | models.BatchRow] = list(runner.poll())
+		for batchRunner in batchRunners:
+			finished.extend(batchRunner.poll())
+		return finished
 
 	try:
-		gui.main(buildSpec=buildSpec, quit_callback=quit_callback, run_callback=run_callback)
+		gui.main(
+			buildSpec=buildSpec,
+			quit_callback=quit_callback,
+			run_callback=run_callback,
+			poll_callback=poll_callback,
+			batch_callback=batch_callback,
+		)
 
 	except KeyboardInterrupt:
 		logging.error("Application Exited Early!")  # noqa: TRY400
@@ -5,94 +5,263 @@ from __future__ import annotations
 import argparse
 import optparse
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
-from cli2gui.models import SEP, ParserType
+from cli2gui import trace
+from cli2gui.application.files import LazyFile
+from cli2gui.models import SEP, CommandNode, Decoder, FileHandles, Group, ItemType, ParserType
 
 
-def processValue(key: str, value: str) -> tuple[str, Any]:
+def openFile(
+	value: str, decoder: Decoder, fileHandles: str | FileHandles = FileHandles.EAGER
+) -> Any:
+	"""Open a file with the mode and encoding of the item, or get a LazyFile for it."""
+	mode = decoder.file_mode or ("w" if decoder.type == ItemType.FileWrite else "r")
+	if fileHandles != FileHandles.EAGER:
+		return LazyFile(value, mode, decoder.file_encoding, useMmap=fileHandles == FileHandles.MMAP)
+	if "b" in mode:
+		return Path(value).open(mode=mode)
+	return Path(value).open(mode=mode, encoding=decoder.file_encoding)
+
+
+# Converter for each item type (files are opened with openFile), values of other types
+# are passed through as they are
+CONVERTERS: dict[ItemType, Callable[[Any], Any]] = {
+	ItemType.Bool: bool,
+	ItemType.Path: Path,
+	ItemType.Int: int,
+	ItemType.Float: float,
+}
+FILE_TYPES = (ItemType.File, ItemType.FileWrite)
+# Decoder for values that are not from an item, such as the defaults of a subcommand
+VERBATIM = Decoder(ItemType.Text, verbatim=True)
+
+
+def buildDecoders(groups: list[Group]) -> dict[str, Decoder]:
+	"""Build a decoder for each item (including those in radio groups), keyed by dest.
+
+	:param list[Group] groups: widgets of the parser (or subcommand)
+	:return dict[str, Decoder]: decoder for each dest
+	"""
+	decoders = {}
+	for group in groups:
+		for item in group.arg_items:
+			members = (
+				item.additional_properties["radio"] if item.type == ItemType.RadioGroup else [item]
+			)
+			for member in members:
+				if member.dest:
+					props = member.additional_properties or {}
+					decoders[member.dest] = Decoder(
+						member.type,
+						props.get("file_mode"),
+						props.get("file_encoding"),
+						flag=props.get("is_flag", True),
+						off_opt=next(iter(props.get("secondary_opts") or ()), None),
+					)
+		decoders.update(buildDecoders(group.groups))
+	return decoders
+
+
+def commandDecoders(
+	decoders: dict[str, Decoder], commandPath: list[CommandNode]
+) -> dict[str, Decoder]:
+	"""Add the decoders for the items of each selected subcommand to those of the parser.
+	The values of each subcommand (its name and defaults) are passed verbatim, unless
+	an item has the same dest.
+
+	:param dict[str, Decoder] decoders: decoders for the parser
+	:param list[CommandNode] commandPath: the selected subcommands
+	:return dict[str, Decoder]: decoders for the parser and the selected subcommands
+	"""
+	decoders = dict(decoders)
+	for node in commandPath:
+		decoders.update(buildDecoders(node.load().widgets))
+	for node in commandPath:
+		for key in node.values:
+			decoders.setdefault(key, VERBATIM)
+	return decoders
+
+
+def decodeValue(
+	value: Any, decoder: Decoder | None, fileHandles: str | FileHandles = FileHandles.EAGER
+) -> Any:
+	"""Convert the value of an item with its decoder, empty values become None.
+
+	:param Any value: value from the gui
+	:param Decoder | None decoder: decoder for the item, None for values that are not from
+	an item (eg. the name of a subcommand)
+	:param str | FileHandles fileHandles: how to open files. Defaults to "eager"
+	:return Any: value for the run_function
+	"""
+	if decoder is None:
+		return value or None
+	if decoder.verbatim:
+		return value
+	if value is None or value == "":
+		return None
+	if decoder.type in FILE_TYPES:
+		return openFile(value, decoder, fileHandles)
+	convert = CONVERTERS.get(decoder.type)
+	return value if convert is None else convert(value)
+
+
+def decodeValues(
+	values: dict[str, Any],
+	decoders: dict[str, Decoder] | None,
+	fileHandles: str | FileHandles = FileHandles.EAGER,
+) -> dict[str, Any]:
+	"""Convert each value keyed by dest with the decoders, or by a key encoding the type
+	(with SEP) when there are no decoders.
+
+	:param dict[str, Any] values: values from the gui
+	:param dict[str, Decoder] | None decoders: decoder for each dest
+	:param str | FileHandles fileHandles: how to open files. Defaults to "eager"
+	:return dict[str, Any]: values for the run_function, keyed by dest
+	"""
+	if decoders is None:
+		return dict(decodeItem(key, value, None, fileHandles) for key, value in values.items())
+	getDecoder = decoders.get
+	return {key: decodeValue(value, getDecoder(key), fileHandles) for key, value in values.items()}
+
+
+def decodeItem(
+	key: str,
+	value: Any,
+	decoders: dict[str, Decoder] | None,
+	fileHandles: str | FileHandles = FileHandles.EAGER,
+) -> tuple[str, Any]:
+	"""Convert a value keyed by dest with the decoders, or by a key encoding the type (with
+	SEP) when there are no decoders.
+	"""
+	if decoders is None:
+		key, decoder = keyDecoder(key)
+	else:
+		decoder = decoders.get(key)
+	return key, decodeValue(value, decoder, fileHandles)
+
+
+def keyDecoder(key: str) -> tuple[str, Decoder | None]:
+	"""Get the dest and a decoder from a key encoding the type of an item, eg.
+	"count#%#ItemType.Int" or "in#%#ItemType.File;rb;utf-8".
+
+	:param str key: dest, SEP and the type (with the file mode and encoding for files)
+	:return tuple[str, Decoder | None]: the dest, and its decoder (None without a type)
+	"""
 	if SEP not in key:
-		return key, value or None
-	key, _type = key.split(SEP, maxsplit=1)
-	if len(str(value)) == 0 or value is None:
 		return key, None
-	if _type == "ItemType.Bool":
-		return key, bool(value)
-	if "ItemType.File" in _type:
-		_, mode, encoding = _type.split(";", maxsplit=2)
-		if "b" in mode:
-			return key, open(value, mode=mode)
-		return key, open(value, mode=mode, encoding=encoding)
-	if _type == "ItemType.Path":
-		return key, Path(value)
-	if _type == "ItemType.Int":
-		return key, int(value)
-	if _type == "ItemType.Text":
-		return key, value
-	if _type == "ItemType.Float":
-		return key, float(value)
-	if _type == "ItemType.List":
-		return key, value
-	if _type == "ItemType.Tuple":
-		return key, value
-	if _type == "ItemType.DateTime":
-		return key, value
-
-	return key, value
-
-
-def argparseFormat(values: dict[str, Any]) -> argparse.Namespace:
+	key, _type = key.split(SEP, maxsplit=1)
+	name, _, fileOptions = _type.partition(";")
+	itemType = ItemType.__members__.get(name.rpartition(".")[2], ItemType.Text)
+	if itemType in FILE_TYPES:
+		mode, _, encoding = fileOptions.partition(";")
+		return key, Decoder(itemType, mode or None, encoding or None)
+	return key, Decoder(itemType)
+
+
+def argparseFormat(
+	values: dict[str, Any],
+	decoders: dict[str, Decoder] | None = None,
+	fileHandles: str | FileHandles = FileHandles.EAGER,
+) -> argparse.Namespace:
 	"""Format args for argparse."""
-	args = {}
-	for key, _value in values.items():
-		cleankey, value = processValue(key, _value)
-		args[cleankey] = value
-	return argparse.Namespace(**args)
+	return argparse.Namespace(**decodeValues(values, decoders, fileHandles))
 
 
-def optparseFormat(values: dict[str, Any]) -> tuple[optparse.Values, list[str]]:
+def optparseFormat(
+	values: dict[str, Any],
+	decoders: dict[str, Decoder] | None = None,
+	fileHandles: str | FileHandles = FileHandles.EAGER,
+) -> tuple[optparse.Values, list[str]]:
 	"""Format args for optparse."""
-	args = {}
-	for key, _value in values.items():
-		cleankey, value = processValue(key, _value)
-		args[cleankey] = value
-	return (optparse.Values(args), [])
+	return (optparse.Values(decodeValues(values, decoders, fileHandles)), [])
 
 
-def getoptFormat(values: dict[str, Any]) -> tuple[list[Any], list[Any]]:
+def getoptFormat(
+	values: dict[str, Any],
+	decoders: dict[str, Decoder] | None = None,
+	fileHandles: str | FileHandles = FileHandles.EAGER,
+) -> tuple[list[Any], list[Any]]:
 	"""Format args for getopt."""
-	return ([processValue(key, _value) for key, _value in values.items() if _value], [])
+	return (
+		[
+			decodeItem(key, _value, decoders, fileHandles)
+			for key, _value in values.items()
+			if _value
+		],
+		[],
+	)
 
 
-def docoptFormat(values: dict[str, Any]) -> dict[str, Any]:
+def docoptFormat(
+	values: dict[str, Any],
+	decoders: dict[str, Decoder] | None = None,
+	fileHandles: str | FileHandles = FileHandles.EAGER,
+) -> dict[str, Any]:
 	"""Format args for docopt."""
 	import docopt
 
-	args = {}
-	for key, _value in values.items():
-		cleankey, value = processValue(key, _value)
-		args[cleankey] = value
-	return docopt.Dict(args)
+	return docopt.Dict(decodeValues(values, decoders, fileHandles))
+
 
+def clickFormat(
+	values: dict[str, Any],
+	decoders: dict[str, Decoder] | None = None,
+	fileHandles: str | FileHandles = FileHandles.EAGER,
+) -> list[Any]:
+	"""Format args for click.
+
+	Values of subcommands are keyed by their path (see click2json.pathKey), the args of each
+	group go before the name of the selected subcommand, then the args of that subcommand.
+	Flags are passed (without a value) when set, or their secondary opt (eg. --no-shout)
+	when unset. Bool options that are not flags are passed with true or false.
+	"""
+	from cli2gui.tojson.click2json import COMMAND
 
-def clickFormat(values: dict[str, Any]) -> list[Any]:
-	"""Format args for click."""
-	args = []
+	# Args for the program and each selected subcommand, keyed by path eg. "db migrate"
+	levels: dict[str, list[Any]] = {}
 	for key, _value in values.items():
 		val = str(_value)
 		if not callable(key) and len(val) > 0:
-			cleankey, value = processValue(key, _value)
-			args.extend([cleankey, value])
-	return args
+			cleankey, value = decodeItem(key, _value, decoders, fileHandles)
+			path, _, name = cleankey.rpartition(" ")
+			args = levels.setdefault(path, [])
+			if name == COMMAND:
+				args.insert(0, value)
+			elif isinstance(value, bool):
+				decoder = decoders.get(key) if decoders else None
+				if decoder is not None and not decoder.flag:
+					args.extend([name, "true" if value else "false"])
+				elif value:
+					args.append(name)
+				elif decoder is not None and decoder.off_opt:
+					# On/off flags may default to on
+					args.append(decoder.off_opt)
+			else:
+				args.extend([name, value])
+	# The selected subcommands are a chain, so deeper paths are longer
+	return [arg for path in sorted(levels, key=len) for arg in levels[path]]
 
 
-def argFormat(values: dict[str, Any], argumentParser: str | ParserType) -> Any:
+@trace.traced("argFormat")
+def argFormat(
+	values: dict[str, Any],
+	argumentParser: str | ParserType,
+	decoders: dict[str, Decoder] | None = None,
+	fileHandles: str | FileHandles = FileHandles.EAGER,
+) -> Any:
 	"""Format the args for the desired parser.
 
 	Args:
 	----
 		values (dict[str, Any]): values from simple gui
 		argumentParser (str): argument parser to use
+		decoders (dict[str, Decoder], optional): decoder for each dest, built once with
+		buildDecoders. Without these the keys of values must encode the type of each item
+		(dest, SEP and type) as they are decoded on every call. Defaults to None.
+		fileHandles (str, optional): how to pass File/ FileWrite arguments, "eager" opens
+		them now, "lazy" passes a LazyFile that opens on first use, "mmap" is as lazy but
+		memory-maps files opened to read as bytes. Defaults to "eager".
 
 	Returns:
 	-------
@@ -108,5 +277,5 @@ def argFormat(values: dict[str, Any], argumentParser: str | ParserType) -> Any:
 		ParserType.CLICK: clickFormat,
 	}
 	if argumentParser in convertMap:
-		return convertMap[argumentParser](values)
+		return convertMap[argumentParser](values, decoders, fileHandles)
 	return None
@@ -0,0 +1,315 @@
+"""Run the run_function once per row of a table of values, on a pool of worker processes.
+
+The table is a csv file (with a header row) or a jsonl file (one json object per line).
+Columns are matched to the dest of each argument, columns that are not in a row take the
+value from the form. FileWrite values may be templates formatted with the row, eg.
+"out/{name}.txt" or "out/{index}.txt" ({index} is the row number, starting at 1).
+
+Csv cells are strings, those of Bool arguments are parsed with parseBool (jsonl rows
+may use true and false).
+
+Each row is formatted with argFormat in the worker process, so files are opened there.
+Workers report each row they start on a queue, which the GUI thread reads as it polls, so
+a row shows as running once (and only once) a worker has taken it.
+The run_function must be picklable (eg. defined at the top level of a module). Worker
+processes are spawned, so each one imports the main module of the tool again (as
+__mp_main__, with the same sys.argv): code at the top level of the tool runs again in each
+worker, and should be under `if __name__ == "__main__":`. A decorated function called
+there does nothing (rather than opening a gui in each worker), see cli2gui.decorators.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import csv
+import io
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from cli2gui.application.application2args import argFormat
+from cli2gui.application.files import closeFiles
+from cli2gui.models import BatchRow, Decoder, FileHandles, ItemType, JobState, ParserType
+
+if TYPE_CHECKING:
+	from multiprocessing.queues import Queue
+
+# Characters of output kept for each row
+MAX_OUTPUT = 4096
+# Values of a Bool cell, compared in lower case
+TRUE_VALUES = frozenset({"true", "1", "yes"})
+FALSE_VALUES = frozenset({"false", "0", "no", ""})
+
+logger = logging.getLogger(__name__)
+
+# State of a worker process, set by startWorker
+_state: dict[str, Any] = {"started": None}
+
+
+def readTable(tablePath: str) -> list[dict[str, Any]]:
+	"""Read a csv or jsonl (.jsonl or .ndjson) file of values.
+
+	:param str tablePath: path to the file
+	:return list[dict[str, Any]]: a dict of values for each row, keyed by column
+	"""
+	path = Path(tablePath)
+	with path.open(encoding="utf-8", newline="") as file:
+		if path.suffix.lower() in (".jsonl", ".ndjson"):
+			return [json.loads(line) for line in file if line.strip()]
+		return list(csv.DictReader(file))
+
+
+def parseBool(value: str) -> bool:
+	"""Parse the value of a Bool cell, one of true/false, 1/0, yes/no or empty (False).
+
+	:param str value: value of the cell
+	:raises ValueError: for any other value
+	:return bool: the value
+	"""
+	lowered = value.strip().lower()
+	if lowered in TRUE_VALUES:
+		return True
+	if lowered in FALSE_VALUES:
+		return False
+	msg = f"Not a bool (true/false, 1/0, yes/no or empty): {value!r}"
+	raise ValueError(msg)
+
+
+def startWorker(started: Queue[int]) -> None:
+	"""Set up a worker process, the initializer of the pool.
+
+	:param Queue[int] started: queue to put the id of each row started on
+	"""
+	_state["started"] = started
+
+
+def runRow(
+	function: Callable[..., Any],
+	values: dict[str, Any],
+	parserType: str | ParserType,
+	decoders: dict[str, Decoder],
+	fileHandles: str | FileHandles = FileHandles.EAGER,
+	rowId: int | None = None,
+) -> tuple[bool, str, str, float]:
+	"""Run the function with the args for a row, in a worker process.
+
+	:param Callable[..., Any] function: the run_function
+	:param dict[str, Any] values: values keyed by dest
+	:param str | ParserType parserType: parser to format the args for
+	:param dict[str, Decoder] decoders: decoder for each dest
+	:param str | FileHandles fileHandles: how to open files. Defaults to "eager"
+	:param int | None rowId: id reported on the started queue (see startWorker). Defaults
+	to None
+	:return tuple[bool, str, str, float]: did it succeed, the error, the output, and the
+	seconds it ran for (clocks of different processes are not comparable, so the start time
+	is worked out from this)
+	"""
+	start = time.perf_counter()
+	if rowId is not None and _state["started"] is not None:
+		_state["started"].put(rowId)
+	output = io.StringIO()
+	error = ""
+	args = None
+	with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+		try:
+			args = argFormat(values, parserType, decoders, fileHandles)
+		except (OSError, TypeError, ValueError) as exc:
+			# Values that do not convert, or files that do not open
+			traceback.print_exc()
+			error = repr(exc)
+		else:
+			try:
+				function(args)
+			except SystemExit as exc:
+				# Tools (and click in standalone mode) commonly finish with sys.exit
+				if exc.code not in (None, 0):
+					error = f"exited with {exc.code}"
+			except Exception as exc:
+				# Logged to stderr (the output of the row) unless the tool set up logging
+				logger.exception("Row failed: ")
+				error = repr(exc)
+			finally:
+				closeFiles(args)
+	return not error, error, output.getvalue()[-MAX_OUTPUT:], time.perf_counter() - start
+
+
+class BatchRunner:
+	"""Run a row at a time per worker process and report finished rows to the GUI thread."""
+
+	def __init__(
+		self,
+		function: Callable[..., Any],
+		parserType: str | ParserType,
+		maxWorkers: int = 0,
+		fileHandles: str | FileHandles = FileHandles.EAGER,
+	) -> None:
+		"""Run the function once per row on a pool of worker processes.
+
+		:param Callable[..., Any] function: the run_function
+		:param str | ParserType parserType: parser to format the args for
+		:param int maxWorkers: number of worker processes, 0 for one per cpu. Defaults to 0
+		:param str | FileHandles fileHandles: how to open files. Defaults to "eager"
+		"""
+		self.function = function
+		self.parserType = parserType
+		self.fileHandles = fileHandles
+		self.maxWorkers = maxWorkers or os.cpu_count() or 1
+		self._executor: ProcessPoolExecutor | None = None
+		self._completed: queue.SimpleQueue[BatchRow] = queue.SimpleQueue()
+		# Rows submitted and not yet started, by id. Ids of rows that start are put on
+		# _started by the worker processes
+		self._pending: dict[int, BatchRow] = {}
+		self._rowIds = itertools.count()
+		self._context = multiprocessing.get_context("spawn")
+		self._started: Queue[int] | None = None
+		# Guards _pending and the state of rows, set by poll and by _done (on a thread of the
+		# executor)
+		self._lock = threading.Lock()
+
+	def submit(
+		self,
+		rows: list[dict[str, Any]],
+		formValues: dict[str, Any],
+		decoders: dict[str, Decoder],
+	) -> list[BatchRow]:
+		"""Queue a run for each row.
+
+		:param list[dict[str, Any]] rows: values for each row, keyed by dest
+		:param dict[str, Any] formValues: values from the gui, keyed by dest. Used for
+		anything not in a row
+		:param dict[str, Decoder] decoders: decoder for each dest
+		:raises ValueError: if a column does not match the dest of an argument
+		:return list[BatchRow]: a row for each run, the state is updated as each one runs
+		"""
+		unknown = {column for row in rows for column in row if column not in formValues}
+		if unknown:
+			msg = f"Columns do not match any argument: {sorted(unknown)}"
+			raise ValueError(msg)
+
+		batchRows = []
+		for index, row in enumerate(rows, start=1):
+			batchRow = BatchRow(index=index, values=row)
+			batchRows.append(batchRow)
+			try:
+				values = self.rowValues(index, row, formValues, decoders)
+			except (KeyError, IndexError, ValueError) as exc:
+				batchRow.state = JobState.FAILED
+				batchRow.error = f"Bad value: {exc!r}"
+				self._completed.put(batchRow)
+				continue
+			rowId = next(self._rowIds)
+			with self._lock:
+				self._pending[rowId] = batchRow
+			future = self._submit(values, decoders, rowId)
+			future.add_done_callback(
+				lambda future, batchRow=batchRow, rowId=rowId: self._done(batchRow, rowId, future)
+			)
+		return batchRows
+
+	def _submit(
+		self, values: dict[str, Any], decoders: dict[str, Decoder], rowId: int
+	) -> Future[tuple[bool, str, str, float]]:
+		"""Submit a run to the pool, starting it (again if a worker process died) as needed."""
+		args = (runRow, self.function, values, self.parserType, decoders, self.fileHandles, rowId)
+		if self._executor is not None:
+			try:
+				return self._executor.submit(*args)
+			except BrokenProcessPool:
+				self._executor.shutdown(wait=False)
+		if self._started is None:
+			self._started = self._context.Queue()
+		# Spawn rather than fork, forking a process running a gui is not safe
+		self._executor = ProcessPoolExecutor(
+			self.maxWorkers,
+			mp_context=self._context,
+			initializer=startWorker,
+			initargs=(self._started,),
+		)
+		return self._executor.submit(*args)
+
+	def rowValues(
+		self,
+		index: int,
+		row: dict[str, Any],
+		formValues: dict[str, Any],
+		decoders: dict[str, Decoder],
+	) -> dict[str, Any]:
+		"""Get the values for a row, with Bool cells parsed and FileWrite templates
+		formatted.
+
+		:param int index: row number
+		:param dict[str, Any] row: values for the row, keyed by dest
+		:param dict[str, Any] formValues: values from the gui
+		:param dict[str, Decoder] decoders: decoder for each dest
+		:raises ValueError: if a Bool cell is not a bool, or a template is not valid
+		:return dict[str, Any]: values to pass to argFormat
+		"""
+		values = {**formValues, **row}
+		for dest, value in row.items():
+			decoder = decoders.get(dest)
+			if decoder and decoder.type == ItemType.Bool and isinstance(value, str):
+				values[dest] = parseBool(value)
+		for dest, value in values.items():
+			decoder = decoders.get(dest)
+			if decoder and decoder.type == ItemType.FileWrite and isinstance(value, str) and value:
+				values[dest] = value.format_map({**row, "index": index})
+		return values
+
+	def poll(self) -> list[BatchRow]:
+		"""Get the rows that started or finished since the last call, never blocks.
+
+		:return list[BatchRow]: rows that started (in the state RUNNING) or finished (in the
+		state DONE or FAILED)
+		"""
+		changed = []
+		# Only the gui thread takes from the queues, so they are not emptied between the calls
+		while self._started is not None and not self._started.empty():
+			rowId = self._started.get_nowait()
+			with self._lock:
+				batchRow = self._pending.pop(rowId, None)
+				if batchRow is not None:
+					batchRow.state = JobState.RUNNING
+					batchRow.started = time.perf_counter()
+					changed.append(batchRow)
+		while not self._completed.empty():
+			changed.append(self._completed.get_nowait())
+		return changed
+
+	def shutdown(self) -> None:
+		"""Cancel the rows that have not started and stop the worker processes, terminating
+		any that are running a row (otherwise the program waits for them as it exits).
+		"""
+		if self._executor is not None:
+			processes = list((self._executor._processes or {}).values())  # noqa: SLF001
+			self._executor.shutdown(wait=False, cancel_futures=True)
+			for process in processes:
+				process.terminate()
+			self._executor = None
+
+	def _done(
+		self, batchRow: BatchRow, rowId: int, future: Future[tuple[bool, str, str, float]]
+	) -> None:
+		"""Record the result of a row, called on a thread of the executor."""
+		with self._lock:
+			self._pending.pop(rowId, None)
+			batchRow.finished = time.perf_counter()
+			if future.cancelled():
+				batchRow.state, batchRow.error = JobState.FAILED, "cancelled"
+			elif future.exception() is not None:
+				# eg. the run_function could not be pickled or the worker process died
+				batchRow.state, batchRow.error = JobState.FAILED, repr(future.exception())
+			else:
+				succeeded, batchRow.error, batchRow.output, seconds = future.result()
+				batchRow.state = JobState.DONE if succeeded else JobState.FAILED
+				batchRow.started = batchRow.finished - seconds
+		self._completed.put(batchRow)
@@ -0,0 +1,137 @@
+"""File handles for File/ FileWrite arguments that open on first use.
+
+With file_handles="lazy" (or "mmap") the run_function gets a LazyFile for each file
+argument in place of an open file. Files that are never used are never opened, and a file
+to write to is not truncated until the run first uses it. With "mmap", files opened to read
+as bytes are memory-mapped so large inputs are not copied into memory up front, falling
+back to a regular file for those that cannot be mapped (eg. empty files or pipes).
+
+The job closes any LazyFile in its args once it ends.
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import optparse
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:
+	from typing_extensions import Self
+
+
+class LazyFile:
+	"""Proxy for a file, opened on first use of any attribute other than name and mode."""
+
+	def __init__(
+		self,
+		path: str,
+		mode: str = "r",
+		encoding: str | None = None,
+		*,
+		useMmap: bool = False,
+	) -> None:
+		"""Proxy for a file, opened on first use.
+
+		:param str path: path to the file
+		:param str mode: mode to open the file with. Defaults to "r"
+		:param str | None encoding: encoding (for text modes). Defaults to None
+		:param bool useMmap: memory-map the file if it is opened to read as bytes.
+		Defaults to False
+		"""
+		self.name = path
+		self.mode = mode
+		self.encoding = encoding
+		self.useMmap = useMmap and mode in ("rb", "br")
+		self._file: IO[Any] | None = None
+		self._mmap: mmap.mmap | None = None
+		self._closed = False
+
+	@property
+	def opened(self) -> bool:
+		"""Has the file been opened (it is not closed again by close)."""
+		return self._file is not None
+
+	@property
+	def file(self) -> Any:
+		"""The open file (or mmap), opened on first use."""
+		if self._file is None:
+			if self._closed:
+				msg = f"I/O operation on closed file {self.name!r}"
+				raise ValueError(msg)
+			# Closed by close
+			if "b" in self.mode:
+				self._file = Path(self.name).open(mode=self.mode)  # noqa: SIM115
+			else:
+				self._file = Path(self.name).open(mode=self.mode, encoding=self.encoding)  # noqa: SIM115
+			if self.useMmap:
+				try:
+					self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+				except (OSError, ValueError):
+					self._mmap = None
+		return self._mmap if self._mmap is not None else self._file
+
+	@property
+	def closed(self) -> bool:
+		"""Is the file closed, a file that was never opened is closed once close is called."""
+		return self._closed
+
+	def close(self) -> None:
+		"""Close the file (and mmap) if it was opened, never opens the file."""
+		self._closed = True
+		if self._mmap is not None:
+			self._mmap.close()
+		if self._file is not None:
+			self._file.close()
+
+	def __getattr__(self, name: str) -> Any:
+		"""Get an attribute of the file, opening it."""
+		# Not set yet (eg. while unpickling)
+		if name.startswith("_"):
+			raise AttributeError(name)
+		return getattr(self.file, name)
+
+	def __iter__(self) -> Iterator[Any]:
+		"""Iterate over the lines of the file (an mmap is read a line at a time)."""
+		file = self.file
+		if isinstance(file, mmap.mmap):
+			return iter(file.readline, b"")
+		return iter(file)
+
+	def __getitem__(self, key: int | slice) -> Any:
+		"""Index or slice a memory-mapped file without reading the whole file."""
+		return self.file[key]
+
+	def __len__(self) -> int:
+		"""Size of a memory-mapped file."""
+		return len(self.file)
+
+	def __enter__(self) -> Self:
+		"""Use as a context manager, the file is closed on exit."""
+		return self
+
+	def __exit__(self, *_args: object) -> None:
+		"""Close the file."""
+		self.close()
+
+	def __repr__(self) -> str:
+		"""Get a representation like that of an open file."""
+		state = "closed" if self._closed else "open" if self.opened else "not opened"
+		return f"<LazyFile name={self.name!r} mode={self.mode!r} {state}>"
+
+
+def closeFiles(args: Any) -> None:
+	"""Close each LazyFile in the args passed to the run_function.
+
+	:param Any args: args as returned by argFormat
+	"""
+	if isinstance(args, LazyFile):
+		args.close()
+	elif isinstance(args, (argparse.Namespace, optparse.Values)):
+		closeFiles(list(vars(args).values()))
+	elif isinstance(args, dict):
+		closeFiles(list(args.values()))
+	elif isinstance(args, (list, tuple)):
+		for arg in args:
+			closeFiles(arg)
@@ -0,0 +1,316 @@
+"""Capture the stdout/ stderr of each job.
+
+sys.stdout and sys.stderr are replaced with proxies that route writes made on a worker
+thread to that job's OutputBuffer, writes from any other thread go to the original stream.
+Each OutputBuffer keeps a bounded number of lines in memory, older lines spill to a
+temporary file on disk (removed when the buffer is discarded, or at exit). An OutputView
+reads a window of lines from either, so the GUI can page through all of the output.
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import threading
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+# Byte offset of every SPILL_STRIDE-th line of a spill file is kept, to seek to a line
+SPILL_STRIDE = 1024
+
+
+def removeSpill(spill: IO[bytes]) -> None:
+	"""Close and remove a spill file, once its OutputBuffer is discarded (or at exit).
+
+	:param IO[bytes] spill: the spill file
+	"""
+	spill.close()
+	Path(spill.name).unlink(missing_ok=True)
+
+
+class OutputBuffer:
+	"""Size capped ring buffer of output lines, evicted lines spill to a file on disk."""
+
+	def __init__(
+		self,
+		maxLines: int = 10_000,
+		maxLineLength: int = 4096,
+		maxSpillBytes: int = 256 * 1024**2,
+	) -> None:
+		"""Size capped ring buffer of output lines.
+
+		:param int maxLines: number of lines kept in memory. Defaults to 10_000
+		:param int maxLineLength: lines longer than this are truncated. Defaults to 4096
+		:param int maxSpillBytes: size at which the spill file stops growing, further evicted
+		lines are counted in `dropped`. Defaults to 256MiB
+		"""
+		self.maxLines = maxLines
+		self.maxLineLength = maxLineLength
+		self.maxSpillBytes = maxSpillBytes
+		self.spillPath: str | None = None
+		# Total number of complete lines written
+		self.total = 0
+		# Bumped by every write, readers compare it to see if anything changed
+		self.version = 0
+		self.dropped = 0
+		# Incomplete last line, shown by readers but not yet counted in total
+		self.partial = ""
+		self._lines: deque[str] = deque()
+		self._spill: IO[bytes] | None = None
+		self._spillBytes = 0
+		self._spillLines = 0
+		self._spillIndex: list[int] = []
+		self._lock = threading.Lock()
+
+	def __len__(self) -> int:
+		"""Get the number of lines held in memory."""
+		return len(self._lines)
+
+	def write(self, text: str) -> int:
+		"""Append text to the buffer, only complete lines are visible to readers.
+
+		:param str text: text to write
+		:return int: number of characters written
+		"""
+		if not text:
+			return 0
+		with self._lock:
+			self.version += 1
+			lines = (self.partial + text).split("\n")
+			self.partial = lines.pop()
+			if len(self.partial) > self.maxLineLength:
+				lines.append(self.partial)
+				self.partial = ""
+			for line in lines:
+				self._lines.append(
+					line if len(line) <= self.maxLineLength else line[: self.maxLineLength] + "…"
+				)
+			self.total += len(lines)
+			while len(self._lines) > self.maxLines:
+				self._evict(self._lines.popleft())
+		return len(text)
+
+	def flush(self) -> None:
+		"""Flush the spill file."""
+		with self._lock:
+			if self._spill is not None:
+				self._spill.flush()
+
+	def tail(self, count: int) -> list[str]:
+		"""Get the last `count` lines in memory (and any incomplete line).
+
+		:param int count: number of lines
+		:return list[str]: lines, oldest first
+		"""
+		with self._lock:
+			start = max(0, len(self._lines) - count)
+			lines = [self._lines[index] for index in range(start, len(self._lines))]
+			if self.partial:
+				lines.append(self.partial)
+			return lines
+
+	def since(self, total: int) -> tuple[list[str], int, int]:
+		"""Get the complete lines written after the first `total` lines, for readers that
+		stream the output as it is written.
+
+		:param int total: number of lines already read (self.total when last called)
+		:return tuple[list[str], int, int]: new lines still in memory (oldest first), the
+		number of new lines no longer in memory, and the new total
+		"""
+		with self._lock:
+			new = self.total - total
+			kept = min(new, len(self._lines))
+			start = len(self._lines) - kept
+			lines = [self._lines[index] for index in range(start, len(self._lines))]
+			return lines, new - kept, self.total
+
+	def lines(self, start: int, count: int) -> list[str]:
+		"""Get up to `count` lines from line `start`, read from memory or the spill file.
+		Lines dropped once the spill file was full are shown by a single marker line, the
+		incomplete last line is line number self.total.
+
+		:param int start: number of the first line, from 0
+		:param int count: number of lines
+		:return list[str]: lines, oldest first
+		"""
+		with self._lock:
+			first = self.total - len(self._lines)
+			stop = min(start + count, self.total + (1 if self.partial else 0))
+			lines = [
+				self._lines[index - first]
+				for index in range(max(start, first), min(stop, self.total))
+			]
+			if stop > self.total:
+				lines.append(self.partial)
+			spilled = min(stop, self._spillLines)
+			if start < spilled and self._spill is not None:
+				self._spill.flush()
+			offset = self._spillIndex[start // SPILL_STRIDE] if start < spilled else 0
+		dropped = range(max(start, self._spillLines), min(stop, first))
+		marker = [f"... {self.dropped} lines dropped (spill file full)"] if dropped else []
+		padding = [""] * (len(dropped) - 1) if dropped else []
+		return self._readSpill(offset, start, spilled) + marker + padding + lines
+
+	def close(self) -> None:
+		"""Close the spill file, the file itself is kept (until the buffer is discarded) so
+		the full log can be read.
+		"""
+		with self._lock:
+			if self._spill is not None:
+				self._spill.close()
+				self._spill = None
+
+	def _evict(self, line: str) -> None:
+		"""Write an evicted line to the spill file, or drop it if the file is full."""
+		if self._spillBytes >= self.maxSpillBytes:
+			self.dropped += 1
+			return
+		if self._spill is None:
+			self._spill = tempfile.NamedTemporaryFile(  # noqa: SIM115
+				"wb", prefix="cli2gui-job-", suffix=".log", delete=False
+			)
+			self.spillPath = self._spill.name
+			weakref.finalize(self, removeSpill, self._spill)
+		if self._spillLines % SPILL_STRIDE == 0:
+			self._spillIndex.append(self._spillBytes)
+		self._spillBytes += self._spill.write((line + "\n").encode("utf-8"))
+		self._spillLines += 1
+
+	def _readSpill(self, offset: int, start: int, stop: int) -> list[str]:
+		"""Read lines `start` to `stop` from the spill file, starting at the byte offset of
+		the indexed line before `start`.
+		"""
+		if start >= stop or self.spillPath is None:
+			return []
+		lines = []
+		with Path(self.spillPath).open("rb") as spill:
+			spill.seek(offset)
+			for index, line in enumerate(spill, start - start % SPILL_STRIDE):
+				if index >= stop:
+					break
+				if index >= start:
+					lines.append(line.decode("utf-8", errors="replace").removesuffix("\n"))
+		return lines
+
+
+class ThreadRoutedStream:
+	"""Proxy for sys.stdout/ sys.stderr that sends writes from routed threads to a buffer."""
+
+	def __init__(self, fallback: IO[str] | None) -> None:
+		"""Proxy for sys.stdout/ sys.stderr.
+
+		:param IO[str] | None fallback: the original stream, used for threads without a route
+		"""
+		self.fallback = fallback
+		self._routes: dict[int, OutputBuffer] = {}
+
+	def write(self, text: str) -> int:
+		"""Write to the buffer routed for this thread, or the original stream."""
+		buffer = self._routes.get(threading.get_ident())
+		if buffer is not None:
+			return buffer.write(text)
+		if self.fallback is None:  # eg. pythonw has no stdout
+			return len(text)
+		return self.fallback.write(text)
+
+	def flush(self) -> None:
+		"""Flush the original stream, buffers do not need flushing."""
+		if self.fallback is not None:
+			self.fallback.flush()
+
+	def __getattr__(self, name: str) -> Any:
+		"""Delegate everything else (encoding, isatty, fileno...) to the original stream."""
+		return getattr(self.fallback, name)
+
+
+_proxies: dict[str, ThreadRoutedStream] = {}
+_lock = threading.Lock()
+
+
+def installProxies() -> tuple[ThreadRoutedStream, ThreadRoutedStream]:
+	"""Replace sys.stdout and sys.stderr with ThreadRoutedStreams, once.
+
+	:return tuple[ThreadRoutedStream, ThreadRoutedStream]: the stdout and stderr proxies
+	"""
+	with _lock:
+		for name in ("stdout", "stderr"):
+			if not isinstance(getattr(sys, name), ThreadRoutedStream):
+				_proxies[name] = ThreadRoutedStream(getattr(sys, name))
+				setattr(sys, name, _proxies[name])
+	return _proxies["stdout"], _proxies["stderr"]
+
+
+@contextmanager
+def captureOutput(buffer: OutputBuffer) -> Iterator[OutputBuffer]:
+	"""Route stdout and stderr written on the current thread to a buffer.
+
+	:param OutputBuffer buffer: buffer to write to
+	:yield OutputBuffer: the buffer
+	"""
+	proxies = installProxies()
+	ident = threading.get_ident()
+	for proxy in proxies:
+		proxy._routes[ident] = buffer  # noqa: SLF001
+	try:
+		yield buffer
+	finally:
+		for proxy in proxies:
+			proxy._routes.pop(ident, None)  # noqa: SLF001
+		buffer.close()
+
+
+class OutputView:
+	"""Window of `height` lines onto an OutputBuffer, re-rendered at most once per frame.
+
+	Only the lines in the window are ever handed to the GUI, read from memory or the spill
+	file, so the cost of a frame does not depend on how much the job has printed. The window
+	follows the end of the output until it is scrolled to an earlier line.
+	"""
+
+	def __init__(self, buffer: OutputBuffer, height: int = 500) -> None:
+		"""Window of lines onto an OutputBuffer.
+
+		:param OutputBuffer buffer: the buffer to show
+		:param int height: number of lines to show. Defaults to 500
+		"""
+		self.buffer = buffer
+		self.height = height
+		# First line requested, None to follow the end of the output
+		self.first: int | None = None
+		# First line, and the number of lines in the buffer, at the last render
+		self.start = 0
+		self.count = 0
+		self._rendered: tuple[int, int | None] | None = None
+
+	def lineCount(self) -> int:
+		"""Get the number of lines in the buffer, including an incomplete last line."""
+		return self.buffer.total + (1 if self.buffer.partial else 0)
+
+	def scrollTo(self, first: int | None, visible: int = 0) -> None:
+		"""Move the window to show line `first` (None to follow the end of the output). The
+		window only moves once the `visible` lines from `first` are no longer inside it.
+
+		:param int | None first: first line the GUI shows
+		:param int visible: number of lines the GUI shows. Defaults to 0
+		"""
+		if first is None:
+			self.first = None
+		elif self.first is None or not self.start <= first <= self.start + self.height - visible:
+			self.first = max(0, first - (self.height - visible) // 2)
+
+	def render(self) -> str | None:
+		"""Get the text to show, or None if nothing changed since the last call.
+
+		:return str | None: text for the output panel, lines self.start onwards
+		"""
+		state = (self.buffer.version, self.first)
+		if state == self._rendered:
+			return None
+		self._rendered = state
+		self.count = self.lineCount()
+		end = max(0, self.count - self.height)
+		self.start = end if self.first is None else min(self.first, end)
+		return "\n".join(self.buffer.lines(self.start, self.height))
@@ -0,0 +1,134 @@
+"""Run the run_function on worker threads so the GUI thread stays responsive.
+
+The GUI submits a job when the user presses "Run" and polls for finished jobs once per
+frame (or once per event loop timeout for PySimpleGUI). Anything the job prints is captured
+in job.output. Worker threads are daemons, so on quit unfinished jobs are abandoned (see
+shutdown) rather than blocking the GUI thread until they finish.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+from cli2gui import trace
+from cli2gui.application.files import closeFiles
+from cli2gui.application.output import OutputBuffer, captureOutput
+from cli2gui.models import Job, JobState
+
+logger = logging.getLogger(__name__)
+
+
+class JobRunner:
+	"""Execute jobs on daemon worker threads and report completed jobs to the GUI thread."""
+
+	def __init__(self, maxWorkers: int = 1) -> None:
+		"""Execute jobs on daemon worker threads.
+
+		:param int maxWorkers: number of jobs that may run at the same time. Defaults to 1
+		so jobs run one after another, in the order they were submitted
+		"""
+		self.maxWorkers = maxWorkers
+		self._pending: queue.Queue[Job] = queue.Queue()
+		self._completed: queue.Queue[Job] = queue.Queue()
+		self._jobIds = itertools.count(1)
+		self._workers: list[threading.Thread] = []
+		self._lock = threading.Lock()
+		# Jobs submitted that have not finished, notified when one finishes
+		self._unfinished = 0
+		self._finished = threading.Condition(self._lock)
+
+	def submit(self, function: Callable[..., Any], args: Any) -> Job:
+		"""Queue function(args) to run on a worker thread.
+
+		:param Callable[..., Any] function: the run_function
+		:param Any args: args as returned by argFormat
+		:return Job: the queued job, its state is updated as the job runs
+		"""
+		job = Job(job_id=next(self._jobIds), function=function, args=args, output=OutputBuffer())
+		self._startWorkers()
+		with self._lock:
+			self._unfinished += 1
+		self._pending.put(job)
+		return job
+
+	def poll(self) -> list[Job]:
+		"""Get the jobs that finished since the last call, never blocks.
+
+		:return list[Job]: finished jobs (in the state DONE or FAILED)
+		"""
+		finished = []
+		# Only the gui thread takes from the queue, so it is not emptied between the calls
+		while not self._completed.empty():
+			finished.append(self._completed.get_nowait())
+		return finished
+
+	def wait(self, timeout: float | None = None) -> int:
+		"""Wait for the jobs submitted (running or pending) to finish.
+
+		:param float | None timeout: seconds to wait at most, None to wait until they have
+		finished. Defaults to None
+		:return int: number of jobs that have not finished
+		"""
+		with self._finished:
+			self._finished.wait_for(lambda: self._unfinished == 0, timeout)
+			return self._unfinished
+
+	def shutdown(self) -> None:
+		"""Abandon unfinished jobs as the program exits, without waiting for them. The worker
+		threads are daemons, so they are stopped (eg. part way through writing a file) when it
+		exits, use wait first to let them finish.
+		"""
+		with self._finished:
+			unfinished = self._unfinished
+		if unfinished:
+			logger.warning("Exiting with %s unfinished job(s), they are abandoned", unfinished)
+
+	def _startWorkers(self) -> None:
+		"""Start the worker threads on first use."""
+		with self._lock:
+			while len(self._workers) < self.maxWorkers:
+				worker = threading.Thread(
+					target=self._work, name=f"cli2gui-worker-{len(self._workers)}", daemon=True
+				)
+				self._workers.append(worker)
+				worker.start()
+
+	def _work(self) -> None:
+		"""Worker loop, take jobs from the pending queue forever."""
+		while True:
+			job = self._pending.get()
+			self._execute(job)
+			self._completed.put(job)
+			with self._finished:
+				self._unfinished -= 1
+				self._finished.notify_all()
+
+	def _execute(self, job: Job) -> None:
+		"""Run a single job, recording the result or the error."""
+		job.state = JobState.RUNNING
+		job.started = time.perf_counter()
+		with captureOutput(job.output):
+			try:
+				with trace.span("run_function", job=job.job_id):
+					job.result = job.function(job.args)
+				job.state = JobState.DONE
+			except SystemExit as exc:
+				# Tools (and click in standalone mode) commonly finish with sys.exit
+				if exc.code in (None, 0):
+					job.state = JobState.DONE
+				else:
+					job.error = exc
+					job.state = JobState.FAILED
+			except Exception as exc:
+				logger.exception("Job %s failed: ", job.job_id)
+				job.error = exc
+				job.state = JobState.FAILED
+			finally:
+				job.finished = time.perf_counter()
+				# Lazily opened files (file_handles="lazy"/ "mmap") are closed with the job
+				closeFiles(job.args)
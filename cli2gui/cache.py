@@ -0,0 +1,197 @@
+"""Per-user, size bounded, on-disk cache.
+
+Used to store converted build specs (keyed by a fingerprint of the parser) so that large
+parsers do not need to be converted on every launch.
+
+Set CLI2GUI_CACHE_DIR to move the cache, or CLI2GUI_NO_CACHE=1 to disable it.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import sys
+import zlib
+from pathlib import Path
+from typing import Any, Callable
+
+from cli2gui import serialize, trace
+from cli2gui.models import ParserRep
+
+# Bump when the layout of cached entries changes
+CACHE_FORMAT = 2
+
+
+def cacheEnabled() -> bool:
+	"""Is the on-disk cache enabled (CLI2GUI_NO_CACHE is not set)."""
+	return os.environ.get("CLI2GUI_NO_CACHE", "") in ("", "0")
+
+
+def cacheDir(namespace: str) -> Path:
+	"""Get the per-user cache directory for a namespace, eg. ~/.cache/cli2gui/buildspec.
+
+	:param str namespace: sub directory of the cache directory
+	:return Path: the directory (not created)
+	"""
+	root = os.environ.get("CLI2GUI_CACHE_DIR")
+	if root:
+		return Path(root) / namespace
+	if sys.platform == "win32":
+		base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+		return base / "cli2gui" / "Cache" / namespace
+	if sys.platform == "darwin":
+		return Path.home() / "Library" / "Caches" / "cli2gui" / namespace
+	base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+	return base / "cli2gui" / namespace
+
+
+def packageVersion() -> str:
+	"""Get the installed version of cli2gui, cached entries are invalidated when it changes."""
+	from importlib import metadata
+
+	try:
+		return metadata.version("cli2gui")
+	except metadata.PackageNotFoundError:
+		return "unknown"
+
+
+class DiskCache:
+	"""Store bytes by key under a cache directory, evicting the least recently used entries
+	once the directory grows over maxBytes.
+	"""
+
+	def __init__(self, namespace: str, maxBytes: int = 32 * 1024**2) -> None:
+		"""Store bytes by key under a cache directory.
+
+		:param str namespace: sub directory of the cache directory
+		:param int maxBytes: size limit for the directory. Defaults to 32MiB
+		"""
+		self.directory = cacheDir(namespace)
+		self.maxBytes = maxBytes
+
+	def path(self, key: str) -> Path:
+		"""Get the path for a key.
+
+		:param str key: the key
+		:return Path: path to the entry
+		"""
+		return self.directory / hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+	def get(self, key: str) -> bytes | None:
+		"""Get the bytes stored for a key, or None.
+
+		:param str key: the key
+		:return bytes | None: stored bytes
+		"""
+		path = self.path(key)
+		try:
+			data = path.read_bytes()
+		except OSError:
+			return None
+		# Mark as recently used
+		with contextlib.suppress(OSError):
+			os.utime(path)
+		return data
+
+	def put(self, key: str, data: bytes) -> None:
+		"""Store bytes for a key, failing silently if the cache is not writable.
+
+		:param str key: the key
+		:param bytes data: bytes to store
+		"""
+		path = self.path(key)
+		try:
+			self.directory.mkdir(parents=True, exist_ok=True)
+			tmp = path.with_suffix(f".{os.getpid()}.tmp")
+			tmp.write_bytes(data)
+			tmp.replace(path)
+		except OSError:
+			return
+		self.evict()
+
+	def evict(self) -> None:
+		"""Delete the least recently used entries until the directory fits in maxBytes."""
+		try:
+			entries = [
+				(entry.stat().st_mtime, entry.stat().st_size, entry.path)
+				for entry in os.scandir(self.directory)
+				if entry.is_file()
+			]
+		except OSError:
+			return
+		total = sum(size for _, size, _ in entries)
+		for _, size, path in sorted(entries):
+			if total <= self.maxBytes:
+				break
+			with contextlib.suppress(OSError):
+				Path(path).unlink(missing_ok=True)
+				total -= size
+
+
+def encodeParserRep(parserRep: ParserRep) -> bytes:
+	"""Encode a ParserRep as compressed json (see serialize).
+
+	:param ParserRep parserRep: the parser representation
+	:return bytes: encoded representation
+	"""
+	return zlib.compress(serialize.jsonLib()[0](serialize.encodeParserRep(parserRep)))
+
+
+def decodeParserRep(data: bytes) -> ParserRep:
+	"""Decode a ParserRep encoded with encodeParserRep.
+
+	:param bytes data: encoded representation
+	:return ParserRep: the parser representation
+	"""
+	return serialize.decodeParserRep(serialize.jsonLib()[1](zlib.decompress(data)))
+
+
+def cachedConvert(
+	parserType: str,
+	parser: Any,
+	convert: Callable[[Any], ParserRep],
+	fingerprint: Callable[[Any], Any],
+) -> ParserRep:
+	"""Convert a parser, using the build spec cache if possible.
+
+	The cache key is made from the parser type, the cli2gui version and a fingerprint of the
+	parser (any change to an argument changes the fingerprint). Parsers whose representation
+	cannot be stored (see serialize) or does not survive a round trip are not cached, neither
+	are those with subcommands (these are converted and cached when selected).
+
+	:param str parserType: type of the parser, eg. "argparse"
+	:param Any parser: the parser
+	:param Callable[[Any], ParserRep] convert: the converter eg. argparse2json.convert
+	:param Callable[[Any], Any] fingerprint: function describing the parser,
+	eg. argparse2json.fingerprint
+	:return ParserRep: the parser representation
+	"""
+	# eg. argparse2json.convert (click subcommands are converted by a partial of it)
+	converter = getattr(convert, "func", convert).__module__.rpartition(".")[2]
+	parserName = str(getattr(parserType, "value", parserType))
+	with trace.span(f"{converter}.convert", parser=parserName) as spanArgs:
+		if not cacheEnabled():
+			spanArgs["cache"] = "off"
+			return convert(parser)
+
+		cache = DiskCache("buildspec")
+		key = repr((CACHE_FORMAT, packageVersion(), str(parserType), fingerprint(parser)))
+		data = cache.get(key)
+		if data is not None:
+			with contextlib.suppress(ValueError, TypeError, KeyError, zlib.error):
+				parserRep = decodeParserRep(data)
+				spanArgs["cache"] = "hit"
+				return parserRep
+
+		spanArgs["cache"] = "miss"
+		parserRep = convert(parser)
+		if parserRep.subcommands:
+			return parserRep
+		try:
+			data = encodeParserRep(parserRep)
+			if decodeParserRep(data) == parserRep:
+				cache.put(key, data)
+		except (ValueError, TypeError):
+			pass
+		return parserRep
@@ -1,26 +1,21 @@
-"""Decorator and entry point for the program."""
+"""Decorator and entry point for the program.
+
+Most programs using the decorator run without the GUI. So, this module only imports sys and
+warnings at the top level, everything else (typing, the parser converters, the models and
+the GUI application) is imported once the GUI is enabled.
+"""
 
 from __future__ import annotations
 
-import getopt
 import sys
 import warnings
-from argparse import ArgumentParser
-from collections.abc import Callable
-from optparse import OptionParser
-from pathlib import Path
-from shlex import quote
-from typing import Any, Iterable
-
-from cli2gui.application import application
-from cli2gui.models import BuildSpec, FullBuildSpec, GUIType, ParserType
-from cli2gui.tojson import (
-	argparse2json,
-	click2json,
-	docopt2json,
-	getopt2json,
-	optparse2json,
-)
+
+# Avoid importing typing at runtime, type checkers treat this the same as typing.TYPE_CHECKING
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+	from typing import Any, Callable, Iterable
+
+	from cli2gui.models import BuildSpec, FullBuildSpec, GUIType, ParserType
 
 DO_COMMAND = "--cli2gui"
 DO_NOT_COMMAND = "--disable-cli2gui"
@@ -55,6 +50,19 @@ def createFromParser(
 		RuntimeError: Throw error if incorrect parser selected
 
 	"""
+	from pathlib import Path
+	from shlex import quote
+
+	from cli2gui import cache
+	from cli2gui.models import FullBuildSpec, ParserType
+	from cli2gui.tojson import (
+		argparse2json,
+		click2json,
+		docopt2json,
+		getopt2json,
+		optparse2json,
+	)
+
 	_ = kwargsParser
 	runCmd = kwargs.get("target")
 	if runCmd is None:
@@ -77,34 +85,45 @@ def createFromParser(
 	# Select parser
 	convertMap = {
 		"self": {
-			ParserType.OPTPARSE: optparse2json.convert,
-			ParserType.ARGPARSE: argparse2json.convert,
-			ParserType.DEPHELL_ARGPARSE: argparse2json.convert,
-			ParserType.DOCOPT: docopt2json.convert,
+			ParserType.OPTPARSE: optparse2json,
+			ParserType.ARGPARSE: argparse2json,
+			ParserType.DEPHELL_ARGPARSE: argparse2json,
+			ParserType.DOCOPT: docopt2json,
 		},
 		"args": {
-			ParserType.GETOPT: getopt2json.convert,
+			ParserType.GETOPT: getopt2json,
 		},
 	}
+	converter, source = None, None
 	if parser in convertMap["self"]:
-		return FullBuildSpec(
-			**convertMap["self"][parser](selfParser).__dict__, **buildSpec.__dict__
-		)
-	if parser in convertMap["args"]:
-		return FullBuildSpec(
-			**convertMap["args"][parser](argsParser).__dict__, **buildSpec.__dict__
-		)
-
+		converter, source = convertMap["self"][parser], selfParser
+	elif parser in convertMap["args"]:
+		converter, source = convertMap["args"][parser], argsParser
 	# click is unique in behaviour so we cant use the mapping -_-
-	if parser == ParserType.CLICK:
-		return FullBuildSpec(
-			**click2json.convert(buildSpec.run_function).__dict__, **buildSpec.__dict__
-		)
+	elif parser == ParserType.CLICK:
+		converter, source = click2json, buildSpec.run_function
+
+	if converter is not None:
+		parserRep = cache.cachedConvert(parser, source, converter.convert, converter.fingerprint)
+		return FullBuildSpec(**parserRep.__dict__, **buildSpec.__dict__)
 
 	msg = f"!Parser must be one of: {[x.value for x in ParserType]}"
 	raise RuntimeError(msg)
 
 
+def isWorkerImport() -> bool:
+	"""Is the main module being imported again by a (batch) worker process. A tool that
+	calls the decorated function at import, not under `if __name__ == "__main__":`, would
+	otherwise open a gui in each worker.
+
+	:return bool: is this a spawned process importing the main module
+	"""
+	# A spawned process runs the main module of the parent as __mp_main__, before it is
+	# made __main__. Importing multiprocessing sets __mp_main__ to __main__ in any process
+	mpMain = sys.modules.get("__mp_main__")
+	return mpMain is not None and mpMain is not sys.modules.get("__main__")
+
+
 def Click2Gui(
 	run_function: Callable[..., Any],
 	gui: str | GUIType = "dearpygui",
@@ -115,6 +134,9 @@ def Click2Gui(
 	program_description: str = "",
 	max_args_shown: int = 5,
 	menu: str | dict[str, Any] = "",
+	batch_workers: int = 0,
+	file_handles: str = "eager",
+	trace_file: str = "",
 	**kwargs: dict[str, Any],
 ) -> None:
 	"""Use this decorator in the function containing the argument parser.
@@ -122,10 +144,12 @@ def Click2Gui(
 
 	Args:
 	----
-		run_function (Callable[..., Any]): The name of the function to call eg.
+		run_function (Callable[..., Any]): The click command eg. hello. For a group
+		each subcommand is got (with get_command) when selected in the gui, so
+		groups that load their subcommands lazily keep doing so.
 		gui (str, optional): Override the gui to use. Current options are:
 		"dearpygui", "pysimplegui", "pysimpleguiqt","pysimpleguiweb","freesimplegui",
-		Defaults to "dearpygui".
+		"browser" (an html form served on localhost). Defaults to "dearpygui".
 		theme (Union[str, list[str]], optional): Set a base24 theme. Can
 		also pass a base24 scheme file. eg. one-light.yaml. Defaults to "".
 		darkTheme (Union[str, list[str]], optional): Set a base24 dark
@@ -142,6 +166,20 @@ def Click2Gui(
 		menu (Union[dict[str, Any]], optional): Add a menu to the program.
 		Defaults to "". eg. THIS_DIR = str(Path(__file__).resolve().parent)
 		menu={"File": THIS_DIR + "/file.md"}
+		batch_workers (int, optional): Number of worker processes used to run
+		a batch file (one run per row). The run_function must be picklable,
+		and each worker imports the tool again (see cli2gui.application.batch).
+		Defaults to 0 (one per cpu).
+		file_handles (str, optional): How File arguments are passed to the
+		run_function. "eager" opens them before the run, "lazy" passes handles
+		that open on first use (so files to write to are not truncated unless
+		used), and "mmap" is as "lazy" but memory-maps files read as bytes.
+		Handles are closed when the run ends (unless "eager").
+		Defaults to "eager".
+		trace_file (str, optional): Record how long each phase takes (converting
+		the parser, building the gui, each run...) and write it to this file as
+		a Chrome trace when the program exits, see cli2gui.trace. Defaults to ""
+		(off, unless CLI2GUI_TRACE is set to a file).
 		**kwargs (dict[Any, Any]): kwargs
 
 	Returns:
@@ -149,6 +187,18 @@ def Click2Gui(
 		Any: Runs the application
 
 	"""
+	if isWorkerImport():
+		return None
+
+	from cli2gui import trace
+	from cli2gui.application import application
+	from cli2gui.models import BuildSpec, ParserType
+
+	if trace_file:
+		trace.enable(trace_file)
+	else:
+		trace.enableFromEnvironment()
+
 	bSpec = BuildSpec(
 		run_function=run_function,
 		parser=ParserType.CLICK,
@@ -160,12 +210,16 @@ def Click2Gui(
 		program_description=program_description,
 		max_args_shown=max_args_shown,
 		menu=menu,
+		batch_workers=batch_workers,
+		file_handles=file_handles,
 	)
 
-	buildSpec = createFromParser(
-		None, (), kwargs, sys.argv[0], bSpec, **{**locals(), **locals()["kwargs"]}
-	)
-	return application.run(buildSpec)
+	with trace.span("decorator", function=getattr(run_function, "__name__", "")):
+		with trace.span("createFromParser", parser="click"):
+			buildSpec = createFromParser(
+				None, (), kwargs, sys.argv[0], bSpec, **{**locals(), **locals()["kwargs"]}
+			)
+		return application.run(buildSpec)
 
 
 def Cli2Gui(
@@ -180,6 +234,9 @@ def Cli2Gui(
 	program_description: str = "",
 	max_args_shown: int = 5,
 	menu: str | dict[str, Any] = "",
+	batch_workers: int = 0,
+	file_handles: str = "eager",
+	trace_file: str = "",
 ) -> Any:
 	"""Use this decorator in the function containing the argument parser.
 	Serialises data to JSON and launches the Cli2Gui application.
@@ -195,7 +252,7 @@ def Cli2Gui(
 		"dephell_argparse". Defaults to "argparse".
 		gui (str, optional): Override the gui to use. Current options are:
 		"dearpygui", "pysimplegui", "pysimpleguiqt","pysimpleguiweb","freesimplegui",
-		Defaults to "dearpygui".
+		"browser" (an html form served on localhost). Defaults to "dearpygui".
 		theme (Union[str, list[str]], optional): Set a base24 theme. Can
 		also pass a base24 scheme file. eg. one-light.yaml. Defaults to "".
 		darkTheme (Union[str, list[str]], optional): Set a base24 dark
@@ -212,24 +269,26 @@ def Cli2Gui(
 		menu (Union[dict[str, Any]], optional): Add a menu to the program.
 		Defaults to "". eg. THIS_DIR = str(Path(__file__).resolve().parent)
 		menu={"File": THIS_DIR + "/file.md"}
+		batch_workers (int, optional): Number of worker processes used to run
+		a batch file (one run per row). The run_function must be picklable,
+		and each worker imports the tool again (see cli2gui.application.batch).
+		Defaults to 0 (one per cpu).
+		file_handles (str, optional): How File arguments are passed to the
+		run_function. "eager" opens them before the run, "lazy" passes handles
+		that open on first use (so files to write to are not truncated unless
+		used), and "mmap" is as "lazy" but memory-maps files read as bytes.
+		Handles are closed when the run ends (unless "eager").
+		Defaults to "eager".
+		trace_file (str, optional): Record how long each phase takes (converting
+		the parser, building the gui, each run...) and write it to this file as
+		a Chrome trace when the program exits, see cli2gui.trace. Defaults to ""
+		(off, unless CLI2GUI_TRACE is set to a file).
 
 	Returns:
 	-------
 		Any: Runs the application
 
 	"""
-	bSpec = BuildSpec(
-		run_function=run_function,
-		parser=parser,
-		gui=gui,
-		theme=theme,
-		darkTheme=darkTheme,
-		image=image,
-		program_name=program_name,
-		program_description=program_description,
-		max_args_shown=max_args_shown,
-		menu=menu,
-	)
 
 	def build(callingFunction: Callable[..., Any]) -> Callable[..., Any]:
 		"""Generate the buildspec and run the GUI.
@@ -244,49 +303,62 @@ def Cli2Gui(
 			Callable[..., Any]: some calling function
 
 		"""
+		from cli2gui import interception, trace
+		from cli2gui.application import application
+		from cli2gui.models import BuildSpec
+
+		if trace_file:
+			trace.enable(trace_file)
+		else:
+			trace.enableFromEnvironment()
+
+		bSpec = BuildSpec(
+			run_function=run_function,
+			parser=parser,
+			gui=gui,
+			theme=theme,
+			darkTheme=darkTheme,
+			image=image,
+			program_name=program_name,
+			program_description=program_description,
+			max_args_shown=max_args_shown,
+			menu=menu,
+			batch_workers=batch_workers,
+			file_handles=file_handles,
+		)
 
 		def runCli2Gui(self: Any, *args: Iterable[Any], **kwargs: dict[str, Any]) -> None:
 			"""Run the gui/ application.
 
 			:return None: the gui/ application
 			"""
-			buildSpec = createFromParser(
-				self,
-				args,
-				kwargs,
-				callingFunction.__name__,
-				bSpec,
-				**{**locals(), **locals()["kwargs"]},
-			)
+			with trace.span("createFromParser", parser=str(getattr(parser, "value", parser))):
+				buildSpec = createFromParser(
+					self,
+					args,
+					kwargs,
+					callingFunction.__name__,
+					bSpec,
+					**{**locals(), **locals()["kwargs"]},
+				)
 			return application.run(buildSpec)
 
 		def inner(*args: tuple[Any, Any], **kwargs: dict[Any, Any]) -> Any:
-			"""Replace the inner functions with run_cli2gui. eg. When.
-			ArgumentParser.parse_args is called, do run_cli2gui.
+			"""Run the calling function with its parser calls routed to runCli2Gui. eg. When
+			ArgumentParser.parse_args is called, do runCli2Gui.
 
 			Returns
 			-------
 				Any: Do the calling_function
 
 			"""
-			getopt.getopt = runCli2Gui
-			getopt.gnu_getopt = runCli2Gui
-			OptionParser.parse_args = runCli2Gui
-			ArgumentParser.parse_args = runCli2Gui
-			try:
-				import docopt
-
-				docopt.docopt = runCli2Gui
-			except ImportError:
-				pass
-			try:
-				import dephell_argparse
-
-				dephell_argparse.Parser.parse_args = runCli2Gui
-			except ImportError:
-				pass
-			# Using type=argparse.FileType('r') leads to a resource warning
-			with warnings.catch_warnings():
+			if isWorkerImport():
+				return None
+			span = trace.span("decorator", function=callingFunction.__name__)
+			# Parser calls made by callingFunction (on this thread) go to runCli2Gui, the
+			# parser functions are put back once no decorated function is running
+			with span, interception.intercept(runCli2Gui), warnings.catch_warnings():
+				# Using type=argparse.FileType('r') leads to a resource warning
 				warnings.filterwarnings("ignore", category=ResourceWarning)
 				return callingFunction(*args, **kwargs)
 
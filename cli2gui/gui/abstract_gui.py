@@ -11,6 +11,9 @@ from cli2gui import models
 class AbstractGUI(ABC):
 	"""Abstract base class for GUI wrappers."""
 
+	# Jobs that may run at the same time (see application.worker.JobRunner)
+	concurrentJobs = 1
+
 	@abstractmethod
 	def __init__(self) -> None:
 		"""Abstract base class for GUI wrappers."""
@@ -20,7 +23,18 @@ class AbstractGUI(ABC):
 		self,
 		buildSpec: models.FullBuildSpec,
 		quit_callback: Callable[[], None],
-		run_callback: Callable[[dict[str, Any]], None],
+		run_callback: Callable[[dict[str, Any], dict[str, models.Decoder]], Any],
+		poll_callback: Callable[[], list[models.Job | models.BatchRow]],
+		batch_callback: Callable[
+			[dict[str, Any], dict[str, models.Decoder], str], list[models.BatchRow]
+		],
 	) -> None:
-		"""Abstract method for the main function."""
+		"""Abstract method for the main function.
+
+		run_callback submits a job and returns it, poll_callback returns the jobs (and batch
+		rows) that finished since it was last called and should be called once per frame.
+		batch_callback runs the form once per row of a csv/ jsonl file and returns the rows.
+		Values are keyed by dest and passed with the decoders for the parser and the
+		selected subcommands (see application2args.buildDecoders).
+		"""
 		raise NotImplementedError
@@ -0,0 +1,637 @@
+"""Wrapper class serving the form to a web browser from a local asyncio http server.
+
+For tools on a headless machine: the form is rendered as html, each "Run" submits a job
+(jobs run on worker threads, off the event loop) and the output of the job is streamed back
+as server-sent events. Each connection is handled by its own task so any number of browser
+sessions can use the form at once, each only seeing the jobs it started.
+
+The server binds to 127.0.0.1 on a free port unless CLI2GUI_BROWSER_HOST/
+CLI2GUI_BROWSER_PORT are set, the address is logged on start. Use an ssh tunnel (or a
+reverse proxy) to reach it from another machine.
+
+Every request must carry the secret made on start (it is in the logged address), so other
+web pages open in the browser cannot run the tool. Requests whose Host (or Origin) is not
+the bound address (or localhost) are refused, against DNS rebinding. When bound to all
+interfaces (eg. 0.0.0.0) any Host is accepted and only the secret is checked.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import html
+import json
+import os
+import secrets
+import sys
+import urllib.parse
+from collections import OrderedDict
+from typing import Any, Callable
+
+from cli2gui.application.application2args import buildDecoders, commandDecoders
+from cli2gui.gui import helpers
+from cli2gui.gui.abstract_gui import AbstractGUI
+from cli2gui.models import (
+	BatchRow,
+	CommandNode,
+	Decoder,
+	FullBuildSpec,
+	Group,
+	Item,
+	ItemType,
+	Job,
+	JobState,
+)
+
+HOST_ENV = "CLI2GUI_BROWSER_HOST"
+PORT_ENV = "CLI2GUI_BROWSER_PORT"
+# Largest request body accepted (the form is urlencoded, so this is plenty)
+MAX_BODY = 1024**2
+# Jobs kept for their output to be streamed, oldest are forgotten first
+JOBS_KEPT = 256
+# Seconds between checks for new output of a job, and between calls to poll_callback
+POLL_INTERVAL = 0.1
+# Form field holding the selected subcommands, separated by "/"
+COMMAND_FIELD = "-cli2gui-command-"
+# Query parameter holding the secret of the session, required on every request
+SECRET_FIELD = "-cli2gui-secret-"  # noqa: S105
+# Host names always accepted (with the bound address) in the Host and Origin headers
+LOCAL_HOSTS = frozenset({"localhost", "127.0.0.1", "::1"})
+# Binding to these accepts connections for any name, so the Host is not checked
+ANY_HOSTS = frozenset({"", "0.0.0.0", "::"})  # noqa: S104
+
+STATUS_TEXT = {
+	200: "OK",
+	400: "Bad Request",
+	403: "Forbidden",
+	404: "Not Found",
+	413: "Payload Too Large",
+}
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ background: {background}; color: {text}; font-family: sans-serif; margin: 2em; }}
+fieldset {{ border: 1px solid {border}; margin: 1em 0; }}
+legend, nav a.selected {{ color: {accent}; }}
+a {{ color: {link}; }}
+label {{ display: block; margin: 0.6em 0 0.2em; }}
+small {{ display: block; opacity: 0.8; }}
+input, select, button {{ background: {input}; color: {text}; border: 1px solid {border}; }}
+pre {{ background: {input}; padding: 0.5em; max-height: 30em; overflow: auto; }}
+</style></head>
+<body>
+<h1>{title}</h1>
+<p>{description}</p>
+{menu}
+<form id="form">
+{commands}
+{fields}
+<button type="submit">Run</button>
+<button type="button" id="quit">Quit</button>
+</form>
+<p id="status"></p>
+<pre id="output"></pre>
+<script>
+const secret = "{secret}";
+const form = document.getElementById("form");
+const status = document.getElementById("status");
+const output = document.getElementById("output");
+document.getElementById("quit").addEventListener("click", async () => {{
+	await fetch("/quit?" + new URLSearchParams({{ "{secretField}": secret }}), {{
+		method: "POST",
+	}});
+	status.textContent = "Stopped";
+}});
+form.addEventListener("submit", async (event) => {{
+	event.preventDefault();
+	const response = await fetch("/run?" + new URLSearchParams({{ "{secretField}": secret }}), {{
+		method: "POST",
+		body: new URLSearchParams(new FormData(form)),
+	}});
+	const result = await response.json();
+	if (!result.job) {{
+		status.textContent = result.error || result.args;
+		return;
+	}}
+	output.textContent = "";
+	status.textContent = "Running...";
+	const events = new EventSource(
+		"/events?" + new URLSearchParams({{ job: result.job, "{secretField}": secret }})
+	);
+	events.onmessage = (message) => {{
+		output.textContent += message.data + "\\n";
+		output.scrollTop = output.scrollHeight;
+	}};
+	events.addEventListener("done", (message) => {{
+		status.textContent = JSON.parse(message.data).status;
+		events.close();
+	}});
+}});
+</script>
+</body></html>
+"""
+
+
+class BrowserWrapper(AbstractGUI):
+	"""Wrapper class serving the form to a web browser."""
+
+	# Jobs from different sessions run side by side
+	concurrentJobs = 4
+
+	def __init__(
+		self, base24Theme: list[str], host: str | None = None, port: int | None = None
+	) -> None:
+		"""Browser wrapper class.
+
+		:param list[str] base24Theme: list representing a base24 theme. Containing 24 elements
+		(of hex strings like "#e7e7e9")
+		:param str | None host: address to bind to. Defaults to CLI2GUI_BROWSER_HOST, or
+		127.0.0.1
+		:param int | None port: port to bind to. Defaults to CLI2GUI_BROWSER_PORT, or any free
+		port
+		"""
+		super().__init__()
+		self.palette = base24Theme
+		self.host = host or os.environ.get(HOST_ENV) or "127.0.0.1"
+		self.port = port if port is not None else int(os.environ.get(PORT_ENV) or 0)
+		self.url = ""
+		# Made on start, required on every request
+		self.secret = ""
+		# Names accepted in the Host/ Origin headers, None to accept any
+		self.allowedHosts: frozenset[str] | None = None
+		# Jobs by token, the token is only given to the session that started the job
+		self.jobs: OrderedDict[str, Job] = OrderedDict()
+		self.rootDecoders: dict[str, Decoder] = {}
+		self.server: asyncio.Server | None = None
+		self.stopped: asyncio.Event | None = None
+
+	def main(
+		self,
+		buildSpec: FullBuildSpec,
+		quit_callback: Callable[[], None],
+		run_callback: Callable[[dict[str, Any], dict[str, Decoder]], Any],
+		poll_callback: Callable[[], list[Job | BatchRow]],
+		batch_callback: Callable[[dict[str, Any], dict[str, Decoder], str], list[BatchRow]],  # noqa: ARG002
+	) -> None:
+		"""Serve the form until "Quit" is pressed (or the process is interrupted).
+
+		:param FullBuildSpec buildSpec: Full cli parse/ build spec
+		:param Callable[[], None] quit_callback: generic callable used to quit
+		:param Callable[[dict[str, Any], dict[str, Decoder]], Any] run_callback: submits a
+		job and returns it
+		:param Callable[[], list[Job | BatchRow]] poll_callback: returns the finished jobs
+		:param Callable[[dict[str, Any], dict[str, Decoder], str], list[BatchRow]]
+		batch_callback: [unused] batch runs are not offered in the browser
+		"""
+		asyncio.run(self.serve(buildSpec, run_callback, poll_callback))
+		quit_callback()
+
+	async def serve(
+		self,
+		buildSpec: FullBuildSpec,
+		run_callback: Callable[[dict[str, Any], dict[str, Decoder]], Any],
+		poll_callback: Callable[[], list[Job | BatchRow]],
+	) -> None:
+		"""Start the server and serve until stop is called.
+
+		:param FullBuildSpec buildSpec: Full cli parse/ build spec
+		:param Callable[[dict[str, Any], dict[str, Decoder]], Any] run_callback: submits a
+		job and returns it
+		:param Callable[[], list[Job | BatchRow]] poll_callback: returns the finished jobs
+		"""
+		await self.start(buildSpec, run_callback)
+		sys.stderr.write(f"Serving {buildSpec.program_name} at {self.url}\n")
+		stopped = self.stopped or asyncio.Event()
+		try:
+			while not stopped.is_set():
+				# Finished jobs are only drained, their state is read from the jobs themselves
+				poll_callback()
+				with contextlib.suppress(asyncio.TimeoutError):
+					await asyncio.wait_for(stopped.wait(), POLL_INTERVAL)
+		finally:
+			await self.close()
+
+	async def start(
+		self,
+		buildSpec: FullBuildSpec,
+		run_callback: Callable[[dict[str, Any], dict[str, Decoder]], Any],
+	) -> str:
+		"""Bind the server and start accepting connections.
+
+		:param FullBuildSpec buildSpec: Full cli parse/ build spec
+		:param Callable[[dict[str, Any], dict[str, Decoder]], Any] run_callback: submits a
+		job and returns it
+		:return str: url of the form
+		"""
+		if isinstance(buildSpec.menu, str):
+			buildSpec.menu = {"File": buildSpec.menu} if buildSpec.menu else {}
+		self.rootDecoders = buildDecoders(buildSpec.widgets)
+		self.stopped = asyncio.Event()
+
+		async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+			await self.handleConnection(reader, writer, buildSpec, run_callback)
+
+		self.secret = secrets.token_urlsafe(24)
+		self.server = await asyncio.start_server(handle, self.host, self.port)
+		host, port = self.server.sockets[0].getsockname()[:2]
+		self.allowedHosts = (
+			None if self.host in ANY_HOSTS else LOCAL_HOSTS | {self.host.lower(), host.lower()}
+		)
+		urlHost = f"[{host}]" if ":" in host else host
+		self.url = f"http://{urlHost}:{port}/?{urllib.parse.urlencode(self.query())}"
+		return self.url
+
+	def query(self, **params: str) -> dict[str, str]:
+		"""Get the query parameters for a link, with the secret of the session.
+
+		:param str params: other parameters
+		:return dict[str, str]: the parameters
+		"""
+		return {**params, SECRET_FIELD: self.secret}
+
+	def authorized(self, query: dict[str, str], headers: dict[str, str]) -> bool:
+		"""Check a request has the secret and is for the bound address (not another site).
+
+		:param dict[str, str] query: query parameters of the request
+		:param dict[str, str] headers: headers of the request (names in lower case)
+		:return bool: if the request may be answered
+		"""
+		if not secrets.compare_digest(query.get(SECRET_FIELD, ""), self.secret):
+			return False
+		if self.allowedHosts is None:
+			return True
+		hosts = [urllib.parse.urlsplit("//" + headers.get("host", "")).hostname]
+		if "origin" in headers:
+			hosts.append(urllib.parse.urlsplit(headers["origin"]).hostname)
+		return all(host in self.allowedHosts for host in hosts)
+
+	def stop(self) -> None:
+		"""Stop serving, serve returns once open connections are closed."""
+		if self.stopped is not None:
+			self.stopped.set()
+
+	async def close(self) -> None:
+		"""Close the server."""
+		if self.server is not None:
+			self.server.close()
+			await self.server.wait_closed()
+			self.server = None
+
+	async def handleConnection(
+		self,
+		reader: asyncio.StreamReader,
+		writer: asyncio.StreamWriter,
+		buildSpec: FullBuildSpec,
+		run_callback: Callable[[dict[str, Any], dict[str, Decoder]], Any],
+	) -> None:
+		"""Read one request from a connection and respond to it, the connection is closed
+		after the response.
+
+		:param asyncio.StreamReader reader: reads the request
+		:param asyncio.StreamWriter writer: writes the response
+		:param FullBuildSpec buildSpec: Full cli parse/ build spec
+		:param Callable[[dict[str, Any], dict[str, Decoder]], Any] run_callback: submits a
+		job and returns it
+		"""
+		try:
+			request = await readRequest(reader)
+			if request is None:
+				await respond(writer, 400, "text/plain", b"Bad request")
+				return
+			method, path, query, headers, body = request
+			if self.authorized(query, headers):
+				await self.route(writer, method, path, query, body, buildSpec, run_callback)
+			else:
+				await respond(writer, 403, "text/plain", b"Forbidden")
+		except RequestTooLargeError:
+			await respond(writer, 413, "text/plain", b"Request too large")
+		except UnicodeDecodeError:
+			await respond(writer, 400, "text/plain", b"Bad request")
+		except (ConnectionError, asyncio.IncompleteReadError):
+			# The browser went away (eg. the page was closed while streaming)
+			pass
+		finally:
+			writer.close()
+
+	async def route(
+		self,
+		writer: asyncio.StreamWriter,
+		method: str,
+		path: str,
+		query: dict[str, str],
+		body: bytes,
+		buildSpec: FullBuildSpec,
+		run_callback: Callable[[dict[str, Any], dict[str, Decoder]], Any],
+	) -> None:
+		"""Respond to an authorized request.
+
+		:param asyncio.StreamWriter writer: writes the response
+		:param str method: method of the request
+		:param str path: path of the request
+		:param dict[str, str] query: query parameters of the request
+		:param bytes body: body of the request
+		:param FullBuildSpec buildSpec: Full cli parse/ build spec
+		:param Callable[[dict[str, Any], dict[str, Decoder]], Any] run_callback: submits a
+		job and returns it
+		"""
+		if method == "GET" and path == "/":
+			page = self.renderPage(buildSpec, query.get(COMMAND_FIELD, ""))
+			await respond(writer, 200, "text/html; charset=utf-8", page.encode("utf-8"))
+		elif method == "GET" and path == "/menu" and query.get("name") in buildSpec.menu:
+			text = await asyncio.to_thread(helpers.read_file, buildSpec.menu[query["name"]])
+			await respond(writer, 200, "text/plain; charset=utf-8", text.encode("utf-8"))
+		elif method == "GET" and path == "/events" and query.get("job") in self.jobs:
+			await self.streamJob(writer, self.jobs[query["job"]])
+		elif method == "POST" and path == "/run":
+			result = await self.runForm(buildSpec, body, run_callback)
+			await respond(writer, 200, "application/json", json.dumps(result).encode("utf-8"))
+		elif method == "POST" and path == "/quit":
+			await respond(writer, 200, "text/plain", b"Stopped")
+			self.stop()
+		else:
+			await respond(writer, 404, "text/plain", b"Not found")
+
+	async def runForm(
+		self,
+		buildSpec: FullBuildSpec,
+		body: bytes,
+		run_callback: Callable[[dict[str, Any], dict[str, Decoder]], Any],
+	) -> dict[str, str]:
+		"""Submit a job for the values of a posted form.
+
+		:param FullBuildSpec buildSpec: Full cli parse/ build spec
+		:param bytes body: the urlencoded form
+		:param Callable[[dict[str, Any], dict[str, Decoder]], Any] run_callback: submits a
+		job and returns it
+		:return dict[str, str]: {"job": token} to stream the output of the job with, the args
+		if there is no run_function, or an error
+		"""
+		form = urllib.parse.parse_qs(body.decode("utf-8"), keep_blank_values=True)
+		commandPath = selectCommands(buildSpec.subcommands, form.get(COMMAND_FIELD, [""])[-1])
+		decoders = commandDecoders(self.rootDecoders, commandPath)
+		values: dict[str, Any] = {}
+		for node in commandPath:
+			values.update(node.values)
+		for item in formItems(buildSpec.widgets, commandPath):
+			if decoders[item.dest].type == ItemType.Bool:
+				values[item.dest] = item.dest in form
+			else:
+				values[item.dest] = form.get(item.dest, [""])[-1]
+		try:
+			# Files are opened here, so off the event loop
+			job = await asyncio.to_thread(run_callback, values, decoders)
+		except (OSError, ValueError) as exc:
+			return {"error": f"Could not run - {exc}"}
+		if not isinstance(job, Job):
+			return {"args": repr(job)}
+		token = secrets.token_urlsafe(12)
+		self.jobs[token] = job
+		while len(self.jobs) > JOBS_KEPT:
+			self.jobs.popitem(last=False)
+		return {"job": token}
+
+	async def streamJob(self, writer: asyncio.StreamWriter, job: Job) -> None:
+		"""Stream the output of a job as server-sent events, one message per line, then a
+		"done" event with the status of the job.
+
+		:param asyncio.StreamWriter writer: writes the response
+		:param Job job: the job
+		"""
+		writer.write(
+			b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+			b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n"
+		)
+		total = 0
+		while True:
+			finished = job.state in (JobState.DONE, JobState.FAILED)
+			lines, skipped, total = job.output.since(total)
+			if finished and job.output.partial:
+				lines.append(job.output.partial)
+			if skipped:
+				lines.insert(0, f"... {skipped} lines not shown")
+			if lines:
+				writer.write("".join(f"data: {line}\n\n" for line in lines).encode("utf-8"))
+			if finished:
+				status = json.dumps({"state": job.state.value, "status": job.describe()})
+				writer.write(f"event: done\ndata: {status}\n\n".encode())
+				await writer.drain()
+				return
+			await writer.drain()
+			await asyncio.sleep(POLL_INTERVAL)
+
+	def renderPage(self, buildSpec: FullBuildSpec, command: str) -> str:
+		"""Render the form for the parser and the selected subcommands as html.
+
+		:param FullBuildSpec buildSpec: Full cli parse/ build spec
+		:param str command: names of the selected subcommands, separated by "/"
+		:return str: the page
+		"""
+		commandPath = selectCommands(buildSpec.subcommands, command)
+		fields = [self.renderGroup(group) for group in buildSpec.widgets]
+		commands = [f'<input type="hidden" name="{COMMAND_FIELD}" value="{escape(command)}">']
+		nodes = buildSpec.subcommands
+		selected: list[str] = []
+		for depth in range(len(commandPath) + 1):
+			if not nodes:
+				break
+			links = []
+			for node in nodes:
+				path = "/".join([*selected, node.name])
+				selectedClass = (
+					' class="selected"'
+					if depth < len(commandPath) and node is commandPath[depth]
+					else ""
+				)
+				link = f"/?{urllib.parse.urlencode(self.query(**{COMMAND_FIELD: path}))}"
+				links.append(f'<a href="{escape(link)}"{selectedClass}>{escape(node.name)}</a>')
+			commands.append(f"<nav>Command: {' | '.join(links)}</nav>")
+			if depth < len(commandPath):
+				node = commandPath[depth]
+				selected.append(node.name)
+				parserRep = node.load()
+				if node.help:
+					commands.append(f"<p>{escape(helpers.stringSentencecase(node.help))}</p>")
+				fields.extend(self.renderGroup(group) for group in parserRep.widgets)
+				nodes = parserRep.subcommands
+		menu = " | ".join(
+			f'<a href="/menu?{escape(urllib.parse.urlencode(self.query(name=name)))}" '
+			'target="_blank">'
+			f"{escape(name)}</a>"
+			for name in buildSpec.menu
+		)
+		return PAGE.format(
+			title=escape(buildSpec.program_name),
+			description=escape(
+				helpers.stringSentencecase(
+					buildSpec.program_description or buildSpec.parser_description
+				)
+			),
+			menu=f"<nav>{menu}</nav>" if menu else "",
+			commands="\n".join(commands),
+			fields="\n".join(fields),
+			background=self.palette[16],
+			text=self.palette[6],
+			input=self.palette[17],
+			border=self.palette[3],
+			accent=self.palette[14],
+			link=self.palette[13],
+			secret=self.secret,
+			secretField=SECRET_FIELD,
+		)
+
+	def renderGroup(self, group: Group) -> str:
+		"""Render a group (and the groups in it) as a fieldset.
+
+		:param Group group: section with a name to display and items
+		:return str: html for the group
+		"""
+		rows = [f"<legend>{escape(helpers.stringTitlecase(group.name, ' '))}</legend>"]
+		rows.extend(self.renderItem(item) for item in flattenItems(group.arg_items) if item.dest)
+		rows.extend(self.renderGroup(subgroup) for subgroup in group.groups)
+		return "<fieldset>" + "\n".join(rows) + "</fieldset>"
+
+	def renderItem(self, item: Item) -> str:
+		"""Render the label, help text and input for an item.
+
+		:param Item item: the item
+		:return str: html for the item
+		"""
+		name = escape(item.dest)
+		default = "" if item.default is None else str(item.default)
+		if item.type == ItemType.Bool:
+			checked = " checked" if item.default else ""
+			field = f'<input type="checkbox" id="{name}" name="{name}"{checked}>'
+		elif item.type == ItemType.Choice:
+			options = "".join(
+				f"<option{' selected' if str(choice) == default else ''}>"
+				f"{escape(str(choice))}</option>"
+				for choice in item.choices or []
+			)
+			field = f'<select id="{name}" name="{name}"><option></option>{options}</select>'
+		else:
+			kind = {
+				ItemType.Int: 'type="number" step="1"',
+				ItemType.Float: 'type="number" step="any"',
+			}.get(item.type, 'type="text"')
+			placeholder = (
+				' placeholder="path on the server"'
+				if item.type in (ItemType.File, ItemType.FileWrite, ItemType.Path)
+				else ""
+			)
+			required = " required" if item.required else ""
+			field = (
+				f'<input {kind} id="{name}" name="{name}" value="{escape(default)}"'
+				f"{placeholder}{required}>"
+			)
+		return (
+			f'<label for="{name}">{escape(helpers.stringTitlecase(item.display_name))} '
+			f"<small>{escape(str(item.commands))} {escape(helpers.stringSentencecase(item.help))}"
+			f"</small></label>{field}"
+		)
+
+
+def escape(text: str) -> str:
+	"""Escape text for html (including quotes, for attributes)."""
+	return html.escape(text, quote=True)
+
+
+def flattenItems(items: list[Item]) -> list[Item]:
+	"""Get the items, with each radio group replaced by its members."""
+	flat = []
+	for item in items:
+		if item.type == ItemType.RadioGroup:
+			flat.extend(item.additional_properties["radio"])
+		else:
+			flat.append(item)
+	return flat
+
+
+def formItems(groups: list[Group], commandPath: list[CommandNode]) -> list[Item]:
+	"""Get the items (with a dest) of the parser and the selected subcommands.
+
+	:param list[Group] groups: widgets of the parser
+	:param list[CommandNode] commandPath: the selected subcommands
+	:return list[Item]: items in the form
+	"""
+	groups = list(groups)
+	for node in commandPath:
+		groups.extend(node.load().widgets)
+	items = []
+	while groups:
+		group = groups.pop(0)
+		items.extend(item for item in flattenItems(group.arg_items) if item.dest)
+		groups.extend(group.groups)
+	return items
+
+
+def selectCommands(nodes: list[CommandNode], command: str) -> list[CommandNode]:
+	"""Get the subcommands selected by a path of names, unknown names are ignored.
+
+	:param list[CommandNode] nodes: subcommands of the program
+	:param str command: names of the selected subcommands, separated by "/"
+	:return list[CommandNode]: the selected subcommands, from the program down
+	"""
+	commandPath = []
+	for name in filter(None, command.split("/")):
+		node = next((node for node in nodes if node.name == name), None)
+		if node is None:
+			break
+		commandPath.append(node)
+		nodes = node.load().subcommands
+	return commandPath
+
+
+class RequestTooLargeError(Exception):
+	"""Raised by readRequest for a body larger than MAX_BODY."""
+
+
+async def readRequest(
+	reader: asyncio.StreamReader,
+) -> tuple[str, str, dict[str, str], dict[str, str], bytes] | None:
+	"""Read an http request.
+
+	:param asyncio.StreamReader reader: reads the request
+	:raises RequestTooLargeError: if the body is larger than MAX_BODY
+	:return tuple[str, str, dict[str, str], dict[str, str], bytes] | None: the method, path,
+	query, headers (names in lower case) and body. None if the request is malformed
+	"""
+	try:
+		head = await reader.readuntil(b"\r\n\r\n")
+	except asyncio.LimitOverrunError:
+		return None
+	lines = head.decode("latin-1").split("\r\n")
+	try:
+		method, target, _version = lines[0].split(" ")
+	except ValueError:
+		return None
+	headers = {}
+	for line in lines[1:]:
+		key, _, value = line.partition(":")
+		headers[key.strip().lower()] = value.strip()
+	length = headers.get("content-length") or "0"
+	if not length.isdigit():
+		return None
+	length = int(length)
+	if length > MAX_BODY:
+		raise RequestTooLargeError(length)
+	body = await reader.readexactly(length) if length else b""
+	url = urllib.parse.urlsplit(target)
+	query = {key: values[-1] for key, values in urllib.parse.parse_qs(url.query).items()}
+	return method, url.path, query, headers, body
+
+
+async def respond(writer: asyncio.StreamWriter, status: int, contentType: str, body: bytes) -> None:
+	"""Write an http response.
+
+	:param asyncio.StreamWriter writer: writes the response
+	:param int status: status code
+	:param str contentType: content type of the body
+	:param bytes body: the body
+	"""
+	writer.write(
+		f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\nContent-Type: {contentType}\r\n"
+		f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1")
+		+ body
+	)
+	await writer.drain()
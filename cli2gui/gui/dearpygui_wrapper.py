@@ -2,16 +2,191 @@
 
 from __future__ import annotations
 
+import bisect
 from pathlib import Path
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, Callable
 
 import dearpygui.dearpygui as dpg
 
-from cli2gui.gui import helpers
+from cli2gui import trace
+from cli2gui.application.application2args import buildDecoders, commandDecoders
+from cli2gui.application.output import OutputView
+from cli2gui.gui import helpers, icons
 from cli2gui.gui.abstract_gui import AbstractGUI
-from cli2gui.models import SEP, FullBuildSpec, Group, Item, ItemType
+from cli2gui.gui.pager import DocumentPager
+from cli2gui.models import (
+	BatchRow,
+	CommandNode,
+	Decoder,
+	FullBuildSpec,
+	Group,
+	Item,
+	ItemType,
+	Job,
+	JobState,
+)
+
+if TYPE_CHECKING:
+	from concurrent.futures import Future
 
 THISDIR = Path(__file__).resolve().parent
+STATUS_TAG = "cli2gui_job_status"
+OUTPUT_TAG = "cli2gui_job_output"
+OUTPUT_TEXT_TAG = "cli2gui_job_output_text"
+OUTPUT_HEIGHT = 200
+COMMANDS_TAG = "cli2gui_commands"
+FILE_DIALOG_TAG = "cli2gui_file_dialog"
+BATCH_FILE_TAG = "cli2gui_batch_file"
+BATCH_TABLE_TAG = "cli2gui_batch_table"
+# Base24 color (index into the theme) for each dpg theme color
+THEME_COLORS = [
+	(dpg.mvThemeCol_WindowBg, 16),
+	(dpg.mvThemeCol_FrameBg, 17),
+	(dpg.mvThemeCol_PopupBg, 17),
+	(dpg.mvThemeCol_FrameBgActive, 17),
+	(dpg.mvThemeCol_FrameBgHovered, 17),
+	(dpg.mvThemeCol_Text, 6),
+	(dpg.mvThemeCol_MenuBarBg, 0),
+	(dpg.mvThemeCol_ScrollbarBg, 2),
+	(dpg.mvThemeCol_ScrollbarGrab, 17),
+	(dpg.mvThemeCol_Header, 0),
+	(dpg.mvThemeCol_HeaderHovered, 1),
+	(dpg.mvThemeCol_HeaderActive, 1),
+	(dpg.mvThemeCol_ScrollbarGrabActive, 1),
+	(dpg.mvThemeCol_ScrollbarGrabHovered, 1),
+	(dpg.mvThemeCol_Button, 1),
+	(dpg.mvThemeCol_ButtonHovered, 2),
+	(dpg.mvThemeCol_ButtonActive, 2),
+	(dpg.mvThemeCol_Border, 2),
+	(dpg.mvThemeCol_BorderShadow, 2),
+	(dpg.mvThemeCol_CheckMark, 14),
+	(dpg.mvThemeCol_TitleBg, 1),
+	(dpg.mvThemeCol_TitleBgActive, 14),
+]
+# Argument rows are sized from their content (see rowHeight) rather than laid out, so that
+# a RowList knows where each row is without building it. Text lines are FONT_SIZE high, and
+# the frame padding and item spacing are the dpg defaults
+FONT_SIZE = 17
+FRAME_HEIGHT = FONT_SIZE + 2 * 3
+ITEM_SPACING = 4
+# Items with a Browse button below the input
+BUTTON_TYPES = (ItemType.File, ItemType.FileWrite, ItemType.Path)
+# Height of a row with a line of help, a RowList shows max_args_shown of these
+ARG_HEIGHT = 3 * FONT_SIZE + 2 * ITEM_SPACING + FRAME_HEIGHT + ITEM_SPACING
+
+
+def rowHeight(item: Item) -> int:
+	"""Get the height of the row for an item: the lines of its help (see _helpText) and its
+	widgets, each followed by the item spacing.
+
+	:param Item item: the item
+	:return int: height in pixels
+	"""
+	lines = 2 + max(1, len(str(item.help or "").splitlines()))
+	widgets = 2 if item.type in BUTTON_TYPES else 1
+	return lines * FONT_SIZE + 2 * ITEM_SPACING + widgets * (FRAME_HEIGHT + ITEM_SPACING)
+
+
+class RowList:
+	"""Rows for a list of items in a scrolling child window, only the rows in view are built.
+
+	Rows are placed with a spacer above and below those in view, sized from the height of
+	each row (see rowHeight), so rows may differ in height. The row windows are a pool: as the
+	list scrolls, those of rows scrolled out of view are emptied and reused for the rows
+	scrolled into view, so the number of widgets does not grow with the number of items.
+	"""
+
+	def __init__(self, items: list[Item], maxHeight: int, buildRow: Callable[[Item], None]) -> None:
+		"""Add the (empty) child window for the rows, in the current container.
+
+		:param list[Item] items: an item for each row
+		:param int maxHeight: height of the list, the rows scroll once they are taller
+		:param Callable[[Item], None] buildRow: add the widgets for an item
+		"""
+		self.items = items
+		self.buildRow = buildRow
+		self.heights = [rowHeight(item) for item in items]
+		# Top of each row (and the end of the last), each is followed by the item spacing
+		self.offsets = [0]
+		for height in self.heights:
+			self.offsets.append(self.offsets[-1] + height + ITEM_SPACING)
+		self.contentHeight = max(0, self.offsets[-1] - ITEM_SPACING)
+		self.height = min(self.contentHeight, maxHeight)
+		# Row window by the index of the row it shows, and row windows not in use
+		self.rows: dict[int, int | str] = {}
+		self.free: list[int | str] = []
+		self.shown = (0, 0)
+		self.window = dpg.add_child_window(height=self.height, border=False)
+		self.top = dpg.add_spacer(parent=self.window, show=False)
+		self.bottom = dpg.add_spacer(parent=self.window, show=False)
+
+	def exists(self) -> bool:
+		"""Is the list still shown (it is removed when another subcommand is selected)."""
+		return dpg.does_item_exist(self.window)
+
+	def visibleRange(self, scroll: float) -> tuple[int, int]:
+		"""Get the rows in view when the list is scrolled to scroll.
+
+		:param float scroll: y scroll of the list
+		:return tuple[int, int]: first row in view, and the row after the last
+		"""
+		scroll = min(max(scroll, 0), self.contentHeight - self.height)
+		first = min(max(0, bisect.bisect_right(self.offsets, scroll) - 1), len(self.items) - 1)
+		last = bisect.bisect_left(self.offsets, scroll + self.height, lo=first)
+		return first, min(max(last, first + 1), len(self.items))
+
+	def update(self, scroll: float | None = None) -> bool:
+		"""Show the rows in view, building those scrolled into view.
+
+		:param float | None scroll: y scroll of the list. Defaults to that of the window
+		:return bool: if the rows in view changed
+		"""
+		if scroll is None:
+			scroll = dpg.get_y_scroll(self.window)
+		first, last = self.visibleRange(scroll)
+		if (first, last) == self.shown and self.rows:
+			return False
+		self.shown = (first, last)
+		for index in [index for index in self.rows if not first <= index < last]:
+			row = self.rows.pop(index)
+			dpg.delete_item(row, children_only=True)
+			dpg.hide_item(row)
+			self.free.append(row)
+		for index in range(first, last):
+			if index not in self.rows:
+				self.rows[index] = self.fill(index)
+		# Keep the row windows in order, between the spacers
+		for index in range(first, last):
+			dpg.move_item(self.rows[index], parent=self.window, before=self.bottom)
+		self.setSpacer(self.top, self.offsets[first] - ITEM_SPACING)
+		self.setSpacer(self.bottom, self.contentHeight - self.offsets[last])
+		return True
+
+	def fill(self, index: int) -> int | str:
+		"""Build the widgets for a row, in a free row window (or a new one).
+
+		:param int index: the row
+		:return int | str: the row window
+		"""
+		height = self.heights[index]
+		if self.free:
+			row = self.free.pop()
+			dpg.configure_item(row, height=height, show=True)
+		else:
+			row = dpg.add_child_window(
+				parent=self.window, height=height, border=False, no_scrollbar=True
+			)
+		dpg.push_container_stack(row)
+		try:
+			self.buildRow(self.items[index])
+		finally:
+			dpg.pop_container_stack()
+		return row
+
+	@staticmethod
+	def setSpacer(spacer: int | str, height: int) -> None:
+		"""Size a spacer, hidden (taking no space, not even the item spacing) if empty."""
+		dpg.configure_item(spacer, height=max(height, 0), show=height > 0)
 
 
 def hex_to_rgb(hex_code: str) -> tuple[int, int, int, int]:
@@ -33,24 +208,67 @@ class DearPyGuiWrapper(AbstractGUI):
 		(of hex strings like "#e7e7e9")
 		"""
 		self.base24Theme = base24Theme
+		# base24Theme as rgba, for dpg
+		self.palette = [hex_to_rgb(color) for color in base24Theme]
+		self.outputView: OutputView | None = None
+		# Scroll position of the output panel when last seen, None to follow the end
+		self.outputScroll: float | None = None
+		# Selected subcommand at each level of the tree, and the items shown for each
+		self.commandPath: list[CommandNode] = []
+		self.commandItems: list[list[Item]] = []
+		# Decoder for each dest of the parser, and of the parser and the selected subcommands
+		self.rootDecoders: dict[str, Decoder] = {}
+		self.decoders: dict[str, Decoder] = {}
+		# Value for each argument by dest, kept up to date by the widget callbacks so that
+		# rows do not need to be built (or still exist) to get the values
+		self.formValues: dict[str, Any] = {}
+		# A list of rows for each group shown, only the rows in view are built
+		self.rowLists: list[RowList] = []
+		# Height of each list of rows, see RowList
+		self.rowListHeight = 5 * ARG_HEIGHT
+		# Directory the file dialog was last in for each file item, by dest
+		self.lastDirectory: dict[str, str] = {}
+		# Rows of the last batch run by index
+		self.batchRows: dict[int, BatchRow] = {}
+		# (future, callback) for each page or search of a menu document still running
+		self.pendingDocuments: list[tuple[Future[Any], Callable[[Future[Any]], None]]] = []
+		# The batch file is picked with the file dialog, like a file argument
+		self.batchItem = Item(
+			type=ItemType.File,
+			display_name="batch file",
+			commands=[],
+			help="",
+			dest=BATCH_FILE_TAG,
+			default="",
+		)
 		super().__init__()
 
 	def _helpText(self, item: Item) -> None:
 		dpg.add_text(
 			helpers.stringSentencecase(f"\n- {item.dest}: {item.commands}"),
-			color=hex_to_rgb(self.base24Theme[13]),
+			color=self.palette[13],
 		)
 		dpg.add_text(helpers.stringSentencecase(item.help))
 
 	def _helpFlagWidget(self, item: Item) -> None:
 		with dpg.group(horizontal=False):
 			self._helpText(item)
-			dpg.add_checkbox(tag=item.dest, default_value=(item.default or False))
+			dpg.add_checkbox(
+				tag=item.dest,
+				default_value=self.formValues[item.dest],
+				callback=self.setFormValue,
+				user_data=item.dest,
+			)
 
 	def _helpTextWidget(self, item: Item) -> None:
 		with dpg.group(horizontal=False):
 			self._helpText(item)
-			dpg.add_input_text(tag=item.dest, default_value=(item.default or ""))
+			dpg.add_input_text(
+				tag=item.dest,
+				default_value=self.formValues[item.dest],
+				callback=self.setFormValue,
+				user_data=item.dest,
+			)
 
 	def _helpFloatCounterWidget(self, item: Item) -> None:
 		with dpg.group(horizontal=False):
@@ -58,7 +276,9 @@ class DearPyGuiWrapper(AbstractGUI):
 			dpg.add_input_float(
 				format="%.9f",
 				tag=item.dest,
-				default_value=float(item.default or 0),
+				default_value=self.formValues[item.dest],
+				callback=self.setFormValue,
+				user_data=item.dest,
 				min_value=-(2**16),
 				max_value=2**16,
 				step=1,
@@ -70,7 +290,9 @@ class DearPyGuiWrapper(AbstractGUI):
 			self._helpText(item)
 			dpg.add_input_int(
 				tag=item.dest,
-				default_value=int(item.default or 0),
+				default_value=self.formValues[item.dest],
+				callback=self.setFormValue,
+				user_data=item.dest,
 				min_value=-(2**16),
 				max_value=2**16,
 				step=1,
@@ -78,49 +300,85 @@ class DearPyGuiWrapper(AbstractGUI):
 			)
 
 	def _helpFileWidget(self, item: Item) -> None:
-		"""Create a UI element with an input text field and a file picker."""
-
-		def file_picker_callback(_sender: str, app_data: dict[str, Any]) -> None:
-			"""Update the input text field with the selected file path."""
-
-			file_path = ""
-			# User may have selected and edited, or just written a name
-			user_input_path = Path(app_data.get("file_path_name", ""))
-
-			# Get the selection if possible
-			selected_path = Path(next(iter(app_data.get("selections", {}).values()), ""))
-
-			if user_input_path.stem == selected_path.stem:
-				file_path = selected_path
-			# User may have selected and edited, or just written a name
-			else:
-				file_path = user_input_path.stem + Path(item.default or "").suffix
-			dpg.set_value(item.dest, str(file_path))
-
+		"""Create a UI element with an input text field and a button to open the file dialog."""
 		with dpg.group(horizontal=False):
 			self._helpText(item)
 
-			dpg.add_input_text(tag=item.dest, default_value=(item.default or ""))
-
-			dpg.add_button(
-				label="Browse", callback=lambda: dpg.show_item(f"{item.dest}_file_dialog")
+			dpg.add_input_text(
+				tag=item.dest,
+				default_value=self.formValues[item.dest],
+				callback=self.setFormValue,
+				user_data=item.dest,
 			)
 
+			dpg.add_button(label="Browse", callback=lambda: self.openFileDialog(item))
+
+	def openFileDialog(self, item: Item) -> None:
+		"""Open the file dialog for an item. One dialog is shared by every file widget, and
+		is created the first time it is needed.
+
+		The dialog opens in the directory last used for the item, or that of its value.
+
+		:param Item item: the item to set the selected file path for
+		"""
+		if not dpg.does_item_exist(FILE_DIALOG_TAG):
 			with dpg.file_dialog(
 				directory_selector=False,
 				show=False,
-				callback=file_picker_callback,
-				id=f"{item.dest}_file_dialog",
+				callback=self.file_picker_callback,
+				tag=FILE_DIALOG_TAG,
 				width=650,
 				height=400,
 				file_count=1,
 			):
-				dpg.add_file_extension(".*", color=hex_to_rgb(self.base24Theme[13]))
+				dpg.add_file_extension(".*", color=self.palette[13])
+
+		current = Path(str(self.formValues.get(item.dest) or ""))
+		dpg.configure_item(
+			FILE_DIALOG_TAG,
+			user_data=item,
+			default_path=self.lastDirectory.get(item.dest, str(current.parent)),
+			default_filename=current.name or ".",
+		)
+		dpg.show_item(FILE_DIALOG_TAG)
+
+	def file_picker_callback(self, _sender: str, app_data: dict[str, Any], item: Item) -> None:
+		"""Update the input text field of the item the file dialog was opened for with the
+		selected file path.
+
+		:param str _sender: [unused]
+		:param dict[str, Any] app_data: the selection from the file dialog
+		:param Item item: the item the file dialog was opened for
+		"""
+		file_path = ""
+		# User may have selected and edited, or just written a name
+		user_input_path = Path(app_data.get("file_path_name", ""))
+
+		# Get the selection if possible
+		selected_path = Path(next(iter(app_data.get("selections", {}).values()), ""))
+
+		if user_input_path.stem == selected_path.stem:
+			file_path = selected_path
+		# User may have selected and edited, or just written a name
+		else:
+			file_path = user_input_path.stem + Path(item.default or "").suffix
+		self.formValues[item.dest] = str(file_path)
+		if app_data.get("current_path"):
+			self.lastDirectory[item.dest] = app_data["current_path"]
+		# The row may have been removed (eg. another subcommand selected) or not built yet
+		if dpg.does_item_exist(item.dest):
+			dpg.set_value(item.dest, str(file_path))
 
 	def _helpDropdownWidget(self, item: Item) -> None:
 		with dpg.group(horizontal=False):
 			self._helpText(item)
-			dpg.add_combo(tag=item.dest, items=item.additional_properties["choices"])
+			dpg.add_combo(
+				tag=item.dest,
+				items=item.additional_properties["choices"],
+				default_value=self.formValues[item.dest],
+				callback=self.setFormValue,
+				user_data=item.dest,
+			)
 
 	def addWidgetFromItem(self, item: Item) -> None:
 		"""Select a widget based on the item type.
@@ -144,193 +402,399 @@ class DearPyGuiWrapper(AbstractGUI):
 			return functionMap[item.type](item)
 		return None
 
+	def initialValue(self, item: Item) -> Any:
+		"""Get the value of the widget for an item before it is changed.
+
+		:param Item item: the item
+		:return Any: initial value
+		"""
+		if item.type == ItemType.Bool:
+			return item.default or False
+		if item.type == ItemType.Int:
+			return int(item.default or 0)
+		if item.type == ItemType.Float:
+			return float(item.default or 0)
+		if item.type == ItemType.Choice:
+			return ""
+		return item.default or ""
+
+	def setFormValue(self, _sender: str, app_data: Any, dest: str) -> None:
+		"""Store the value of a widget, used as the callback of each widget.
+
+		:param str _sender: [unused]
+		:param Any app_data: the new value
+		:param str dest: dest of the item
+		"""
+		self.formValues[dest] = app_data
+
+	@trace.traced("addItemsAndGroups")
 	def addItemsAndGroups(
 		self,
 		section: Group,
 	) -> list[Item]:
 		"""Items and groups and return a list of these so we can get values from the dpg widgets.
 
+		The rows for the items are added to a RowList, so only those in view are built (see
+		buildRows).
+
 		:param Group section: section with a name to display and items
 		:return list[Item]: flattened list of items
 		"""
 		dpg.add_text(
 			f"=== {helpers.stringTitlecase(section.name, ' ')} ===",
-			color=hex_to_rgb(self.base24Theme[14]),
+			color=self.palette[14],
 		)
 
 		items = []
-
 		for item in section.arg_items:
 			if item.type == ItemType.RadioGroup:
-				rGroup = item.additional_properties["radio"]
-				for rElement in rGroup:
-					self.addWidgetFromItem(rElement)
-					items.append(rElement)
+				items.extend(item.additional_properties["radio"])
 			else:
-				self.addWidgetFromItem(item)
 				items.append(item)
+
+		for item in items:
+			if item.dest:
+				self.formValues[item.dest] = self.initialValue(item)
+		if items:
+			rowList = RowList(list(items), self.rowListHeight, self.addWidgetFromItem)
+			rowList.update(0)
+			self.rowLists.append(rowList)
+
 		for group in section.groups:
 			items.extend(self.addItemsAndGroups(group))
 
 		return items
 
+	def buildRows(self) -> None:
+		"""Build the rows scrolled into view of each list of rows, called once per frame."""
+		# Lists are removed when another subcommand is selected
+		self.rowLists = [rowList for rowList in self.rowLists if rowList.exists()]
+		scrolled = [(rowList, dpg.get_y_scroll(rowList.window)) for rowList in self.rowLists]
+		changed = [
+			(rowList, y) for rowList, y in scrolled if rowList.visibleRange(y) != rowList.shown
+		]
+		if not changed:
+			return
+		with trace.span("buildRows", lists=len(changed)):
+			for rowList, y in changed:
+				rowList.update(y)
+
+	def addCommandLevel(self, nodes: list[CommandNode], depth: int) -> None:
+		"""Add a combo to select a subcommand, with a container below it for the widgets of the
+		selected subcommand.
+
+		:param list[CommandNode] nodes: subcommands to choose from
+		:param int depth: level in the subcommand tree, 0 for the subcommands of the program
+		"""
+		nodeMap = {node.name: node for node in nodes}
+		container = f"{COMMANDS_TAG}_{depth}"
+
+		def select(_sender: str, name: str) -> None:
+			self.selectCommand(nodeMap[name], depth, container)
+
+		dpg.add_text("=== Command ===", color=self.palette[14])
+		dpg.add_combo(items=list(nodeMap), callback=select)
+		dpg.add_group(tag=container)
+
+	def selectCommand(self, node: CommandNode, depth: int, container: str) -> None:
+		"""Show the widgets for a subcommand (converting it if needed) in place of those for
+		the previously selected subcommand at this depth.
+
+		:param CommandNode node: the selected subcommand
+		:param int depth: level in the subcommand tree
+		:param str container: tag of the group to add the widgets to
+		"""
+		del self.commandPath[depth:]
+		del self.commandItems[depth:]
+		dpg.delete_item(container, children_only=True)
+
+		parserRep = node.load()
+		items = []
+		with dpg.group(parent=container):
+			if node.help:
+				dpg.add_text(helpers.stringSentencecase(node.help))
+			for widget in parserRep.widgets:
+				items.extend(self.addItemsAndGroups(widget))
+			if parserRep.subcommands:
+				self.addCommandLevel(parserRep.subcommands, depth + 1)
+		self.commandPath.append(node)
+		self.commandItems.append(items)
+		self.decoders = commandDecoders(self.rootDecoders, self.commandPath)
+
+	def getValues(self, items: list[Item]) -> dict[str, Any]:
+		"""Get the values of the form for each item, keyed by dest. Along with those for the
+		selected subcommands.
+
+		:param list[Item] items: items with a widget (not including those for subcommands)
+		:return dict[str, Any]: values to pass to the run_callback
+		"""
+		_items: list[Item] = [item for item in items if item.dest]
+		_items.extend(item for level in self.commandItems for item in level if item.dest)
+		myd = {}
+		for node in self.commandPath:
+			myd.update(node.values)
+		for item in _items:
+			myd[item.dest] = self.formValues.get(item.dest)
+		return myd
+
+	def showJobStatus(self, job: Job) -> None:
+		"""Show the state of a job in the status line.
+
+		:param Job job: the job to show
+		"""
+		colors = {JobState.DONE: 11, JobState.FAILED: 8}
+		dpg.set_value(STATUS_TAG, job.describe())
+		dpg.configure_item(STATUS_TAG, color=self.palette[colors.get(job.state, 13)])
+
+	def showBatch(self, rows: list[BatchRow]) -> None:
+		"""Show a row in the batch table for each row of a batch run, replacing the last run.
+
+		:param list[BatchRow] rows: rows of the batch run
+		"""
+		dpg.delete_item(BATCH_TABLE_TAG, children_only=True, slot=1)
+		self.batchRows = {row.index: row for row in rows}
+		for row in rows:
+			with dpg.table_row(parent=BATCH_TABLE_TAG):
+				dpg.add_text(str(row.index))
+				dpg.add_text("", tag=f"{BATCH_TABLE_TAG}_{row.index}_state")
+				dpg.add_text("", tag=f"{BATCH_TABLE_TAG}_{row.index}_time")
+				dpg.add_text("", tag=f"{BATCH_TABLE_TAG}_{row.index}_output")
+			self.showBatchRow(row)
+		dpg.show_item(BATCH_TABLE_TAG)
+
+	def showBatchRow(self, row: BatchRow) -> None:
+		"""Show the state of a row of the batch run in the batch table.
+
+		:param BatchRow row: the row to show
+		"""
+		# Rows of an earlier batch run may still finish
+		if self.batchRows.get(row.index) is not row:
+			return
+		colors = {JobState.DONE: 11, JobState.FAILED: 8}
+		tag = f"{BATCH_TABLE_TAG}_{row.index}"
+		dpg.set_value(f"{tag}_state", row.state.value)
+		dpg.configure_item(f"{tag}_state", color=self.palette[colors.get(row.state, 13)])
+		if row.finished and row.started:
+			dpg.set_value(f"{tag}_time", f"{row.finished - row.started:.2f}s")
+		dpg.set_value(f"{tag}_output", row.describe())
+
+	def updateOutput(self) -> None:
+		"""Show new output from the current job, called once per frame.
+
+		The panel holds a window of lines between two spacers sized for the lines before and
+		after it, so it scrolls over all of the output. The window follows the end of the
+		output while the panel is scrolled to the bottom.
+		"""
+		view = self.outputView
+		if view is None:
+			return
+		scroll = dpg.get_y_scroll(OUTPUT_TAG)
+		if scroll != self.outputScroll:
+			self.outputScroll = scroll
+			atEnd = scroll >= dpg.get_y_scroll_max(OUTPUT_TAG) - FONT_SIZE
+			view.scrollTo(
+				None if atEnd else int(scroll) // FONT_SIZE, OUTPUT_HEIGHT // FONT_SIZE + 1
+			)
+		text = view.render()
+		if text is None:
+			return
+		after = view.count - view.start - (text.count("\n") + 1)
+		RowList.setSpacer(f"{OUTPUT_TAG}_top", view.start * FONT_SIZE - ITEM_SPACING)
+		RowList.setSpacer(f"{OUTPUT_TAG}_bottom", after * FONT_SIZE - ITEM_SPACING)
+		dpg.set_value(OUTPUT_TEXT_TAG, text)
+		if view.first is None:
+			dpg.set_y_scroll(OUTPUT_TAG, -1.0)
+
 	def open_menu_item(self, sender: str, _app_data: None) -> None:
-		"""Open a menu item.
+		"""Open a menu item in a document viewer, a page at a time.
 
 		:param _type_ sender: file to open
 		:param _type_ _app_data: [unused]
 		"""
 		f = Path(sender)
-		if f.is_file():
-			with dpg.window(label=f.name, width=825, height=400, horizontal_scrollbar=True):
-				dpg.add_text(helpers.read_file(sender))
-		else:
+		if not f.is_file():
 			with dpg.window(label="Error"):
 				dpg.add_text(f"File {sender} Not Found :(")
+			return
+		viewer: dict[str, Any] = {"pager": DocumentPager(sender), "page": 0}
+		with dpg.window(label=f.name, width=825, height=400):
+			with dpg.group(horizontal=True):
+				dpg.add_button(
+					label="<",
+					callback=lambda: self.showPage(viewer, viewer["page"] - 1),
+				)
+				dpg.add_button(
+					label=">",
+					callback=lambda: self.showPage(viewer, viewer["page"] + 1),
+				)
+				viewer["label"] = dpg.add_text(f"Rendering {f.name}...")
+				dpg.add_input_text(
+					hint="Find (enter)",
+					width=200,
+					on_enter=True,
+					callback=lambda _sender, query: self.findInDocument(viewer, query),
+				)
+			viewer["results"] = dpg.add_listbox(
+				[],
+				num_items=5,
+				width=-1,
+				show=False,
+				callback=lambda _sender, result: self.showPage(
+					viewer, viewer["pager"].pageOf(int(result.split(":", 1)[0]) - 1)
+				),
+			)
+			with dpg.child_window(horizontal_scrollbar=True) as view:
+				viewer["view"] = view
+				# Only the lines in view are drawn
+				viewer["lines"] = dpg.add_clipper()
+		self.showPage(viewer, 0)
+
+	def showPage(self, viewer: dict[str, Any], number: int) -> None:
+		"""Load a page of a document viewer, and show it once loaded.
+
+		:param dict[str, Any] viewer: the document viewer
+		:param int number: page number, starting at 0
+		"""
+		pageCount = viewer["pager"].pageCount
+		number = max(0, min(number, pageCount - 1) if pageCount else number)
+		self.whenDone(
+			viewer["pager"].loadPage(number), lambda page: self.drawPage(viewer, number, page)
+		)
+
+	def drawPage(self, viewer: dict[str, Any], number: int, page: Future[list[str]]) -> None:
+		"""Show a loaded page of a document viewer, replacing the last page shown.
+
+		:param dict[str, Any] viewer: the document viewer
+		:param int number: page number, starting at 0
+		:param Future[list[str]] page: lines of the page
+		"""
+		# The window may have been closed while loading
+		if not dpg.does_item_exist(viewer["lines"]):
+			return
+		try:
+			lines = page.result()
+		except (OSError, ValueError) as exc:
+			dpg.set_value(viewer["label"], f"Could not read the file - {exc}")
+			return
+		pager: DocumentPager = viewer["pager"]
+		viewer["page"] = min(number, pager.pageCount - 1) if pager.pageCount else number
+		dpg.set_value(viewer["label"], f"Page {viewer['page'] + 1}/{pager.pageCount or '?'}")
+		dpg.delete_item(viewer["lines"], children_only=True)
+		for line in lines:
+			dpg.add_text(line, parent=viewer["lines"])
+		dpg.set_y_scroll(viewer["view"], 0.0)
+
+	def findInDocument(self, viewer: dict[str, Any], query: str) -> None:
+		"""Search a document viewer off the gui thread, listing the matching lines once done.
+
+		:param dict[str, Any] viewer: the document viewer
+		:param str query: text to find
+		"""
+		if not query:
+			dpg.hide_item(viewer["results"])
+			return
+
+		def showResults(search: Future[list[tuple[int, str]]]) -> None:
+			if not dpg.does_item_exist(viewer["results"]):
+				return
+			if search.exception() is not None:
+				items = [f"Could not search the file - {search.exception()}"]
+			else:
+				items = [f"{lineNumber + 1}: {text}" for lineNumber, text in search.result()]
+			dpg.configure_item(
+				viewer["results"], items=items or [f"No lines contain {query!r}"], show=True
+			)
+			pageCount = viewer["pager"].pageCount
+			dpg.set_value(viewer["label"], f"Page {viewer['page'] + 1}/{pageCount or '?'}")
+
+		self.whenDone(viewer["pager"].search(query), showResults)
+
+	def whenDone(self, future: Future[Any], callback: Callable[[Future[Any]], None]) -> None:
+		"""Call callback with the future once it is done, on the gui thread.
+
+		:param Future[Any] future: the future to wait for
+		:param Callable[[Future[Any]], None] callback: called with the future
+		"""
+		if future.done():
+			callback(future)
+		else:
+			self.pendingDocuments.append((future, callback))
+
+	def updateDocuments(self) -> None:
+		"""Call the callback for each page or search of a menu document that is done."""
+		pending = []
+		for future, callback in self.pendingDocuments:
+			if future.done():
+				callback(future)
+			else:
+				pending.append((future, callback))
+		self.pendingDocuments = pending
 
 	def main(
 		self,
 		buildSpec: FullBuildSpec,
 		quit_callback: Callable[[], None],
-		run_callback: Callable[[dict[str, Any]], None],
+		run_callback: Callable[[dict[str, Any], dict[str, Decoder]], Any],
+		poll_callback: Callable[[], list[Job | BatchRow]],
+		batch_callback: Callable[[dict[str, Any], dict[str, Decoder], str], list[BatchRow]],
 	) -> None:
 		"""Run the gui (dpg) with a given buildSpec, quit_callback, and run_callback.
 
-		- Theming + Configure dpg
-		- Menu Prep
-		- Create Window, set up Menu and Widgets
-		- Then, start dpg
+		- Theming + Configure dpg (setupContext)
+		- Menu Prep, Create Window, set up Menu and Widgets (createWindow)
+		- Create and show the viewport (showViewport)
+		- Then, start dpg, polling for finished jobs each frame (renderLoop)
 
 		:param FullBuildSpec buildSpec: Full cli parse/ build spec
 		:param Callable[[], None] quit_callback: generic callable used to quit
-		:param Callable[[dict[str, Any]], None] run_callback: generic callable used to run
+		:param Callable[[dict[str, Any], dict[str, Decoder]], Any] run_callback: generic
+		callable used to run
+		:param Callable[[], list[Job | BatchRow]] poll_callback: get jobs (and batch rows) that
+		finished since last call
+		:param Callable[[dict[str, Any], dict[str, Decoder], str], list[BatchRow]]
+		batch_callback: callable used to run once per row of a batch file
 		"""
 
-		################
-		# Theming + Configure dpg
-		################
+		self.setupContext()
+		close_dpg = self.createWindow(buildSpec, quit_callback, run_callback, batch_callback)
+		self.showViewport(buildSpec, close_dpg)
+		self.renderLoop(poll_callback)
+		dpg.destroy_context()
 
+	def setupContext(self) -> None:
+		"""Create the dpg context and bind the font and the base24 theme."""
 		dpg.create_context()
 		with dpg.font_registry():
-			default_font = dpg.add_font(f"{THISDIR}/FiraCode-Regular.ttf", 17)
+			default_font = dpg.add_font(f"{THISDIR}/FiraCode-Regular.ttf", FONT_SIZE)
 
 		with dpg.theme() as global_theme, dpg.theme_component(dpg.mvAll):
-			dpg.add_theme_color(
-				dpg.mvThemeCol_WindowBg,
-				hex_to_rgb(self.base24Theme[16]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_FrameBg,
-				hex_to_rgb(self.base24Theme[17]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_PopupBg,
-				hex_to_rgb(self.base24Theme[17]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_FrameBgActive,
-				hex_to_rgb(self.base24Theme[17]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_FrameBgHovered,
-				hex_to_rgb(self.base24Theme[17]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_Text,
-				hex_to_rgb(self.base24Theme[6]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_MenuBarBg,
-				hex_to_rgb(self.base24Theme[0]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_ScrollbarBg,
-				hex_to_rgb(self.base24Theme[2]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_ScrollbarGrab,
-				hex_to_rgb(self.base24Theme[17]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_Header,
-				hex_to_rgb(self.base24Theme[0]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_HeaderHovered,
-				hex_to_rgb(self.base24Theme[1]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_HeaderActive,
-				hex_to_rgb(self.base24Theme[1]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_ScrollbarGrabActive,
-				hex_to_rgb(self.base24Theme[1]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_ScrollbarGrabHovered,
-				hex_to_rgb(self.base24Theme[1]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_Button,
-				hex_to_rgb(self.base24Theme[1]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_ButtonHovered,
-				hex_to_rgb(self.base24Theme[2]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_ButtonActive,
-				hex_to_rgb(self.base24Theme[2]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_Border,
-				hex_to_rgb(self.base24Theme[2]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_BorderShadow,
-				hex_to_rgb(self.base24Theme[2]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_CheckMark,
-				hex_to_rgb(self.base24Theme[14]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_TitleBg,
-				hex_to_rgb(self.base24Theme[1]),
-				category=dpg.mvThemeCat_Core,
-			)
-			dpg.add_theme_color(
-				dpg.mvThemeCol_TitleBgActive,
-				hex_to_rgb(self.base24Theme[14]),
-				category=dpg.mvThemeCat_Core,
-			)
+			for themeCol, index in THEME_COLORS:
+				dpg.add_theme_color(themeCol, self.palette[index], category=dpg.mvThemeCat_Core)
 			dpg.add_theme_style(dpg.mvStyleVar_FrameRounding, 5, category=dpg.mvThemeCat_Core)
 			dpg.add_theme_style(dpg.mvStyleVar_FrameBorderSize, 1, category=dpg.mvThemeCat_Core)
 
 		dpg.bind_theme(global_theme)
 		dpg.bind_font(default_font)
 
+	def createWindow(
+		self,
+		buildSpec: FullBuildSpec,
+		quit_callback: Callable[[], None],
+		run_callback: Callable[[dict[str, Any], dict[str, Decoder]], Any],
+		batch_callback: Callable[[dict[str, Any], dict[str, Decoder], str], list[BatchRow]],
+	) -> Callable[[], None]:
+		"""Create the primary window with the menu, widgets, "Run" and "Exit" buttons, and the
+		batch file picker and table.
+
+		:param FullBuildSpec buildSpec: Full cli parse/ build spec
+		:param Callable[[], None] quit_callback: generic callable used to quit
+		:param Callable[[dict[str, Any], dict[str, Decoder]], Any] run_callback: generic
+		callable used to run
+		:param Callable[[dict[str, Any], dict[str, Decoder], str], list[BatchRow]]
+		batch_callback: callable used to run once per row of a batch file
+		:return Callable[[], None]: callback that closes dpg and quits
+		"""
+		self.rowListHeight = max(1, buildSpec.max_args_shown) * ARG_HEIGHT
 		################
 		# Menu Prep
 		################
@@ -347,31 +811,16 @@ class DearPyGuiWrapper(AbstractGUI):
 
 		# Define "Run" and "Exit" buttons
 		def _run_callback() -> None:
-			_items: list[Item] = [item for item in items if item.dest]
-			myd = {}
-			for item in _items:
-				value = dpg.get_value(item.dest)
-				key = f"{item.dest}{SEP}{item.type}"
-				if item.type in [ItemType.File, ItemType.FileWrite]:
-					prop = item.additional_properties
-					key += f";{prop.get('file_mode')};{prop.get('file_encoding')}"
-
-				myd[key] = value
-
-			run_callback(myd)
+			job = run_callback(self.getValues(items), self.decoders)
+			if isinstance(job, Job):
+				self.outputView = OutputView(job.output)
+				self.outputScroll = None
+				self.showJobStatus(job)
 
 		def close_dpg() -> None:
 			dpg.destroy_context()
 			quit_callback()
 
-		dpg.create_viewport(
-			title=buildSpec.program_name,
-			width=875,
-			height=min(max(400, 120 * buildSpec.max_args_shown), 1080),
-		)
-
-		dpg.set_exit_callback(close_dpg)
-
 		with dpg.window(label="", tag="primary", on_close=close_dpg):
 			if len(buildSpec.menu) > 0:
 				with dpg.menu_bar(), dpg.menu(label="Open"):
@@ -381,6 +830,7 @@ class DearPyGuiWrapper(AbstractGUI):
 							tag=buildSpec.menu[menu_item],
 							callback=self.open_menu_item,
 						)
+			self.addIcon(buildSpec.image)
 			# Program Description
 			dpg.add_text(
 				helpers.stringSentencecase(
@@ -392,16 +842,118 @@ class DearPyGuiWrapper(AbstractGUI):
 			items = []
 			for widget in buildSpec.widgets:
 				items.extend(self.addItemsAndGroups(widget))
+			self.rootDecoders = self.decoders = buildDecoders(buildSpec.widgets)
+			if buildSpec.subcommands:
+				with dpg.group(tag=COMMANDS_TAG):
+					self.addCommandLevel(buildSpec.subcommands, 0)
 
 			dpg.add_button(label="Run", callback=_run_callback)
 			dpg.add_button(label="Exit", callback=close_dpg)
+			dpg.add_text("", tag=STATUS_TAG)
+			with dpg.child_window(tag=OUTPUT_TAG, height=OUTPUT_HEIGHT, horizontal_scrollbar=True):
+				dpg.add_spacer(tag=f"{OUTPUT_TAG}_top", show=False)
+				dpg.add_text("", tag=OUTPUT_TEXT_TAG)
+				dpg.add_spacer(tag=f"{OUTPUT_TAG}_bottom", show=False)
 
-		################
-		# Start dpg
-		################
+			self.addBatchPanel(items, batch_callback)
+
+		return close_dpg
+
+	def addIcon(self, imagePath: str) -> None:
+		"""Show the program icon (the same cached png as the viewport icon), if there is one.
+
+		:param str imagePath: path to the image, or ""
+		"""
+		if not imagePath:
+			return
+		image = dpg.load_image(icons.iconFile(imagePath))
+		if image is None:
+			return
+		width, height, _channels, data = image
+		with dpg.texture_registry():
+			texture = dpg.add_static_texture(width, height, data)
+		dpg.add_image(texture)
+
+	def addBatchPanel(
+		self,
+		items: list[Item],
+		batch_callback: Callable[[dict[str, Any], dict[str, Decoder], str], list[BatchRow]],
+	) -> None:
+		"""Add the batch file picker, "Run Batch" button and the (hidden) table of rows.
+
+		:param list[Item] items: items in the form
+		:param Callable[[dict[str, Any], dict[str, Decoder], str], list[BatchRow]]
+		batch_callback: callable used to run once per row of a batch file
+		"""
+
+		def _batch_callback() -> None:
+			try:
+				rows = batch_callback(
+					self.getValues(items), self.decoders, self.formValues[BATCH_FILE_TAG]
+				)
+			except (OSError, ValueError) as exc:
+				dpg.set_value(STATUS_TAG, f"Batch failed - {exc}")
+				dpg.configure_item(STATUS_TAG, color=self.palette[8])
+				return
+			self.showBatch(rows)
+
+		self.formValues[BATCH_FILE_TAG] = ""
+		dpg.add_text("Batch file (csv or jsonl), with a column for each argument to set")
+		with dpg.group(horizontal=True):
+			dpg.add_input_text(
+				tag=BATCH_FILE_TAG, callback=self.setFormValue, user_data=BATCH_FILE_TAG
+			)
+			dpg.add_button(label="Browse", callback=lambda: self.openFileDialog(self.batchItem))
+			dpg.add_button(label="Run Batch", callback=_batch_callback)
+		with dpg.table(
+			tag=BATCH_TABLE_TAG,
+			header_row=True,
+			clipper=True,
+			scrollY=True,
+			height=200,
+			show=False,
+		):
+			dpg.add_table_column(label="Row", width_fixed=True)
+			dpg.add_table_column(label="State", width_fixed=True)
+			dpg.add_table_column(label="Time", width_fixed=True)
+			dpg.add_table_column(label="Output")
+
+	def showViewport(self, buildSpec: FullBuildSpec, close_dpg: Callable[[], None]) -> None:
+		"""Create and show the viewport, with the primary window filling it.
 
+		:param FullBuildSpec buildSpec: Full cli parse/ build spec
+		:param Callable[[], None] close_dpg: called when the viewport is closed
+		"""
+		icon = icons.iconFile(buildSpec.image) if buildSpec.image else ""
+		dpg.create_viewport(
+			title=buildSpec.program_name,
+			small_icon=icon,
+			large_icon=icon,
+			width=875,
+			height=min(max(400, 120 * buildSpec.max_args_shown), 1080),
+		)
+		dpg.set_exit_callback(close_dpg)
 		dpg.setup_dearpygui()
 		dpg.show_viewport()
 		dpg.set_primary_window(window="primary", value=True)
-		dpg.start_dearpygui()
-		dpg.destroy_context()
+
+	def renderLoop(self, poll_callback: Callable[[], list[Job | BatchRow]]) -> None:
+		"""Render frames until the viewport is closed, polling for finished jobs and job output
+		and building the argument rows scrolled into view.
+
+		:param Callable[[], list[Job | BatchRow]] poll_callback: get jobs (and batch rows) that
+		finished since last call
+		"""
+		# The first frame also creates the fonts and textures
+		with trace.span("first frame"):
+			dpg.render_dearpygui_frame()
+		while dpg.is_dearpygui_running():
+			for job in poll_callback():
+				if isinstance(job, BatchRow):
+					self.showBatchRow(job)
+				else:
+					self.showJobStatus(job)
+			self.updateOutput()
+			self.updateDocuments()
+			self.buildRows()
+			dpg.render_dearpygui_frame()
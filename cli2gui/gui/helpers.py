@@ -3,7 +3,18 @@ get_base24_theme etc."""
 
 from __future__ import annotations
 
+import functools
+import io
+import threading
+from collections import OrderedDict
+from itertools import islice
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from cli2gui import trace
+
+if TYPE_CHECKING:
+	from concurrent.futures import Future, ThreadPoolExecutor
 
 try:
 	from getostheme import isDarkMode
@@ -14,12 +25,25 @@ except ImportError:
 		return True
 
 
-import yaml
+# Themes from files, keyed by the path, mtime and size of the file
+_themes: dict[str, list[str]] = {}
+
+
+def _parseThemeFile(themeFile: Path) -> list[str]:
+	"""Parse a base24 scheme.yaml, with the libyaml loader if available."""
+	import yaml
+
+	loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+	schemeDictTheme = yaml.load(themeFile.read_text(encoding="utf-8"), Loader=loader)  # noqa: S506
+	return ["#" + schemeDictTheme["palette"][f"base{x:02X}"] for x in range(24)]
 
 
 def _themeFromFile(themeFile: str) -> list[str]:
 	"""Set the base24 theme from a base24 scheme.yaml to the application.
 
+	The parsed theme is cached in memory and on disk (see cli2gui.cache) so the file is only
+	parsed again once it changes.
+
 	Args:
 	----
 		themeFile (str): path to file
@@ -29,10 +53,31 @@ def _themeFromFile(themeFile: str) -> list[str]:
 		list[str]: theme to set
 
 	"""
-	schemeDictTheme = yaml.safe_load(Path(themeFile).read_text(encoding="utf-8"))
-	return ["#" + schemeDictTheme["palette"][f"base{x:02X}"] for x in range(24)]
+	import json
+
+	from cli2gui import cache
+
+	path = Path(themeFile).resolve()
+	stat = path.stat()
+	key = repr((cache.CACHE_FORMAT, str(path), stat.st_mtime_ns, stat.st_size))
+	if key in _themes:
+		return _themes[key]
+
+	diskCache = cache.DiskCache("themes", maxBytes=1024**2) if cache.cacheEnabled() else None
+	data = diskCache.get(key) if diskCache else None
+	try:
+		theme = json.loads(data) if data else None
+	except ValueError:
+		theme = None
+	if not isinstance(theme, list):
+		theme = _parseThemeFile(path)
+		if diskCache:
+			diskCache.put(key, json.dumps(theme).encode("utf-8"))
+	_themes[key] = theme
+	return theme
 
 
+@trace.traced("get_base24_theme")
 def get_base24_theme(
 	theme: str | list[str],
 	darkTheme: str | list[str],
@@ -130,22 +175,143 @@ def stringSentencecase(string: str) -> str:
 	return ""
 
 
-def read_file(file_path: str, maxLines: int = 200) -> str:
-	"""Get the contents of a file path, attempt to parse with catpandoc..pandoc2plain.
+# Renderings of documents (by pandoc2plain) keyed by the path, mtime, size and width,
+# least recently used first
+_renderings: OrderedDict[str, str] = OrderedDict()
+_lock = threading.Lock()
+RENDERINGS_KEPT = 8
 
-	:param str file_path: path to the file (absolute recommended)
-	:return str: file contents
+
+@functools.cache
+def renderer() -> ThreadPoolExecutor:
+	"""Get the thread that renders documents off the gui thread, started on first use."""
+	from concurrent.futures import ThreadPoolExecutor
+
+	return ThreadPoolExecutor(1, thread_name_prefix="cli2gui-render")
+
+
+def _renderingKey(file_path: str, width: int) -> str:
+	"""Get the cache key for the rendering of a document."""
+	from cli2gui import cache
+
+	path = Path(file_path).resolve()
+	stat = path.stat()
+	return repr((cache.CACHE_FORMAT, str(path), stat.st_mtime_ns, stat.st_size, width))
+
+
+def _cachedRendering(key: str) -> str | None:
+	"""Get a rendering from the cache in memory, then on disk. Never renders."""
+	import zlib
+
+	from cli2gui import cache
+
+	with _lock:
+		if key in _renderings:
+			_renderings.move_to_end(key)
+			return _renderings[key]
+	data = cache.DiskCache("pandoc").get(key) if cache.cacheEnabled() else None
+	if data is None:
+		return None
+	try:
+		text = zlib.decompress(data).decode("utf-8")
+	except (zlib.error, ValueError):
+		return None
+	_keepRendering(key, text)
+	return text
+
+
+def _keepRendering(key: str, text: str) -> None:
+	"""Keep a rendering in memory, dropping the least recently used past RENDERINGS_KEPT."""
+	with _lock:
+		_renderings[key] = text
+		_renderings.move_to_end(key)
+		while len(_renderings) > RENDERINGS_KEPT:
+			_renderings.popitem(last=False)
+
+
+def renderDocument(file_path: str, width: int = 80) -> str | None:
+	"""Get a document rendered as plain text by catpandoc..pandoc2plain.
+
+	Renderings are cached in memory and on disk (see cli2gui.cache), so a document is only
+	rendered again once it changes.
+
+	:param str file_path: path to the document
+	:param int width: width to wrap the text to. Defaults to 80
+	:return str | None: the rendered text, None if catpandoc is not installed
 	"""
 	try:
 		from catpandoc.application import pandoc2plain
-
-		lines = pandoc2plain(file_path, 80).split("\n")
 	except ImportError:
-		lines = Path(file_path).read_text(encoding="utf-8").split("\n")
+		return None
+	import zlib
+
+	from cli2gui import cache
 
-	if len(lines) > maxLines:
-		popupText = "\n".join(lines[:maxLines]) + "\n\nMORE TEXT IN SRC FILE"
+	key = _renderingKey(file_path, width)
+	text = _cachedRendering(key)
+	if text is None:
+		text = pandoc2plain(file_path, width)
+		if cache.cacheEnabled():
+			cache.DiskCache("pandoc").put(key, zlib.compress(text.encode("utf-8")))
+		_keepRendering(key, text)
+	return text
+
+
+def read_file(file_path: str, maxLines: int = 200, offset: int = 0) -> str:
+	"""Get up to maxLines lines of a file path from line offset, attempt to parse with
+	catpandoc..pandoc2plain.
+
+	Plain files are streamed, reading stops once the lines (and one more, to tell if there
+	is more text) have been read so large files are never held in memory. Renderings are
+	cached, see renderDocument.
+
+	:param str file_path: path to the file (absolute recommended)
+	:param int maxLines: maximum number of lines to get. Defaults to 200
+	:param int offset: number of lines to skip, to page through the file. Defaults to 0
+	:return str: file contents
+	"""
+	text = renderDocument(file_path)
+	if text is not None:
+		window = list(islice(io.StringIO(text), offset, offset + maxLines + 1))
+	else:
+		with Path(file_path).open(encoding="utf-8") as file:
+			window = list(islice(file, offset, offset + maxLines + 1))
+
+	if len(window) > maxLines:
+		popupText = "".join(window[:maxLines]).removesuffix("\n") + "\n\nMORE TEXT IN SRC FILE"
 	else:
-		popupText = "\n".join(lines)
+		popupText = "".join(window)
 
 	return popupText
+
+
+def read_file_async(file_path: str, maxLines: int = 200, offset: int = 0) -> Future[str]:
+	"""Get read_file on a background thread, as rendering a large document can take a while.
+
+	The future is already done if nothing needs rendering (the rendering is cached or
+	catpandoc is not installed), so the text can be shown at once. Otherwise show a
+	placeholder until it is done.
+
+	:param str file_path: path to the file (absolute recommended)
+	:param int maxLines: maximum number of lines to get. Defaults to 200
+	:param int offset: number of lines to skip, to page through the file. Defaults to 0
+	:return Future[str]: file contents
+	"""
+	import importlib.util
+	from concurrent.futures import Future
+
+	try:
+		rendered = importlib.util.find_spec("catpandoc") is None or (
+			_cachedRendering(_renderingKey(file_path, 80)) is not None
+		)
+	except OSError:
+		# Missing file, read_file raises the error
+		rendered = True
+	if not rendered:
+		return renderer().submit(read_file, file_path, maxLines, offset)
+	future: Future[str] = Future()
+	try:
+		future.set_result(read_file(file_path, maxLines, offset))
+	except (OSError, ValueError) as exc:
+		future.set_exception(exc)
+	return future
@@ -0,0 +1,132 @@
+"""Program icons, sized once per image and cached.
+
+The image given as the program icon is converted to a png no larger than the icon size
+(keeping its aspect ratio) the first time it is used, and the png is kept in memory and in
+the on-disk cache, keyed by the path, size and modification time of the image. The title
+image, window icons and popup icons all share the one conversion.
+
+PIL is only imported to convert an image, pngs that are already small enough are used as
+they are.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import os
+import struct
+import tempfile
+from pathlib import Path
+
+from cli2gui import cache
+
+# Size of the (square) box an icon is fitted to
+ICON_SIZE = 54
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Bytes up to the end of the width and height in the IHDR chunk
+PNG_HEADER_SIZE = 24
+
+# Converted icons by (path, modification time, size of the image, icon size)
+_icons: dict[tuple[str, int, int, int], bytes] = {}
+# Files written for icons when the on-disk cache is disabled, removed at exit
+_files: dict[tuple[str, int, int, int], str] = {}
+
+
+def pngSize(data: bytes) -> tuple[int, int] | None:
+	"""Get the width and height of a png from its header.
+
+	:param bytes data: the image
+	:return tuple[int, int] | None: width and height, None if data is not a png
+	"""
+	if len(data) < PNG_HEADER_SIZE or not data.startswith(PNG_SIGNATURE) or data[12:16] != b"IHDR":
+		return None
+	return struct.unpack(">II", data[16:24])
+
+
+def convertIcon(data: bytes, size: int = ICON_SIZE) -> bytes:
+	"""Fit an image to a size x size box and encode it as a png.
+
+	:param bytes data: the image, in any format PIL supports
+	:param int size: size of the box. Defaults to ICON_SIZE
+	:return bytes: the png
+	"""
+	dimensions = pngSize(data)
+	if dimensions is not None and max(dimensions) <= size:
+		return data
+
+	import io
+
+	from PIL import Image
+
+	with Image.open(io.BytesIO(data)) as img:
+		img.thumbnail((size, size))
+		output = io.BytesIO()
+		img.save(output, format="PNG")
+	return output.getvalue()
+
+
+def _iconKey(imagePath: str, size: int) -> tuple[str, int, int, int]:
+	"""Key an icon by the path, modification time and size of the image, and the icon size."""
+	path = Path(imagePath).resolve()
+	stat = path.stat()
+	return (str(path), stat.st_mtime_ns, stat.st_size, size)
+
+
+def iconPng(imagePath: str, size: int = ICON_SIZE) -> bytes:
+	"""Get the icon for an image as a png fitting a size x size box, converting the image
+	only if it is not cached in memory or on disk.
+
+	:param str imagePath: path to the image
+	:param int size: size of the box. Defaults to ICON_SIZE
+	:return bytes: the png
+	"""
+	key = _iconKey(imagePath, size)
+	png = _icons.get(key)
+	if png is not None:
+		return png
+
+	diskCache = cache.DiskCache("icons", 4 * 1024**2) if cache.cacheEnabled() else None
+	diskKey = repr((cache.CACHE_FORMAT, *key))
+	if diskCache is not None:
+		png = diskCache.get(diskKey)
+	if png is None or pngSize(png) is None:
+		png = convertIcon(Path(imagePath).read_bytes(), size)
+		if diskCache is not None:
+			diskCache.put(diskKey, png)
+	_icons[key] = png
+	return png
+
+
+def iconFile(imagePath: str, size: int = ICON_SIZE) -> str:
+	"""Get a path to the icon for an image (for guis that load icons from a file, such as
+	dearpygui). This is the image itself if it is a png that fits, else the cached png.
+
+	:param str imagePath: path to the image
+	:param int size: size of the box. Defaults to ICON_SIZE
+	:return str: path to the png
+	"""
+	with Path(imagePath).open("rb") as file:
+		dimensions = pngSize(file.read(PNG_HEADER_SIZE))
+	if dimensions is not None and max(dimensions) <= size:
+		return imagePath
+
+	png = iconPng(imagePath, size)
+	key = _iconKey(imagePath, size)
+	if cache.cacheEnabled():
+		path = cache.DiskCache("icons").path(repr((cache.CACHE_FORMAT, *key)))
+		if path.is_file():
+			return str(path)
+	if key not in _files:
+		handle, filePath = tempfile.mkstemp(prefix="cli2gui-icon-", suffix=".png")
+		with os.fdopen(handle, "wb") as file:
+			file.write(png)
+		_files[key] = filePath
+		atexit.register(_removeFile, filePath)
+	return _files[key]
+
+
+def _removeFile(path: str) -> None:
+	"""Remove a file written by iconFile."""
+	with contextlib.suppress(OSError):
+		Path(path).unlink()
@@ -0,0 +1,127 @@
+"""Page through a menu document a fixed number of lines at a time.
+
+Only the page being shown is read. The byte offset of the start of each page is recorded as
+pages are first reached, so going back (or to a search result on a page already passed) is
+a seek. Documents rendered by catpandoc are paged through the cached rendering (see
+helpers.renderDocument), other files are read from disk.
+
+Loading a page (which may need the document rendered first) and searching run on the
+helpers render thread, the gui shows them once their future is done.
+"""
+
+from __future__ import annotations
+
+import io
+import threading
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+from cli2gui.gui import helpers
+
+if TYPE_CHECKING:
+	from concurrent.futures import Future
+
+
+class DocumentPager:
+	"""Read a document a page (of pageLines lines) at a time."""
+
+	def __init__(self, file_path: str, pageLines: int = 200) -> None:
+		"""Read a document a page at a time.
+
+		:param str file_path: path to the document
+		:param int pageLines: lines per page. Defaults to 200
+		"""
+		self.file_path = file_path
+		self.pageLines = pageLines
+		# Byte offset of the start of each page reached so far
+		self._offsets = [0]
+		self._complete = False
+		self._rendered: bytes | None = None
+		self._lock = threading.Lock()
+
+	@property
+	def pageCount(self) -> int | None:
+		"""Number of pages, None until the last page has been reached (or searched)."""
+		return len(self._offsets) if self._complete else None
+
+	def pageOf(self, lineNumber: int) -> int:
+		"""Get the page containing a line.
+
+		:param int lineNumber: line number, starting at 0
+		:return int: page number, starting at 0
+		"""
+		return lineNumber // self.pageLines
+
+	def _open(self) -> IO[bytes]:
+		"""Open the document (the rendering from catpandoc if installed) to read as bytes."""
+		if self._rendered is None:
+			text = helpers.renderDocument(self.file_path)
+			if text is None:
+				return Path(self.file_path).open("rb")
+			self._rendered = text.encode("utf-8")
+		return io.BytesIO(self._rendered)
+
+	def page(self, number: int) -> list[str]:
+		"""Get the lines of a page, reading through the pages before it if not yet reached.
+
+		:param int number: page number, starting at 0. Pages past the end get the last page
+		:return list[str]: lines of the page
+		"""
+		with self._open() as file, self._lock:
+			while True:
+				index = min(max(number, 0), len(self._offsets) - 1)
+				file.seek(self._offsets[index])
+				lines = [file.readline() for _ in range(self.pageLines)]
+				# Record where the next page starts, or that this is the last page
+				if index == len(self._offsets) - 1 and not self._complete:
+					offset = file.tell()
+					if file.read(1):
+						self._offsets.append(offset)
+					else:
+						self._complete = True
+				if index >= number or self._complete:
+					break
+		return [line.decode("utf-8", errors="replace").rstrip("\r\n") for line in lines if line]
+
+	def loadPage(self, number: int) -> Future[list[str]]:
+		"""Get a page on the render thread (the document may need rendering first).
+
+		:param int number: page number, starting at 0
+		:return Future[list[str]]: lines of the page
+		"""
+		return helpers.renderer().submit(self.page, number)
+
+	def search(self, query: str, maxResults: int = 200) -> Future[list[tuple[int, str]]]:
+		"""Find the lines containing query (ignoring case) on the render thread.
+
+		The whole document is read, so the offset of every page is recorded along the way.
+
+		:param str query: text to find
+		:param int maxResults: keep at most this many matching lines. Defaults to 200
+		:return Future[list[tuple[int, str]]]: line number (starting at 0) and text of each
+		matching line
+		"""
+		return helpers.renderer().submit(self._search, query.casefold(), maxResults)
+
+	def _search(self, query: str, maxResults: int) -> list[tuple[int, str]]:
+		"""Find the lines containing query, which is casefolded."""
+		results: list[tuple[int, str]] = []
+		offsets = [0]
+		with self._open() as file:
+			lineNumber = 0
+			while True:
+				line = file.readline()
+				if not line:
+					break
+				text = line.decode("utf-8", errors="replace").rstrip("\r\n")
+				if len(results) < maxResults and query in text.casefold():
+					results.append((lineNumber, text))
+				lineNumber += 1
+				if lineNumber % self.pageLines == 0:
+					offsets.append(file.tell())
+			# A full last page has no page after it
+			if len(offsets) > 1 and offsets[-1] == file.tell():
+				offsets.pop()
+		with self._lock:
+			self._offsets, self._complete = offsets, True
+		return results
@@ -2,15 +2,42 @@
 
 from __future__ import annotations
 
-import io
 import logging
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, Callable
 
-from PIL import Image, ImageTk
-
-from cli2gui.gui import helpers
+from cli2gui import trace
+from cli2gui.application.application2args import buildDecoders, commandDecoders
+from cli2gui.application.output import OutputView
+from cli2gui.gui import helpers, icons
 from cli2gui.gui.abstract_gui import AbstractGUI
-from cli2gui.models import SEP, FullBuildSpec, Group, Item, ItemType
+from cli2gui.gui.pager import DocumentPager
+from cli2gui.models import (
+	BatchRow,
+	CommandNode,
+	Decoder,
+	FullBuildSpec,
+	Group,
+	Item,
+	ItemType,
+	Job,
+	JobState,
+)
+
+if TYPE_CHECKING:
+	from concurrent.futures import Future
+
+STATUS_KEY = "-CLI2GUI-JOB-STATUS-"
+OUTPUT_KEY = "-CLI2GUI-JOB-OUTPUT-"
+OUTPUT_SCROLL_KEY = "-CLI2GUI-JOB-OUTPUT-SCROLL-"
+OUTPUT_ROWS = 10
+# Followed by the depth in the subcommand tree
+COMMAND_KEY = "-CLI2GUI-COMMAND-"
+BATCH_FILE_KEY = "-CLI2GUI-BATCH-FILE-"
+BATCH_TABLE_KEY = "-CLI2GUI-BATCH-TABLE-"
+POPUP_TEXT_KEY = "-CLI2GUI-POPUP-TEXT-"
+POPUP_PAGE_KEY = "-CLI2GUI-POPUP-PAGE-"
+POPUP_FIND_KEY = "-CLI2GUI-POPUP-FIND-"
+POPUP_RESULTS_KEY = "-CLI2GUI-POPUP-RESULTS-"
 
 
 class PySimpleGUIWrapper(AbstractGUI):
@@ -40,6 +67,17 @@ class PySimpleGUIWrapper(AbstractGUI):
 
 		self.sg = gui_lib
 		self.psg_lib = psg_lib
+		self.outputView: OutputView | None = None
+		self.job: Job | None = None
+		# Gets the jobs (and batch rows) that finished since last call, set by main
+		self.pollCallback: Callable[[], list[Job | BatchRow]] = list
+		# Selected subcommand at each level of the tree
+		self.commandPath: list[CommandNode] = []
+		# Decoder for each dest of the parser, and of the parser and the selected subcommands
+		self.rootDecoders: dict[str, Decoder] = {}
+		self.decoders: dict[str, Decoder] = {}
+		# Rows of the last batch run
+		self.batchRows: list[BatchRow] = []
 		self.sizes = {
 			"title_size": 18,
 			"label_size": (30, None),
@@ -72,6 +110,10 @@ class PySimpleGUIWrapper(AbstractGUI):
 			"BORDER": 0,
 			"SLIDER_DEPTH": 0,
 			"PROGRESS_DEPTH": 0,
+			# Not used by PySimpleGUI, colours for the job status line
+			"RUNNING": base24Theme[accent["blue"]],
+			"DONE": base24Theme[accent["green"]],
+			"FAILED": base24Theme[accent["red"]],
 		}
 		self.sg.theme("theme")
 
@@ -141,18 +183,11 @@ class PySimpleGUIWrapper(AbstractGUI):
 		key: str,
 		default: str | None = None,
 		_type: ItemType = ItemType.File,
-		additional_properties: dict | None = None,
 	) -> list[Any]:
 		"""Return a fileBrowser button and field."""
-		prop = additional_properties or {}
-
 		height = self.sizes["input_size"][1]
 		width = self.sizes["input_size"][0]
 
-		key = f"{key}{SEP}{_type}"
-		if _type in [ItemType.FileWrite, ItemType.File]:
-			key += f";{prop.get('file_mode')};{prop.get('file_encoding')}"
-
 		browser = self.sg.FileBrowse(
 			key="@@" + key,
 			size=(int(width / 3), height),
@@ -203,7 +238,7 @@ class PySimpleGUIWrapper(AbstractGUI):
 		]
 		if image:
 			programTitle = [
-				self.sg.Image(data=self.getImgData(image, first=True)),
+				self.sg.Image(data=self.getImgData(image)),
 				self.sg.Text(
 					text,
 					pad=self.sizes["padding"],
@@ -222,9 +257,7 @@ class PySimpleGUIWrapper(AbstractGUI):
 		"""Return a set of self that make up an arg with true/ false."""
 		return [
 			self._helpArgNameAndHelp(item.commands, item.help, item.display_name),
-			self.sg.Column(
-				[[self._check(f"{item.dest}{SEP}{item.type}", default=item.default)]], pad=(0, 0)
-			),
+			self.sg.Column([[self._check(item.dest, default=item.default)]], pad=(0, 0)),
 		]
 
 	def _helpTextWidget(
@@ -235,7 +268,7 @@ class PySimpleGUIWrapper(AbstractGUI):
 		return [
 			self._helpArgNameAndHelp(item.commands, item.help, item.display_name),
 			self.sg.Column(
-				[[self._inputText(f"{item.dest}{SEP}{item.type}", default=item.default)]],
+				[[self._inputText(item.dest, default=item.default)]],
 				pad=(0, 0),
 			),
 		]
@@ -247,9 +280,7 @@ class PySimpleGUIWrapper(AbstractGUI):
 		"""Return a set of self that make up an arg with text."""
 		return [
 			self._helpArgNameAndHelp(item.commands, item.help, item.display_name),
-			self.sg.Column(
-				[[self._spin(f"{item.dest}{SEP}{item.type}", default=item.default)]], pad=(0, 0)
-			),
+			self.sg.Column([[self._spin(item.dest, default=item.default)]], pad=(0, 0)),
 		]
 
 	def _helpFileWidget(
@@ -260,7 +291,7 @@ class PySimpleGUIWrapper(AbstractGUI):
 		return [
 			self._helpArgNameAndHelp(item.commands, item.help, item.display_name),
 			self.sg.Column(
-				[self._fileBrowser(item.dest, item.default, item.type, item.additional_properties)],
+				[self._fileBrowser(item.dest, item.default, item.type)],
 				pad=(0, 0),
 			),
 		]
@@ -273,13 +304,7 @@ class PySimpleGUIWrapper(AbstractGUI):
 		return [
 			self._helpArgNameAndHelp(item.commands, item.help, item.display_name),
 			self.sg.Column(
-				[
-					[
-						self._dropdown(
-							f"{item.dest}{SEP}{item.type}", item.additional_properties["choices"]
-						)
-					]
-				],
+				[[self._dropdown(item.dest, item.additional_properties["choices"])]],
 				pad=(0, 0),
 			),
 		]
@@ -313,7 +338,7 @@ class PySimpleGUIWrapper(AbstractGUI):
 		buildSpec: FullBuildSpec,
 		values: dict[Any, Any] | list[Any],
 	) -> Any:
-		"""Create the popup window.
+		"""Create the popup window, a document viewer showing a page at a time.
 
 		Args:
 		----
@@ -323,51 +348,140 @@ class PySimpleGUIWrapper(AbstractGUI):
 
 		Returns:
 		-------
-			Window: A PySimpleGui Window
+			Window: A PySimpleGui Window, with the DocumentPager for the document as its
+			metadata (see readPopup)
 
 		"""
-		maxLines = 30 if self.psg_lib == "psgqt" else 200
-		popupText = helpers.read_file(buildSpec.menu[values[0]], maxLines)
+		pageLines = 30 if self.psg_lib == "psgqt" else 200
+		pager = DocumentPager(buildSpec.menu[values[0]], pageLines)
 
-		if self.psg_lib in ["psg", "fsg"]:
-			popupLayout = [
-				self._title(values[0]),
-				[
-					self.sg.Column(
-						[
-							[
-								self.sg.Text(
-									text=popupText,
-									size=(850, maxLines + 10),
-									font=("Courier", self.sizes["text_size"]),
-								)
-							]
-						],
-						size=(850, 400),
-						pad=(0, 0),
-						scrollable=True,
-						vertical_scroll_only=True,
-					)
-				],
-			]
-		else:
-			popupLayout = [
-				self._title(values[0]),
-				[
-					self.sg.Text(
-						text=popupText,
-						size=(850, (self.sizes["text_size"]) * (2 * maxLines + 10)),
-						font=("Courier", self.sizes["text_size"]),
-					)
-				],
-			]
+		popupLayout = [
+			self._title(values[0]),
+			[
+				self._button("<"),
+				self._button(">"),
+				self.sg.Text(
+					f"Rendering {values[0]}...",
+					key=POPUP_PAGE_KEY,
+					size=(24, 1),
+					font=("sans", self.sizes["text_size"]),
+				),
+				self.sg.InputText(
+					"",
+					key=POPUP_FIND_KEY,
+					size=(30, 1),
+					font=("sans", self.sizes["text_size"]),
+				),
+				self._button("Find"),
+			],
+			[
+				self.sg.Listbox(
+					[],
+					key=POPUP_RESULTS_KEY,
+					size=(100, 5),
+					enable_events=True,
+					font=("Courier", self.sizes["text_size"]),
+				)
+			],
+			[
+				# Holds a single page, so only those lines are drawn
+				self.sg.Multiline(
+					"",
+					key=POPUP_TEXT_KEY,
+					size=(100, 25),
+					disabled=True,
+					font=("Courier", self.sizes["text_size"]),
+				)
+			],
+		]
 		return self.sg.Window(
 			values[0],
 			popupLayout,
 			alpha_channel=0.95,
-			icon=self.getImgData(buildSpec.image, first=True) if buildSpec.image else None,
+			icon=self.getImgData(buildSpec.image) if buildSpec.image else None,
+			metadata=pager,
 		)
 
+	def readPopup(self, popup: Any, window: Any) -> None:
+		"""Run the document viewer in the popup until it is closed. Pages are loaded and
+		searched on the render thread, and shown once done. Jobs are still polled, so the
+		main window keeps showing their status and output.
+
+		:param Window popup: window from generatePopup
+		:param Window window: the main window
+		"""
+		popup.finalize()
+		pager: DocumentPager = popup.metadata
+		viewer: dict[str, Any] = {
+			"pager": pager,
+			"page": 0,
+			"loading": pager.loadPage(0),
+			"searching": None,
+			"query": "",
+			"error": "",
+		}
+		while True:
+			event, values = popup.read(timeout=100)
+			self.pollJobs(window)
+			if event is None:
+				popup.close()
+				return
+			self.popupEvent(viewer, event, values)
+			self.updatePopup(popup, viewer)
+
+	def popupEvent(self, viewer: dict[str, Any], event: Any, values: dict[Any, Any]) -> None:
+		"""Page, find or go to a search result in the document viewer.
+
+		:param dict[str, Any] viewer: state of the viewer (see readPopup)
+		:param Any event: event read from the popup
+		:param dict[Any, Any] values: values read from the popup
+		"""
+		pager: DocumentPager = viewer["pager"]
+		if event in ("<", ">"):
+			page = max(0, viewer["page"] + (1 if event == ">" else -1))
+			if pager.pageCount:
+				page = min(page, pager.pageCount - 1)
+			viewer["page"], viewer["loading"] = page, pager.loadPage(page)
+		elif event == "Find" and values[POPUP_FIND_KEY]:
+			viewer["query"] = values[POPUP_FIND_KEY]
+			viewer["searching"] = pager.search(viewer["query"])
+		elif event == POPUP_RESULTS_KEY and values[POPUP_RESULTS_KEY]:
+			result = values[POPUP_RESULTS_KEY][0]
+			if result[:1].isdigit():
+				page = pager.pageOf(int(result.split(":", 1)[0]) - 1)
+				viewer["page"], viewer["loading"] = page, pager.loadPage(page)
+
+	def updatePopup(self, popup: Any, viewer: dict[str, Any]) -> None:
+		"""Show the page and search results in the document viewer once they are done.
+
+		:param Window popup: window from generatePopup
+		:param dict[str, Any] viewer: state of the viewer (see readPopup)
+		"""
+		pager: DocumentPager = viewer["pager"]
+		loading: Future[list[str]] | None = viewer["loading"]
+		if loading is not None and loading.done():
+			viewer["loading"] = None
+			try:
+				popup[POPUP_TEXT_KEY].update(value="\n".join(loading.result()))
+			except (OSError, ValueError) as exc:
+				viewer["error"] = f"Could not read the file - {exc}"
+			if pager.pageCount:
+				viewer["page"] = min(viewer["page"], pager.pageCount - 1)
+		searching: Future[list[tuple[int, str]]] | None = viewer["searching"]
+		if searching is not None and searching.done():
+			viewer["searching"] = None
+			results = [] if searching.exception() else searching.result()
+			popup[POPUP_RESULTS_KEY].update(
+				values=[f"{lineNumber + 1}: {text}" for lineNumber, text in results]
+				or [f"No lines contain {viewer['query']!r}"]
+			)
+		status = viewer["error"] or f"Page {viewer['page'] + 1}/{pager.pageCount or '?'}"
+		if viewer["searching"] is not None:
+			status = f"Finding {viewer['query']!r}..."
+		if viewer["loading"] is None:
+			popup[POPUP_PAGE_KEY].update(value=status)
+
+	@trace.traced("addItemsAndGroups")
 	def addItemsAndGroups(
 		self,
 		section: Group,
@@ -393,6 +507,44 @@ class PySimpleGUIWrapper(AbstractGUI):
 			argConstruct.extend(self.addItemsAndGroups(group))
 		return argConstruct
 
+	def addCommandLevels(self, buildSpec: FullBuildSpec) -> list[list[Any]]:
+		"""Create a combo for each level of the subcommand tree down to the selected
+		subcommand, each followed by the widgets of the subcommand selected in it.
+
+		Subcommands are only converted once selected.
+
+		:param FullBuildSpec buildSpec: build spec containing the subcommands
+		:return list[list[Element]]: rows to add to argConstruct
+		"""
+		argConstruct: list[list[Any]] = []
+		nodes = buildSpec.subcommands
+		for depth in range(len(self.commandPath) + 1):
+			if not nodes:
+				break
+			selected = self.commandPath[depth] if depth < len(self.commandPath) else None
+			argConstruct.append([self._label("Command", 14)])
+			argConstruct.append(
+				[
+					self.sg.Drop(
+						tuple(node.name for node in nodes),
+						default_value=selected.name if selected else None,
+						size=self.sizes["input_size"],
+						pad=self.sizes["padding"],
+						key=f"{COMMAND_KEY}{depth}",
+						enable_events=True,
+					)
+				]
+			)
+			if selected is None:
+				break
+			parserRep = selected.load()
+			if selected.help:
+				argConstruct.append([self._helpArgHelp(selected.help)])
+			for widget in parserRep.widgets:
+				argConstruct.extend(self.addItemsAndGroups(widget))
+			nodes = parserRep.subcommands
+		return argConstruct
+
 	def createLayout(
 		self,
 		buildSpec: FullBuildSpec,
@@ -409,6 +561,7 @@ class PySimpleGUIWrapper(AbstractGUI):
 		argConstruct = []
 		for widget in buildSpec.widgets:
 			argConstruct.extend(self.addItemsAndGroups(widget))
+		argConstruct.extend(self.addCommandLevels(buildSpec))
 
 		# Set the layout
 		layout: list[list[Any]] = [[]]
@@ -458,60 +611,308 @@ class PySimpleGUIWrapper(AbstractGUI):
 		else:
 			layout.extend(argConstruct)
 		layout.append([self._button("Run"), self._button("Exit")])
+		layout.append(
+			[
+				self.sg.Text(
+					"",
+					key=STATUS_KEY,
+					size=(60, 1),
+					pad=self.sizes["padding"],
+					font=("sans", self.sizes["text_size"]),
+				)
+			]
+		)
+		layout.append(
+			[
+				self.sg.Multiline(
+					"",
+					key=OUTPUT_KEY,
+					size=(100, OUTPUT_ROWS),
+					pad=self.sizes["padding"],
+					font=("Courier", self.sizes["text_size"]),
+					disabled=True,
+				),
+				self.sg.Slider(
+					range=(0, 0),
+					key=OUTPUT_SCROLL_KEY,
+					orientation="v",
+					size=(OUTPUT_ROWS, 15),
+					disable_number_display=True,
+					enable_events=True,
+				),
+			]
+		)
+		layout.append(
+			[
+				self._label("Batch file (csv or jsonl), with a column for each argument to set"),
+			]
+		)
+		layout.append(
+			[
+				self.sg.InputText(
+					"",
+					key=BATCH_FILE_KEY,
+					size=self.sizes["input_size"],
+					pad=self.sizes["padding"],
+					font=("sans", self.sizes["text_size"]),
+				),
+				self.sg.FileBrowse(key=f"@@{BATCH_FILE_KEY}", pad=self.sizes["padding"]),
+				self._button("Run Batch"),
+			]
+		)
+		layout.append(
+			[
+				self.sg.Table(
+					values=[],
+					headings=["Row", "State", "Time", "Output"],
+					key=BATCH_TABLE_KEY,
+					num_rows=6,
+					auto_size_columns=False,
+					col_widths=[5, 8, 8, 60],
+				)
+			]
+		)
 		return layout
 
+	def showJobStatus(self, window: Any, job: Job) -> None:
+		"""Show the state of a job in the status line.
+
+		:param Window window: the main window
+		:param Job job: the job to show
+		"""
+		# Shown again if the window is rebuilt
+		self.job = job
+		theme = self.sg.LOOK_AND_FEEL_TABLE["theme"]
+		colors = {JobState.DONE: "DONE", JobState.FAILED: "FAILED"}
+		window[STATUS_KEY].update(
+			value=job.describe(), text_color=theme.get(colors.get(job.state, "RUNNING"))
+		)
+
 	def main(
 		self,
 		buildSpec: FullBuildSpec,
 		quit_callback: Callable[[], None],
-		run_callback: Callable[[dict[str, Any]], None],
+		run_callback: Callable[[dict[str, Any], dict[str, Decoder]], Any],
+		poll_callback: Callable[[], list[Job | BatchRow]],
+		batch_callback: Callable[[dict[str, Any], dict[str, Decoder], str], list[BatchRow]],
 	) -> None:
 		"""Run the gui (psg) with a given buildSpec, quit_callback, and run_callback.
 
+		The window is read with a timeout so that finished jobs are picked up while the
+		user is idle.
+
 		:param FullBuildSpec buildSpec: Full cli parse/ build spec
 		:param Callable[[], None] quit_callback: generic callable used to quit
-		:param Callable[[dict[str, Any]], None] run_callback: generic callable used to run
+		:param Callable[[dict[str, Any], dict[str, Decoder]], Any] run_callback: generic
+		callable used to run
+		:param Callable[[], list[Job | BatchRow]] poll_callback: get jobs (and batch rows) that
+		finished since last call
+		:param Callable[[dict[str, Any], dict[str, Decoder], str], list[BatchRow]]
+		batch_callback: callable used to run once per row of a batch file
+		"""
+		self.pollCallback = poll_callback
+		# Built once, values are decoded with these on every run
+		self.rootDecoders = self.decoders = buildDecoders(buildSpec.widgets)
+		window = self.createWindow(buildSpec)
+		# Finalizing draws the window
+		with trace.span("first frame"):
+			window.finalize()
+
+		# While the application is running
+		while True:
+			eventAndValues: tuple[Any, dict[Any, Any] | list[Any]] = window.read(timeout=100)
+			event, values = eventAndValues
+			if event in (None, "Exit"):
+				quit_callback()
+			self.pollJobs(window)
+			if event == self.sg.TIMEOUT_KEY or values is None:
+				continue
+			if str(event).startswith(COMMAND_KEY):
+				window = self.selectCommand(buildSpec, window, event, values)
+				continue
+			try:
+				self.handleEvent(buildSpec, window, event, values, run_callback, batch_callback)
+			except Exception:
+				logging.exception("Something went wrong: ")
+
+	def pollJobs(self, window: Any) -> None:
+		"""Show the jobs (and batch rows) that finished, and new output from the current job.
+
+		:param Window window: the main window
+		"""
+		finished = self.pollCallback()
+		for job in finished:
+			if not isinstance(job, BatchRow):
+				self.showJobStatus(window, job)
+		if any(isinstance(job, BatchRow) for job in finished):
+			self.updateBatchTable(window)
+		self.updateOutput(window)
+
+	def createWindow(self, buildSpec: FullBuildSpec) -> Any:
+		"""Create the main window from the build spec (and the selected subcommands).
+
+		:param FullBuildSpec buildSpec: Full cli parse/ build spec
+		:return Window: the main window
 		"""
 		menu = list(buildSpec.menu) if buildSpec.menu else ""
 
 		layout = self.createLayout(buildSpec=buildSpec, menu=menu)
 
 		# Build window from args
-		window = self.sg.Window(
+		return self.sg.Window(
 			buildSpec.program_name,
 			layout,
 			alpha_channel=0.95,
-			icon=self.getImgData(buildSpec.image, first=True) if buildSpec.image else None,
+			icon=self.getImgData(buildSpec.image) if buildSpec.image else None,
 		)
 
-		# While the application is running
-		while True:
-			eventAndValues: tuple[Any, dict[Any, Any] | list[Any]] = window.read()
-			event, values = eventAndValues
-			if event in (None, "Exit"):
-				quit_callback()
-			try:
-				# Create and open the popup window for the menu item
-				if values is not None:
-					if 0 in values and values[0] is not None:
-						popup = self.generatePopup(buildSpec, values)
-						popup.read()
-					args = {}
-					for key in values:
-						if key != 0:
-							args[key] = values[key]
-					run_callback(args)
+	def selectCommand(
+		self,
+		buildSpec: FullBuildSpec,
+		window: Any,
+		event: str,
+		values: dict[Any, Any],
+	) -> Any:
+		"""Select a subcommand at one level of the tree, psg layouts cannot be changed once
+		shown so the window is rebuilt with the widgets for the subcommand.
 
-			except Exception:
-				logging.exception("Something went wrong: ")
+		:param FullBuildSpec buildSpec: Full cli parse/ build spec
+		:param Window window: the main window
+		:param str event: key of the combo that changed
+		:param dict[Any, Any] values: the values returned by window.read()
+		:return Window: the new main window
+		"""
+		depth = int(event[len(COMMAND_KEY) :])
+		nodes = self.commandPath[depth - 1].load().subcommands if depth else buildSpec.subcommands
+		del self.commandPath[depth:]
+		self.commandPath.extend(node for node in nodes if node.name == values[event])
+		self.decoders = commandDecoders(self.rootDecoders, self.commandPath)
+
+		newWindow = self.createWindow(buildSpec).finalize()
+		# Keep the values entered so far, fill skips keys not in the new window
+		newWindow.fill(
+			{
+				key: value
+				for key, value in values.items()
+				if isinstance(key, str)
+				and key not in (OUTPUT_KEY, OUTPUT_SCROLL_KEY)
+				and not key.startswith(("@@", COMMAND_KEY))
+			}
+		)
+		window.close()
+		if self.job is not None:
+			self.showJobStatus(newWindow, self.job)
+		if self.outputView is not None:
+			self.outputView = OutputView(self.outputView.buffer, OUTPUT_ROWS)
+		self.updateBatchTable(newWindow)
+		return newWindow
+
+	def updateBatchTable(self, window: Any) -> None:
+		"""Show the state of each row of the last batch run in the batch table.
+
+		:param Window window: the main window
+		"""
+		window[BATCH_TABLE_KEY].update(
+			values=[
+				[
+					row.index,
+					row.state.value,
+					f"{row.finished - row.started:.2f}s" if row.finished and row.started else "",
+					row.describe(),
+				]
+				for row in self.batchRows
+			]
+		)
+
+	def formValues(self, values: dict[Any, Any]) -> dict[str, Any]:
+		"""Get the values of the arguments (and the selected subcommands) to run with.
 
-	def getImgData(self, imagePath: str, *, first: bool = False) -> bytes:
-		"""Generate image data using PIL."""
-		img = Image.open(imagePath)
-		img.thumbnail((self.sizes["title_size"] * 3, self.sizes["title_size"] * 3))
-		if first:  # tkinter is inactive the first time
-			bio = io.BytesIO()
-			img.save(bio, format="PNG")
-			del img
-			return bio.getvalue()
-		return ImageTk.PhotoImage(img)  # type:ignore[type-error]
+		:param dict[Any, Any] values: the values returned by window.read()
+		:return dict[str, Any]: values to pass to the run_callback
+		"""
+		args = {}
+		for node in self.commandPath:
+			args.update(node.values)
+		for key, value in values.items():
+			if key in (0, OUTPUT_KEY, OUTPUT_SCROLL_KEY, BATCH_FILE_KEY, BATCH_TABLE_KEY):
+				continue
+			# Skip the file browse buttons and subcommand combos
+			if not str(key).startswith(("@@", COMMAND_KEY)):
+				args[key] = value
+		return args
+
+	def updateOutput(self, window: Any) -> None:
+		"""Show new output from the current job, called once per event loop iteration. The
+		panel shows OUTPUT_ROWS lines from the line picked with the slider beside it, and
+		follows the end of the output while the slider is at the bottom.
+
+		:param Window window: the main window
+		"""
+		view = self.outputView
+		if view is None:
+			return
+		text = view.render()
+		if text is not None:
+			window[OUTPUT_KEY].update(value=text)
+			window[OUTPUT_SCROLL_KEY].update(
+				value=view.start, range=(0, max(0, view.count - OUTPUT_ROWS))
+			)
+
+	def scrollOutput(self, line: int) -> None:
+		"""Show the output from a line picked with the slider, the end follows new output.
+
+		:param int line: first line to show
+		"""
+		view = self.outputView
+		if view is not None:
+			view.scrollTo(None if line >= view.count - OUTPUT_ROWS else line, OUTPUT_ROWS)
+
+	def handleEvent(
+		self,
+		buildSpec: FullBuildSpec,
+		window: Any,
+		event: Any,
+		values: dict[Any, Any] | list[Any],
+		run_callback: Callable[[dict[str, Any], dict[str, Decoder]], Any],
+		batch_callback: Callable[[dict[str, Any], dict[str, Decoder], str], list[BatchRow]],
+	) -> None:
+		"""Handle a button or menu event from the main window.
+
+		:param FullBuildSpec buildSpec: Full cli parse/ build spec
+		:param Window window: the main window
+		:param Any event: the event returned by window.read()
+		:param dict[Any, Any] | list[Any] values: the values returned by window.read()
+		:param Callable[[dict[str, Any], dict[str, Decoder]], Any] run_callback: generic
+		callable used to run
+		:param Callable[[dict[str, Any], dict[str, Decoder], str], list[BatchRow]]
+		batch_callback: callable used to run once per row of a batch file
+		"""
+		# Run the job in the background and show it as running
+		if event == "Run":
+			job = run_callback(self.formValues(values), self.decoders)
+			if isinstance(job, Job):
+				self.outputView = OutputView(job.output, OUTPUT_ROWS)
+				self.showJobStatus(window, job)
+		# Run once per row of the batch file in worker processes
+		elif event == "Run Batch":
+			try:
+				self.batchRows = batch_callback(
+					self.formValues(values), self.decoders, values[BATCH_FILE_KEY]
+				)
+			except (OSError, ValueError) as exc:
+				theme = self.sg.LOOK_AND_FEEL_TABLE["theme"]
+				window[STATUS_KEY].update(value=f"Batch failed - {exc}", text_color=theme["FAILED"])
+				return
+			self.updateBatchTable(window)
+		elif event == OUTPUT_SCROLL_KEY:
+			self.scrollOutput(int(values[OUTPUT_SCROLL_KEY]))
+		# Create and open the popup window for the menu item
+		elif 0 in values and values[0] is not None:
+			popup = self.generatePopup(buildSpec, values)
+			self.readPopup(popup, window)
+
+	def getImgData(self, imagePath: str) -> bytes:
+		"""Get the icon for an image as png data (converted once per image, see icons), which
+		sg.Image and window icons take as they are.
+		"""
+		return icons.iconPng(imagePath, self.sizes["title_size"] * 3)
@@ -0,0 +1,97 @@
+"""Registry of the GUI backends, mapping a gui name (see models.GUIType) to a loader.
+
+Loaders import a backend (and its heavy dependencies such as dearpygui or PIL) only when it
+is selected. Third party backends can be added by registering a factory under the
+"cli2gui.backends" entry point group, eg. in pyproject.toml
+
+```toml
+[project.entry-points."cli2gui.backends"]
+mygui = "mypackage.gui:MyGuiWrapper"
+```
+
+A factory is called with the base24 theme and the gui name and returns an AbstractGUI.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Callable
+
+from cli2gui.gui.abstract_gui import AbstractGUI
+from cli2gui.models import GUIType
+
+ENTRY_POINT_GROUP = "cli2gui.backends"
+
+BackendFactory = Callable[[list[str], str], AbstractGUI]
+
+_loaders: dict[str, Callable[[], BackendFactory]] = {}
+
+
+def register(gui: str | GUIType, loader: Callable[[], BackendFactory]) -> None:
+	"""Register a backend loader for a gui name.
+
+	:param str | GUIType gui: gui name, eg. "dearpygui"
+	:param Callable[[], BackendFactory] loader: imports the backend and returns its factory
+	"""
+	_loaders[str(getattr(gui, "value", gui))] = loader
+
+
+def _loadDearPyGui() -> BackendFactory:
+	from cli2gui.gui.dearpygui_wrapper import DearPyGuiWrapper
+
+	return lambda base24Theme, _gui: DearPyGuiWrapper(base24Theme)
+
+
+def _loadPySimpleGui() -> BackendFactory:
+	from cli2gui.gui.pysimplegui_wrapper import PySimpleGUIWrapper
+
+	return PySimpleGUIWrapper
+
+
+def _loadBrowser() -> BackendFactory:
+	from cli2gui.gui.browser_wrapper import BrowserWrapper
+
+	return lambda base24Theme, _gui: BrowserWrapper(base24Theme)
+
+
+register(GUIType.DPG, _loadDearPyGui)
+register(GUIType.BROWSER, _loadBrowser)
+register(GUIType.PSG, _loadPySimpleGui)
+register(GUIType.QT, _loadPySimpleGui)
+register(GUIType.WEB, _loadPySimpleGui)
+register(GUIType.FSG, _loadPySimpleGui)
+for _alias in ("psg", "psgqt", "psgweb", "fsg"):
+	register(_alias, _loadPySimpleGui)
+# GUIType.FSGQT cannot test on windows, GUIType.FSGWEB bug in remi prevents this from
+# working. These fall back to dearpygui
+
+
+def _loadEntryPoint(gui: str) -> Callable[[], BackendFactory] | None:
+	"""Find a loader for a gui name in the installed entry points."""
+	from importlib import metadata
+
+	if sys.version_info >= (3, 10):
+		entryPoints = metadata.entry_points(group=ENTRY_POINT_GROUP)
+	else:
+		entryPoints = metadata.entry_points().get(ENTRY_POINT_GROUP, [])
+	for entryPoint in entryPoints:
+		if entryPoint.name == gui:
+			return entryPoint.load
+	return None
+
+
+def loadBackend(gui: str | GUIType) -> BackendFactory:
+	"""Import the backend for a gui name and get its factory.
+
+	Built in backends are checked first, then entry points. Unknown names fall back to
+	dearpygui.
+
+	:param str | GUIType gui: gui name, eg. "dearpygui"
+	:return BackendFactory: callable taking (base24Theme, gui) returning an AbstractGUI
+	"""
+	gui = str(getattr(gui, "value", gui))
+	loader = _loaders.get(gui)
+	if loader is None:
+		loader = _loadEntryPoint(gui) or _loadDearPyGui
+		_loaders[gui] = loader
+	return loader()
@@ -0,0 +1,276 @@
+"""Inspect a decorated tool without opening a window, python -m cli2gui inspect module:func.
+
+The target is imported (and called, unless importing it already parsed the arguments) with
+--cli2gui in sys.argv, so the decorator captures the parser as it would to launch the gui.
+application.run is replaced with a stub that records the build spec and stops the tool,
+then the widgets are laid out with the gui backend (headless, no window is shown).
+
+The report has the size of the build spec (items by type, groups and their depth, choices
+and subcommands) and how long each phase took:
+
+- import: importing the target, not counting a conversion done while importing
+- call: calling the target up to the point it parsed its arguments
+- conversion: decorators.createFromParser (the build spec cache is used unless --no-cache)
+- layout: building the widgets for the gui (dearpygui: the primary window, pysimplegui: the
+layout, browser: the page)
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable
+
+from cli2gui import decorators, serialize
+from cli2gui.application import application
+from cli2gui.models import FullBuildSpec, Group, ItemType
+
+PHASES = ("import", "call", "conversion", "layout")
+
+
+class SpecCaptured(BaseException):
+	"""Raised by the stub for application.run to stop the tool once its spec is built.
+
+	A BaseException so `except Exception` in the tool does not catch it.
+	"""
+
+	def __init__(self, buildSpec: FullBuildSpec) -> None:
+		"""Stop the tool with the spec it built.
+
+		:param FullBuildSpec buildSpec: the captured build spec
+		"""
+		super().__init__("build spec captured")
+		self.buildSpec = buildSpec
+
+
+def capture(target: str, argv: list[str]) -> tuple[FullBuildSpec, dict[str, float]]:
+	"""Import and call a target until it builds its spec, timing each phase.
+
+	:param str target: "module:function", or "module" for tools that run when imported
+	:param list[str] argv: arguments for the tool (after --cli2gui)
+	:raises RuntimeError: if the target finishes without building a spec
+	:return tuple[FullBuildSpec, dict[str, float]]: the spec and the time taken by the
+	import, call and conversion phases
+	"""
+	moduleName, _, functionName = target.partition(":")
+	timings = {"import": 0.0, "call": 0.0, "conversion": 0.0}
+
+	def convert(*args: Any, **kwargs: Any) -> FullBuildSpec:
+		start = time.perf_counter()
+		try:
+			return createFromParser(*args, **kwargs)
+		finally:
+			timings["conversion"] += time.perf_counter() - start
+
+	def stubRun(buildSpec: FullBuildSpec) -> Any:
+		raise SpecCaptured(buildSpec)
+
+	createFromParser = decorators.createFromParser
+	savedArgv = sys.argv
+	savedRun = application.run
+	# As python -m sets it, so the program name is the file stem of the module
+	spec = importlib.util.find_spec(moduleName)
+	sys.argv = [(spec and spec.origin) or moduleName, decorators.DO_COMMAND, *argv]
+	decorators.createFromParser = convert
+	application.run = stubRun
+	phase = "import"
+	start = time.perf_counter()
+	try:
+		module = importlib.import_module(moduleName)
+		timings["import"] = time.perf_counter() - start
+		if not functionName:
+			msg = f"Importing {moduleName} did not build a spec, give the function to call"
+			raise RuntimeError(msg)
+		function: Callable[..., Any] = getattr(module, functionName)
+		phase = "call"
+		start = time.perf_counter()
+		function()
+		msg = f"{target} returned without parsing its arguments"
+		raise RuntimeError(msg)
+	except SpecCaptured as captured:
+		timings[phase] = time.perf_counter() - start - timings["conversion"]
+		return captured.buildSpec, timings
+	finally:
+		decorators.createFromParser = createFromParser
+		application.run = savedRun
+		sys.argv = savedArgv
+
+
+def layout(buildSpec: FullBuildSpec) -> float | None:
+	"""Time building the widgets for the gui of a spec, without showing a window.
+
+	:param FullBuildSpec buildSpec: the spec
+	:return float | None: seconds taken, None if the gui is not installed (or is not one
+	of the built in guis)
+	"""
+	from cli2gui.gui import helpers, registry
+
+	gui = str(getattr(buildSpec.gui, "value", buildSpec.gui))
+	psgLib = gui.replace("pysimplegui", "psg").replace("freesimplegui", "fsg")
+	theme = helpers.get_base24_theme(buildSpec.theme, buildSpec.darkTheme)
+	try:
+		wrapper = registry.loadBackend(gui)(theme, psgLib)
+	except ImportError:
+		return None
+
+	start = time.perf_counter()
+	wrapperName = type(wrapper).__name__
+	if wrapperName == "DearPyGuiWrapper":
+		import dearpygui.dearpygui as dpg
+
+		wrapper.setupContext()
+		wrapper.createWindow(
+			buildSpec, lambda: None, lambda _values, _decoders: None, lambda *_args: []
+		)
+		elapsed = time.perf_counter() - start
+		dpg.destroy_context()
+		return elapsed
+	if wrapperName == "PySimpleGUIWrapper":
+		wrapper.createLayout(buildSpec=buildSpec, menu=list(buildSpec.menu or ""))
+		return time.perf_counter() - start
+	if wrapperName == "BrowserWrapper":
+		wrapper.renderPage(buildSpec, "")
+		return time.perf_counter() - start
+	return None
+
+
+def groupStats(groups: list[Group], depth: int = 1) -> tuple[Counter[str], int, int, list[int]]:
+	"""Count the items (by type) and groups, and get the depth and choices sizes.
+
+	:param list[Group] groups: the groups
+	:param int depth: depth of these groups. Defaults to 1
+	:return tuple[Counter[str], int, int, list[int]]: items by type, number of groups,
+	deepest group and the number of choices of each item with choices
+	"""
+	items: Counter[str] = Counter()
+	groupCount, maxDepth, choices = len(groups), depth if groups else 0, []
+	for group in groups:
+		for item in group.arg_items:
+			members = (
+				item.additional_properties["radio"] if item.type == ItemType.RadioGroup else [item]
+			)
+			for member in members:
+				items[member.type.value] += 1
+				# click keeps the choices in the additional properties
+				memberChoices = member.choices or (member.additional_properties or {}).get(
+					"choices"
+				)
+				if memberChoices:
+					choices.append(len(memberChoices))
+		subItems, subGroups, subDepth, subChoices = groupStats(group.groups, depth + 1)
+		items.update(subItems)
+		groupCount += subGroups
+		maxDepth = max(maxDepth, subDepth)
+		choices.extend(subChoices)
+	return items, groupCount, maxDepth, choices
+
+
+def inspect(
+	target: str, argv: list[str] | None = None, *, withLayout: bool = True
+) -> dict[str, Any]:
+	"""Capture the build spec of a target and describe it.
+
+	:param str target: "module:function", or "module" for tools that run when imported
+	:param list[str] | None argv: arguments for the tool. Defaults to None
+	:param bool withLayout: time the layout phase. Defaults to True
+	:return dict[str, Any]: the report
+	"""
+	buildSpec, timings = capture(target, argv or [])
+	timings["layout"] = layout(buildSpec) if withLayout else None
+	items, groupCount, depth, choices = groupStats(buildSpec.widgets)
+	return {
+		"target": target,
+		"parser": str(getattr(buildSpec.parser, "value", buildSpec.parser)),
+		"gui": str(getattr(buildSpec.gui, "value", buildSpec.gui)),
+		"program_name": buildSpec.program_name,
+		"items": sum(items.values()),
+		"items_by_type": dict(items.most_common()),
+		"groups": groupCount,
+		"group_depth": depth,
+		"items_with_choices": len(choices),
+		"choices_total": sum(choices),
+		"choices_max": max(choices, default=0),
+		"subcommands": [node.name for node in buildSpec.subcommands],
+		"timings_s": timings,
+		"spec": buildSpec,
+	}
+
+
+def formatReport(report: dict[str, Any]) -> str:
+	"""Format a report from inspect as text.
+
+	:param dict[str, Any] report: the report
+	:return str: text to print
+	"""
+	byType = ", ".join(f"{name} {count}" for name, count in report["items_by_type"].items())
+	lines = [
+		f"target: {report['target']}",
+		f"program: {report['program_name']} (parser {report['parser']}, gui {report['gui']})",
+		f"items: {report['items']}" + (f" ({byType})" if byType else ""),
+		f"groups: {report['groups']} (depth {report['group_depth']})",
+		(
+			f"choices: {report['items_with_choices']} items, {report['choices_total']} in total,"
+			f" largest {report['choices_max']}"
+		),
+		f"subcommands: {len(report['subcommands'])}"
+		+ (f" ({', '.join(report['subcommands'])})" if report["subcommands"] else ""),
+		"timings:",
+	]
+	for phase in PHASES:
+		seconds = report["timings_s"][phase]
+		lines.append(f"  {phase:<12}" + ("-" if seconds is None else f"{seconds * 1000:9.2f}ms"))
+	return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+	"""Run the command line, python -m cli2gui.
+
+	:param list[str] | None argv: arguments. Defaults to sys.argv[1:]
+	:return int: exit code
+	"""
+	parser = argparse.ArgumentParser(prog="python -m cli2gui", description="cli2gui tools")
+	commands = parser.add_subparsers(dest="command", required=True)
+	inspectParser = commands.add_parser(
+		"inspect",
+		help="describe the build spec of a decorated tool, with timings",
+		description=__doc__,
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+	)
+	inspectParser.add_argument("target", help='"module:function", or "module" if it runs on import')
+	inspectParser.add_argument(
+		"args",
+		nargs=argparse.REMAINDER,
+		help="arguments for the tool (options for inspect go first)",
+	)
+	inspectParser.add_argument("--json", action="store_true", help="print the report as json")
+	inspectParser.add_argument("--dump", help="also write the build spec to this file (json)")
+	inspectParser.add_argument("--no-layout", action="store_true", help="skip the layout phase")
+	inspectParser.add_argument(
+		"--no-cache", action="store_true", help="disable the build spec cache"
+	)
+	args = parser.parse_args(argv)
+
+	if args.no_cache:
+		os.environ["CLI2GUI_NO_CACHE"] = "1"
+	# As for python -m, so modules in the working directory can be inspected
+	sys.path.insert(0, str(Path.cwd()))
+	try:
+		report = inspect(args.target, args.args, withLayout=not args.no_layout)
+	except (ImportError, AttributeError, RuntimeError) as exc:
+		sys.stderr.write(f"Cannot inspect {args.target}: {exc}\n")
+		return 1
+	spec = report.pop("spec")
+	if args.dump:
+		try:
+			serialize.dump(spec, args.dump)
+		except (OSError, TypeError) as exc:
+			sys.stderr.write(f"Cannot write the build spec to {args.dump}: {exc}\n")
+	sys.stdout.write((json.dumps(report, indent=2) if args.json else formatReport(report)) + "\n")
+	return 0
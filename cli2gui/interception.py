@@ -0,0 +1,130 @@
+"""Route parser calls (eg. ArgumentParser.parse_args) made in a decorated function to cli2gui.
+
+The parser functions are replaced with wrappers while at least one decorated call is
+running, and put back once the last one returns. The handler for a call is held in a
+context variable, so a wrapper only hands over to cli2gui when called from the decorated
+call itself. Parsers used by other threads (or other tools hosted in the same process) get
+the original function.
+
+Intercepted: getopt.getopt, getopt.gnu_getopt, optparse.OptionParser.parse_args,
+argparse.ArgumentParser.parse_args, docopt.docopt and dephell_argparse.Parser.parse_args
+(when installed).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import importlib
+import threading
+from contextvars import ContextVar
+from types import ModuleType
+from typing import Any, Callable, Iterator
+
+# Handler for parser calls in the current context, None outside a decorated call
+_handler: ContextVar[Callable[..., Any] | None] = ContextVar("cli2gui_handler", default=None)
+_lock = threading.Lock()
+# Number of decorated calls running, the wrappers are installed while this is above 0
+_state = {"users": 0}
+# (owner, name, value before installing), MISSING for inherited attributes
+_saved: list[tuple[Any, str, Any]] = []
+
+MISSING = object()
+
+
+@functools.cache
+def optionalModule(name: str) -> ModuleType | None:
+	"""Import an optional parser module once, None if it is not installed.
+
+	:param str name: module name, eg. "docopt"
+	:return ModuleType | None: the module
+	"""
+	try:
+		return importlib.import_module(name)
+	except ImportError:
+		return None
+
+
+def targets() -> list[tuple[Any, str]]:
+	"""Get the (owner, name) of each parser function to intercept.
+
+	:return list[tuple[Any, str]]: owners (a module or class) and attribute names
+	"""
+	import getopt
+	from argparse import ArgumentParser
+	from optparse import OptionParser
+
+	found: list[tuple[Any, str]] = [
+		(getopt, "getopt"),
+		(getopt, "gnu_getopt"),
+		(OptionParser, "parse_args"),
+		(ArgumentParser, "parse_args"),
+	]
+	docopt = optionalModule("docopt")
+	if docopt is not None:
+		found.append((docopt, "docopt"))
+	dephellArgparse = optionalModule("dephell_argparse")
+	if dephellArgparse is not None:
+		found.append((dephellArgparse.Parser, "parse_args"))
+	return found
+
+
+def wrap(original: Callable[..., Any]) -> Callable[..., Any]:
+	"""Wrap a parser function to call the handler of the current context, if any.
+
+	:param Callable[..., Any] original: the parser function
+	:return Callable[..., Any]: the wrapper
+	"""
+
+	@functools.wraps(original)
+	def intercepted(*args: Any, **kwargs: Any) -> Any:
+		handler = _handler.get()
+		if handler is None:
+			return original(*args, **kwargs)
+		return handler(*args, **kwargs)
+
+	return intercepted
+
+
+def install() -> None:
+	"""Install the wrappers, or count another user if already installed."""
+	with _lock:
+		_state["users"] += 1
+		if _state["users"] > 1:
+			return
+		for owner, name in targets():
+			_saved.append((owner, name, vars(owner).get(name, MISSING)))
+			setattr(owner, name, wrap(getattr(owner, name)))
+
+
+def uninstall() -> None:
+	"""Put back the parser functions once the last user is done."""
+	with _lock:
+		_state["users"] -= 1
+		if _state["users"] > 0:
+			return
+		for owner, name, value in reversed(_saved):
+			if value is not MISSING:
+				setattr(owner, name, value)
+			elif name in vars(owner):
+				delattr(owner, name)
+		_saved.clear()
+
+
+@contextlib.contextmanager
+def intercept(handler: Callable[..., Any]) -> Iterator[None]:
+	"""Send parser calls made in this context (not other threads) to handler.
+
+	The handler is called with the arguments of the parser function, eg.
+	(parser, *args, **kwargs) for parse_args and (args, shortopts, longopts) for getopt.
+
+	:param Callable[..., Any] handler: called in place of the parser function
+	:yield None: while intercepting
+	"""
+	install()
+	token = _handler.set(handler)
+	try:
+		yield
+	finally:
+		_handler.reset(token)
+		uninstall()
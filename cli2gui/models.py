@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 
@@ -24,6 +24,9 @@ class BuildSpec:
 	program_description: str
 	max_args_shown: int
 	menu: str | dict[str, Any]
+	# Worker processes for batch runs, 0 for one per cpu
+	batch_workers: int = 0
+	file_handles: str | FileHandles = "eager"
 
 
 @dataclass
@@ -59,6 +62,22 @@ class ItemType(Enum):
 	DateTime = "DateTime"
 
 
+@dataclass(frozen=True)
+class Decoder:
+	"""How to convert the value of an item for the run_function, see application2args.
+
+	verbatim values are passed as they are (eg. the defaults of a subcommand). For click, a
+	Bool that is not a flag takes a value, and off_opt turns an on/off flag off.
+	"""
+
+	type: ItemType
+	file_mode: str | None = None
+	file_encoding: str | None = None
+	verbatim: bool = False
+	flag: bool = True
+	off_opt: str | None = None
+
+
 @dataclass
 class Group:
 	"""Representation for an argument group."""
@@ -74,6 +93,26 @@ class ParserRep:
 
 	parser_description: str
 	widgets: list[Group]
+	subcommands: list[CommandNode] = field(default_factory=list)
+
+
+@dataclass
+class CommandNode:
+	"""Representation for a subcommand, converted when it is first selected."""
+
+	name: str
+	help: str
+	# Converts the parser for this subcommand (its widgets and its own subcommands)
+	loader: Callable[[], ParserRep] | None = field(default=None, compare=False, repr=False)
+	# Values added to the args when selected eg. {subparsers dest: name}
+	values: dict[str, Any] = field(default_factory=dict)
+	parser_rep: ParserRep | None = field(default=None, compare=False, repr=False)
+
+	def load(self) -> ParserRep:
+		"""Convert the subcommand, only the first call does any work."""
+		if self.parser_rep is None:
+			self.parser_rep = self.loader() if self.loader else ParserRep("", [])
+		return self.parser_rep
 
 
 @dataclass
@@ -92,6 +131,9 @@ class FullBuildSpec:
 	menu: str | dict[str, Any]
 	parser_description: str
 	widgets: list[Group]
+	subcommands: list[CommandNode] = field(default_factory=list)
+	batch_workers: int = 0
+	file_handles: str | FileHandles = "eager"
 
 
 # Supported parser types
@@ -109,6 +151,18 @@ class ParserType(str, Enum):
 	CUSTOM = "input()"  # this seems like a pretty poor pattern to use
 
 
+# How File/ FileWrite arguments are passed to the run_function
+class FileHandles(str, Enum):
+	"""Supported file handle modes."""
+
+	# Open files when the run starts
+	EAGER = "eager"
+	# Open files on first use, see application.files.LazyFile
+	LAZY = "lazy"
+	# As lazy, memory-mapping files opened to read as bytes
+	MMAP = "mmap"
+
+
 # Supported gui types
 class GUIType(str, Enum):
 	"""Supported gui types.
@@ -122,3 +176,61 @@ class GUIType(str, Enum):
 	FSGWEB = "freesimpleguiweb"
 	FSGQT = "freesimpleguiqt"
 	DPG = "dearpygui"
+	# Html form served to a web browser, see gui.browser_wrapper
+	BROWSER = "browser"
+
+
+class JobState(str, Enum):
+	"""States a job (one call of the run_function) moves through."""
+
+	PENDING = "pending"
+	RUNNING = "running"
+	DONE = "done"
+	FAILED = "failed"
+
+
+@dataclass
+class Job:
+	"""Representation for a single call of the run_function on a worker thread."""
+
+	job_id: int
+	function: Callable[..., Any]
+	args: Any
+	state: JobState = JobState.PENDING
+	result: Any = None
+	error: BaseException | None = None
+	started: float = 0.0
+	finished: float = 0.0
+	# OutputBuffer capturing the stdout/ stderr of the job
+	output: Any = None
+
+	def describe(self) -> str:
+		"""Get a short, human readable status line for this job."""
+		if self.state == JobState.DONE:
+			return f"Job {self.job_id}: done in {self.finished - self.started:.2f}s"
+		if self.state == JobState.FAILED:
+			return f"Job {self.job_id}: failed - {self.error!r}"
+		return f"Job {self.job_id}: {self.state.value}..."
+
+
+@dataclass
+class BatchRow:
+	"""Representation for one row (set of values) of a batch run, run in a worker process."""
+
+	index: int
+	values: dict[str, Any]
+	state: JobState = JobState.PENDING
+	# Errors are kept as text as exceptions from another process may not be picklable
+	error: str = ""
+	# The end of the stdout/ stderr of the run
+	output: str = ""
+	# time.perf_counter() of the GUI process, started is 0.0 for rows that never ran
+	started: float = 0.0
+	finished: float = 0.0
+
+	def describe(self) -> str:
+		"""Get a short, human readable status for this row."""
+		if self.state == JobState.FAILED:
+			return self.error
+		lines = self.output.strip().splitlines()
+		return lines[-1] if lines else ""
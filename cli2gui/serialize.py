@@ -0,0 +1,470 @@
+"""Versioned json for build specs, so they can be generated once (eg. when a package is
+built) and loaded without converting the parser again.
+
+A document is {"format": "cli2gui.buildspec", "version": 1, "spec": {...}}, described by
+SCHEMA (json schema). Subcommands are converted when the spec is
+dumped, so the whole tree is stored. The run_function is stored as a "module:qualname"
+reference, loads only imports it if asked to (resolve=True) or passed one.
+
+Values that json has no type for (defaults, choices and additional properties) are stored
+as {"$type": ..., "value": ...}: tuples, paths, dicts with keys that are not strings (or
+that have a "$type" key) and the standard streams (eg. the default of an
+argparse.FileType("w") argument is often sys.stdout), stored by name and loaded as the
+stream of the same name in the loading process. Other values raise a TypeError.
+
+orjson is used when it is installed, json otherwise. Both write the same documents.
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib
+import json
+import sys
+from pathlib import Path, PurePath
+from typing import Any, Callable
+
+from cli2gui.models import CommandNode, FullBuildSpec, Group, Item, ItemType, ParserRep
+
+FORMAT_NAME = "cli2gui.buildspec"
+# Bump when the layout of documents changes, documents from newer versions are rejected
+SCHEMA_VERSION = 1
+
+_value = {"description": "json value, or a tagged value ({'$type': ..., 'value': ...})"}
+
+SCHEMA: dict[str, Any] = {
+	"$schema": "https://json-schema.org/draft/2020-12/schema",
+	"$id": "https://github.com/FHPythonUtils/Cli2Gui/buildspec.schema.json",
+	"title": "cli2gui build spec",
+	"type": "object",
+	"required": ["format", "version", "spec"],
+	"properties": {
+		"format": {"const": FORMAT_NAME},
+		"version": {"const": SCHEMA_VERSION},
+		"spec": {"$ref": "#/$defs/spec"},
+	},
+	"$defs": {
+		"theme": {"oneOf": [{"type": "string"}, {"type": "array", "items": {"type": "string"}}]},
+		"item": {
+			"type": "object",
+			"required": ["type", "display_name", "commands", "help", "dest", "default"],
+			"properties": {
+				"type": {"enum": [itemType.value for itemType in ItemType]},
+				"display_name": {"type": "string"},
+				"commands": {"type": "array", "items": {"type": "string"}},
+				"help": {"type": ["string", "null"]},
+				"dest": {"type": ["string", "null"]},
+				"default": _value,
+				"required": {"type": "boolean"},
+				"choices": {"type": ["array", "null"], "items": _value},
+				"nargs": {"type": ["string", "integer", "null"]},
+				"additional_properties": {
+					"type": ["object", "null"],
+					"properties": {"radio": {"type": "array", "items": {"$ref": "#/$defs/item"}}},
+				},
+			},
+		},
+		"group": {
+			"type": "object",
+			"required": ["name", "arg_items", "groups"],
+			"properties": {
+				"name": {"type": "string"},
+				"arg_items": {"type": "array", "items": {"$ref": "#/$defs/item"}},
+				"groups": {"type": "array", "items": {"$ref": "#/$defs/group"}},
+			},
+		},
+		"parser_rep": {
+			"type": "object",
+			"required": ["parser_description", "widgets"],
+			"properties": {
+				"parser_description": {"type": ["string", "null"]},
+				"widgets": {"type": "array", "items": {"$ref": "#/$defs/group"}},
+				"subcommands": {"type": "array", "items": {"$ref": "#/$defs/command"}},
+			},
+		},
+		"command": {
+			"type": "object",
+			"required": ["name", "help", "parser_rep"],
+			"properties": {
+				"name": {"type": "string"},
+				"help": {"type": ["string", "null"]},
+				"values": {"type": "object"},
+				"parser_rep": {"$ref": "#/$defs/parser_rep"},
+			},
+		},
+		"spec": {
+			"type": "object",
+			"required": ["parser", "gui", "program_name", "parser_description", "widgets"],
+			"properties": {
+				"run_function": {
+					"type": ["string", "null"],
+					"description": "module:qualname of the run_function",
+				},
+				"parser": {"type": "string"},
+				"gui": {"type": "string"},
+				"theme": {"$ref": "#/$defs/theme"},
+				"darkTheme": {"$ref": "#/$defs/theme"},
+				"image": {"type": "string"},
+				"program_name": {"type": "string"},
+				"program_description": {"type": "string"},
+				"max_args_shown": {"type": "integer"},
+				"menu": {"oneOf": [{"type": "string"}, {"type": "object"}]},
+				"parser_description": {"type": ["string", "null"]},
+				"widgets": {"type": "array", "items": {"$ref": "#/$defs/group"}},
+				"subcommands": {"type": "array", "items": {"$ref": "#/$defs/command"}},
+				"batch_workers": {"type": "integer"},
+				"file_handles": {"enum": ["eager", "lazy", "mmap"]},
+			},
+		},
+	},
+}
+
+PLAIN_TYPES = (str, int, float, bool, type(None))
+STDIO_NAMES = ("stdin", "stdout", "stderr")
+
+
+def stdioName(value: Any) -> str | None:
+	"""Get the name of a standard stream (as set now, or at startup), None for other values."""
+	for name in STDIO_NAMES:
+		if value is getattr(sys, name) or value is getattr(sys, f"__{name}__"):
+			return name
+	return None
+
+
+@functools.cache
+def jsonLib() -> tuple[Callable[[Any], bytes], Callable[[bytes | str], Any]]:
+	"""Get the functions to write and read json, from orjson if installed else json.
+
+	:return tuple[Callable[[Any], bytes], Callable[[bytes | str], Any]]: dumps and loads
+	"""
+	try:
+		import orjson
+	except ImportError:
+		return (
+			lambda data: json.dumps(data, separators=(",", ":"), sort_keys=True).encode("utf-8"),
+			json.loads,
+		)
+	return (lambda data: orjson.dumps(data, option=orjson.OPT_SORT_KEYS), orjson.loads)
+
+
+def encodeValue(value: Any) -> Any:
+	"""Encode a value as json, tagging the types json does not have.
+
+	:param Any value: default, choice or additional property of an item
+	:raises TypeError: if the value cannot be stored
+	:return Any: json value
+	"""
+	if isinstance(value, PLAIN_TYPES):
+		return value
+	if isinstance(value, list):
+		return [encodeValue(element) for element in value]
+	if isinstance(value, tuple):
+		return {"$type": "tuple", "value": [encodeValue(element) for element in value]}
+	if isinstance(value, PurePath):
+		return {"$type": "path", "value": str(value)}
+	if isinstance(value, dict):
+		if all(isinstance(key, str) for key in value) and "$type" not in value:
+			return {key: encodeValue(element) for key, element in value.items()}
+		return {
+			"$type": "dict",
+			"value": [[encodeValue(key), encodeValue(element)] for key, element in value.items()],
+		}
+	name = stdioName(value)
+	if name is not None:
+		return {"$type": "stdio", "value": name}
+	msg = f"Cannot store a {type(value).__name__} ({value!r}) in a build spec"
+	raise TypeError(msg)
+
+
+def decodeValue(value: Any) -> Any:
+	"""Decode a value encoded with encodeValue.
+
+	:param Any value: json value
+	:return Any: the value
+	"""
+	if isinstance(value, list):
+		return [decodeValue(element) for element in value]
+	if not isinstance(value, dict):
+		return value
+	tag = value.get("$type")
+	if tag is None:
+		return {key: decodeValue(element) for key, element in value.items()}
+	if tag == "tuple":
+		return tuple(decodeValue(element) for element in value["value"])
+	if tag == "path":
+		return Path(value["value"])
+	if tag == "dict":
+		return {decodeValue(key): decodeValue(element) for key, element in value["value"]}
+	if tag == "stdio" and value["value"] in STDIO_NAMES:
+		return getattr(sys, value["value"])
+	msg = f"Unknown $type {tag!r}"
+	raise ValueError(msg)
+
+
+def encodeItem(item: Item) -> dict[str, Any]:
+	"""Encode an item, radio groups contain nested items."""
+	props = item.additional_properties
+	if props:
+		props = {
+			key: [encodeItem(radio) for radio in value] if key == "radio" else encodeValue(value)
+			for key, value in props.items()
+		}
+	return {
+		"type": item.type.value,
+		"display_name": item.display_name,
+		"commands": list(item.commands),
+		"help": item.help,
+		"dest": item.dest,
+		"default": encodeValue(item.default),
+		"required": item.required,
+		"choices": encodeValue(item.choices),
+		"nargs": item.nargs,
+		"additional_properties": props,
+	}
+
+
+# ItemType by value, faster than calling ItemType for each item
+ITEM_TYPES = {itemType.value: itemType for itemType in ItemType}
+
+
+def decodeItem(data: dict[str, Any]) -> Item:
+	"""Decode an item encoded with encodeItem."""
+	# Runs for every item of every spec loaded, so values that need no decoding (almost all
+	# of them) skip decodeValue
+	props = data.get("additional_properties")
+	if props:
+		props = {
+			key: [decodeItem(radio) for radio in value] if key == "radio" else decodeValue(value)
+			for key, value in props.items()
+		}
+	default = data["default"]
+	choices = data.get("choices")
+	return Item(
+		ITEM_TYPES[data["type"]],
+		data["display_name"],
+		data["commands"],
+		data["help"],
+		data["dest"],
+		decodeValue(default) if isinstance(default, (list, dict)) else default,
+		data.get("required", False),
+		None if choices is None else decodeValue(choices),
+		data.get("nargs"),
+		props,
+	)
+
+
+def encodeGroup(group: Group) -> dict[str, Any]:
+	"""Encode a group."""
+	return {
+		"name": group.name,
+		"arg_items": [encodeItem(item) for item in group.arg_items],
+		"groups": [encodeGroup(subgroup) for subgroup in group.groups],
+	}
+
+
+def decodeGroup(data: dict[str, Any]) -> Group:
+	"""Decode a group encoded with encodeGroup."""
+	return Group(
+		name=data["name"],
+		arg_items=[decodeItem(item) for item in data["arg_items"]],
+		groups=[decodeGroup(subgroup) for subgroup in data["groups"]],
+	)
+
+
+def encodeCommand(node: CommandNode) -> dict[str, Any]:
+	"""Encode a subcommand, converting it (and its subcommands) if not yet converted."""
+	return {
+		"name": node.name,
+		"help": node.help,
+		"values": encodeValue(node.values),
+		"parser_rep": encodeParserRep(node.load()),
+	}
+
+
+def decodeCommand(data: dict[str, Any]) -> CommandNode:
+	"""Decode a subcommand encoded with encodeCommand, it is already converted."""
+	return CommandNode(
+		name=data["name"],
+		help=data["help"],
+		values=decodeValue(data.get("values", {})),
+		parser_rep=decodeParserRep(data["parser_rep"]),
+	)
+
+
+def encodeParserRep(parserRep: ParserRep) -> dict[str, Any]:
+	"""Encode a parser representation (as from a tojson converter).
+
+	:param ParserRep parserRep: the parser representation
+	:return dict[str, Any]: json object
+	"""
+	return {
+		"parser_description": parserRep.parser_description,
+		"widgets": [encodeGroup(group) for group in parserRep.widgets],
+		"subcommands": [encodeCommand(node) for node in parserRep.subcommands],
+	}
+
+
+def decodeParserRep(data: dict[str, Any]) -> ParserRep:
+	"""Decode a parser representation encoded with encodeParserRep.
+
+	:param dict[str, Any] data: json object
+	:return ParserRep: the parser representation
+	"""
+	return ParserRep(
+		parser_description=data["parser_description"],
+		widgets=[decodeGroup(group) for group in data["widgets"]],
+		subcommands=[decodeCommand(node) for node in data.get("subcommands", [])],
+	)
+
+
+def functionReference(function: Callable[..., Any] | None) -> str | None:
+	"""Get a "module:qualname" reference to a function, None if it cannot be imported by
+	name (eg. a lambda or a function defined in another function).
+	"""
+	module = getattr(function, "__module__", None)
+	qualname = getattr(function, "__qualname__", "")
+	if not module or not qualname or "<" in qualname:
+		return None
+	return f"{module}:{qualname}"
+
+
+def resolveFunction(reference: str) -> Callable[..., Any]:
+	"""Import the function for a "module:qualname" reference.
+
+	:param str reference: reference from functionReference
+	:return Callable[..., Any]: the function
+	"""
+	module, _, qualname = reference.partition(":")
+	function: Any = importlib.import_module(module)
+	for name in qualname.split("."):
+		function = getattr(function, name)
+	return function
+
+
+def encodeSpec(spec: FullBuildSpec) -> dict[str, Any]:
+	"""Encode a build spec as a versioned json document.
+
+	:param FullBuildSpec spec: the build spec
+	:raises TypeError: if a value of the spec cannot be stored
+	:return dict[str, Any]: the document
+	"""
+	return {
+		"format": FORMAT_NAME,
+		"version": SCHEMA_VERSION,
+		"spec": {
+			"run_function": functionReference(spec.run_function),
+			"parser": str(getattr(spec.parser, "value", spec.parser)),
+			"gui": str(getattr(spec.gui, "value", spec.gui)),
+			"theme": spec.theme,
+			"darkTheme": spec.darkTheme,
+			"image": spec.image,
+			"program_name": spec.program_name,
+			"program_description": spec.program_description,
+			"max_args_shown": spec.max_args_shown,
+			"menu": encodeValue(spec.menu),
+			"batch_workers": spec.batch_workers,
+			"file_handles": str(getattr(spec.file_handles, "value", spec.file_handles)),
+			**encodeParserRep(ParserRep(spec.parser_description, spec.widgets, spec.subcommands)),
+		},
+	}
+
+
+def decodeSpec(
+	document: dict[str, Any],
+	run_function: Callable[..., Any] | None = None,
+	*,
+	resolve: bool = False,
+) -> FullBuildSpec:
+	"""Decode a build spec encoded with encodeSpec.
+
+	:param dict[str, Any] document: the document
+	:param Callable[..., Any] | None run_function: the run_function for the spec. Defaults
+	to None
+	:param bool resolve: import the stored run_function if run_function is None. Defaults
+	to False
+	:raises ValueError: if the document is not a build spec, or is from a newer version
+	:return FullBuildSpec: the build spec
+	"""
+	if not isinstance(document, dict) or document.get("format") != FORMAT_NAME:
+		msg = "Not a cli2gui build spec"
+		raise ValueError(msg)
+	version = document.get("version")
+	if not isinstance(version, int) or version > SCHEMA_VERSION:
+		msg = f"Build spec version {version!r} is not supported (up to {SCHEMA_VERSION})"
+		raise ValueError(msg)
+	data = document["spec"]
+	reference = data.get("run_function")
+	if run_function is None and resolve and reference:
+		run_function = resolveFunction(reference)
+	parserRep = decodeParserRep(data)
+	return FullBuildSpec(
+		run_function=run_function,
+		parser=data["parser"],
+		gui=data["gui"],
+		theme=data.get("theme", ""),
+		darkTheme=data.get("darkTheme", ""),
+		image=data.get("image", ""),
+		program_name=data["program_name"],
+		program_description=data.get("program_description", ""),
+		max_args_shown=data.get("max_args_shown", 5),
+		menu=decodeValue(data.get("menu", "")),
+		parser_description=parserRep.parser_description,
+		widgets=parserRep.widgets,
+		subcommands=parserRep.subcommands,
+		batch_workers=data.get("batch_workers", 0),
+		file_handles=data.get("file_handles", "eager"),
+	)
+
+
+def dumps(spec: FullBuildSpec) -> bytes:
+	"""Write a build spec as json.
+
+	:param FullBuildSpec spec: the build spec
+	:return bytes: utf-8 json
+	"""
+	return jsonLib()[0](encodeSpec(spec))
+
+
+def loads(
+	data: bytes | str,
+	run_function: Callable[..., Any] | None = None,
+	*,
+	resolve: bool = False,
+) -> FullBuildSpec:
+	"""Read a build spec written by dumps.
+
+	:param bytes | str data: the json
+	:param Callable[..., Any] | None run_function: the run_function for the spec. Defaults
+	to None
+	:param bool resolve: import the stored run_function if run_function is None. Defaults
+	to False
+	:return FullBuildSpec: the build spec
+	"""
+	return decodeSpec(jsonLib()[1](data), run_function, resolve=resolve)
+
+
+def dump(spec: FullBuildSpec, path: str | Path) -> None:
+	"""Write a build spec to a json file.
+
+	:param FullBuildSpec spec: the build spec
+	:param str | Path path: file to write
+	"""
+	Path(path).write_bytes(dumps(spec))
+
+
+def load(
+	path: str | Path,
+	run_function: Callable[..., Any] | None = None,
+	*,
+	resolve: bool = False,
+) -> FullBuildSpec:
+	"""Read a build spec from a json file written by dump.
+
+	:param str | Path path: file to read
+	:param Callable[..., Any] | None run_function: the run_function for the spec. Defaults
+	to None
+	:param bool resolve: import the stored run_function if run_function is None. Defaults
+	to False
+	:return FullBuildSpec: the build spec
+	"""
+	return loads(Path(path).read_bytes(), run_function, resolve=resolve)
@@ -15,12 +15,11 @@ from argparse import (
 	_StoreTrueAction,
 	_SubParsersAction,
 )
-from os import path
+from functools import partial
 from pathlib import Path
-from sys import argv
 from typing import Any, Generator, TypedDict
 
-from cli2gui.models import Group, Item, ItemType, ParserRep
+from cli2gui.models import CommandNode, Group, Item, ItemType, ParserRep, ParserType
 
 
 class ArgparseGroup(TypedDict):
@@ -31,37 +30,41 @@ class ArgparseGroup(TypedDict):
 	groups: list[ArgparseGroup] | list[Any]
 
 
-def iterParsers(
-	parser: argparse.ArgumentParser,
-) -> list[tuple[str, argparse.ArgumentParser]]:
-	"""Iterate over name, parser pairs."""
-	defaultParser = [
-		("::cli2gui/default", parser),
-	]
-	candidateSubparsers = [
-		action for action in parser._actions if isinstance(action, _SubParsersAction)
-	]
-	if len(candidateSubparsers) == 0:
-		return defaultParser
-
-	return defaultParser + list(candidateSubparsers[0].choices.items())
-
-
-def isDefaultProgname(name: str, subparser: argparse.ArgumentParser) -> bool:
-	"""Identify if the passed name is the default program name."""
-	return subparser.prog == f"{path.split(argv[0])[-1]} {name}"
+def loadSubparser(subparser: argparse.ArgumentParser) -> ParserRep:
+	"""Convert a subparser once it is selected in the GUI, using the build spec cache."""
+	from cli2gui import cache
 
+	return cache.cachedConvert(ParserType.ARGPARSE, subparser, convert, fingerprint)
 
-def chooseName(name: str, subparser: argparse.ArgumentParser) -> str:
-	"""Get the program name."""
-	return name if isDefaultProgname(name, subparser) else subparser.prog
 
+def buildCommandNodes(parser: argparse.ArgumentParser) -> list[CommandNode]:
+	"""Get a CommandNode for each subcommand of a parser.
 
-def containsActions(
-	actionA: list[argparse.Action], actionB: list[argparse.Action]
-) -> set[argparse.Action]:
-	"""Check if any actions(a) are present in actions(b)."""
-	return set(actionA).intersection(set(actionB))
+	Only the names are read here, each subparser is converted by CommandNode.load when it is
+	selected (and its own subcommands are found then).
+	"""
+	nodes = []
+	for action in parser._actions:
+		if not isinstance(action, _SubParsersAction):
+			continue
+		# Only subparsers added with help= have an entry in _choices_actions
+		helpMap = {choice.dest: choice.help for choice in action._choices_actions}
+		seen = set()
+		for name, subparser in action.choices.items():
+			# Aliases map to the same subparser as the name before them
+			if id(subparser) in seen:
+				continue
+			seen.add(id(subparser))
+			values = {} if action.dest == argparse.SUPPRESS else {action.dest: name}
+			nodes.append(
+				CommandNode(
+					name=name,
+					help=str(helpMap.get(name) or ""),
+					loader=partial(loadSubparser, subparser),
+					values={**values, **subparser._defaults},
+				)
+			)
+	return nodes
 
 
 def reapplyMutexGroups(
@@ -73,22 +76,34 @@ def reapplyMutexGroups(
 	with the groups/subgroups to which they were originally declared
 	in order to have them appear in the correct location in the UI.
 
-	Order is attempted to be preserved by inserting the MutexGroup
-	into the _actions list at the first occurrence of any item
-	where the two groups intersect.
+	Order is preserved by putting the MutexGroup in place of its first
+	action, or its first action that is present in the group otherwise. Actions
+	are looked up by identity in an index built once, so this is linear in the
+	number of actions.
 	"""
+	# Where an action belongs to several mutex groups, the first group wins
+	mutexIndex: dict[int, argparse._MutuallyExclusiveGroup] = {}
+	for mutexGroup in mutexGroups:
+		for action in mutexGroup._group_actions:
+			mutexIndex.setdefault(id(action), mutexGroup)
 
 	def swapActions(actions: list[Action]) -> list[Action]:
-		for mutexgroup in mutexGroups:
-			mutexActions = mutexgroup._group_actions
-			if containsActions(mutexActions, actions):
-				# make a best guess as to where we should store the group
-				targetindex = actions.index(mutexgroup._group_actions[0])
-				# insert the _ArgumentGroup container
-				actions[targetindex] = mutexgroup
-				# remove the duplicated individual actions
-				actions = [action for action in actions if action not in mutexActions]
-		return actions
+		# Position of each mutex group in actions
+		anchors: dict[int, int] = {}
+		for index, action in enumerate(actions):
+			mutexGroup = mutexIndex.get(id(action))
+			if mutexGroup is not None and (
+				id(mutexGroup) not in anchors or action is mutexGroup._group_actions[0]
+			):
+				anchors[id(mutexGroup)] = index
+		swapped: list[Any] = []
+		for index, action in enumerate(actions):
+			mutexGroup = mutexIndex.get(id(action))
+			if mutexGroup is None:
+				swapped.append(action)
+			elif anchors[id(mutexGroup)] == index:
+				swapped.append(mutexGroup)
+		return swapped
 
 	return [
 		group.update({"arg_items": swapActions(group["arg_items"])}) or group
@@ -100,9 +115,11 @@ def extractRawGroups(actionGroup: argparse._ArgumentGroup) -> ArgparseGroup:
 	"""Recursively extract argument groups and associated actions from ParserGroup objects."""
 	return {
 		"name": str(actionGroup.title),
-		# List of arg_items that are not help messages
+		# List of arg_items that are not help messages, subcommands are shown as CommandNodes
 		"arg_items": [
-			action for action in actionGroup._group_actions if not isinstance(action, _HelpAction)
+			action
+			for action in actionGroup._group_actions
+			if not isinstance(action, (_HelpAction, _SubParsersAction))
 		],
 		"groups": [extractRawGroups(group) for group in actionGroup._action_groups],
 	}
@@ -205,9 +222,60 @@ def process(parser: argparse.ArgumentParser) -> list[Group]:
 	return categorizeGroups(stripEmpty(correctedActionGroups))
 
 
+def groupFingerprint(
+	group: argparse._ArgumentGroup, actionIndex: dict[int, int]
+) -> tuple[Any, ...]:
+	"""Describe a group, and the groups nested in it (as extractRawGroups reads them)."""
+	return (
+		group.title,
+		[actionIndex.get(id(action)) for action in group._group_actions],
+		[groupFingerprint(subgroup, actionIndex) for subgroup in group._action_groups],
+	)
+
+
+def fingerprint(parser: argparse.ArgumentParser) -> tuple[Any, ...]:
+	"""Describe everything about a parser that affects the result of convert.
+
+	Used as the key for the build spec cache.
+	"""
+	actionIndex = {id(action): index for index, action in enumerate(parser._actions)}
+	return (
+		parser.prog,
+		parser.description,
+		[
+			(
+				type(action).__name__,
+				action.option_strings,
+				action.dest,
+				action.nargs,
+				repr(action.default),
+				getattr(action.type, "__name__", repr(action.type)),
+				repr(action.choices)
+				if not isinstance(action, _SubParsersAction)
+				# Subparsers are converted (and cached) separately, only their names matter
+				else (
+					list(action.choices),
+					[(choice.dest, choice.help) for choice in action._choices_actions],
+				),
+				action.required,
+				action.help,
+				action.metavar,
+			)
+			for action in parser._actions
+		],
+		[groupFingerprint(group, actionIndex) for group in parser._action_groups],
+		[
+			[actionIndex.get(id(action)) for action in group._group_actions]
+			for group in parser._mutually_exclusive_groups
+		],
+	)
+
+
 def convert(parser: argparse.ArgumentParser) -> ParserRep:
 	"""Convert argparse to a dict.
 
+	Subcommands are not converted, see buildCommandNodes.
+
 	Args:
 	----
 		parser (argparse.ArgumentParser): argparse parser
@@ -217,10 +285,8 @@ def convert(parser: argparse.ArgumentParser) -> ParserRep:
 		ParserRep: dictionary representing parser object
 
 	"""
-	widgets = []
-	for _, subparser in iterParsers(parser):
-		widgets.extend(process(subparser))
-
 	return ParserRep(
-		parser_description=f"{parser.prog}: {parser.description or ''}", widgets=widgets
+		parser_description=f"{parser.prog}: {parser.description or ''}",
+		widgets=process(parser),
+		subcommands=buildCommandNodes(parser),
 	)
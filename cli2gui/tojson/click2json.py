@@ -1,32 +1,94 @@
-"""Generate a dict describing optparse arguments."""
+"""Generate a dict describing click arguments.
+
+Groups (click.Group, or any command with list_commands/ get_command) are shown with a
+CommandNode for each subcommand. Only the names are read from list_commands, a subcommand is
+got from get_command (which may import its module, as with a lazily loading group) and
+converted when it is selected.
+
+The dest of an item of a subcommand is prefixed with the path to it, eg. "db migrate --dry-run"
+so clickFormat can put the args of each group before the name of its subcommand.
+"""
 
 from __future__ import annotations
 
 import contextlib
+from functools import partial
 from typing import Any, Generator
 
-from cli2gui.models import Group, Item, ItemType, ParserRep
+from cli2gui.models import CommandNode, Group, Item, ItemType, ParserRep, ParserType
+
+# Name of the value holding the name of a selected subcommand, see pathKey
+COMMAND = "::cli2gui/command"
+
+
+def pathKey(path: tuple[str, ...], name: str) -> str:
+	"""Key a value by the path to the (sub)command it belongs to.
+
+	:param tuple[str, ...] path: names of the subcommands, empty for the program
+	:param str name: the dest eg. "--count", or COMMAND
+	:return str: the key eg. "db migrate --count"
+	"""
+	return " ".join((*path, name))
 
 
-def extract(parser: Any) -> list[Group]:
+def extract(parser: Any, path: tuple[str, ...] = ()) -> list[Group]:
 	"""Get the actions as json for the parser."""
-	try:
-		argumentList = [
-			Group(
-				name="Positional Arguments",
-				arg_items=list(categorize([parser.commands[key] for key in parser.commands])),
-				groups=[],
-			)
-		]
-	except AttributeError:
-		argumentList: list[Group] = []
-	argumentList.append(
-		Group(name="Optional Arguments", arg_items=list(categorize(parser.params)), groups=[])
+	return [
+		Group(name="Optional Arguments", arg_items=list(categorize(parser.params, path)), groups=[])
+	]
+
+
+def loadCommand(group: Any, ctx: Any, name: str, path: tuple[str, ...]) -> ParserRep:
+	"""Get a subcommand of a group and convert it once it is selected in the GUI, using the
+	build spec cache.
+	"""
+	from cli2gui import cache
+
+	command = group.get_command(ctx, name)
+	if command is None:
+		return ParserRep(parser_description="", widgets=[])
+	return cache.cachedConvert(
+		ParserType.CLICK,
+		command,
+		partial(convert, path=path, parent=ctx),
+		partial(fingerprint, path=path),
 	)
-	return argumentList
 
 
-def actionToJson(action: Any, widget: ItemType, other: dict | None = None) -> Item:
+def buildCommandNodes(
+	parser: Any, path: tuple[str, ...] = (), parent: Any = None
+) -> list[CommandNode]:
+	"""Get a CommandNode for each subcommand of a group.
+
+	Only the names are read here (with list_commands) so a group that loads its subcommands
+	lazily does not import them, each is got and converted by CommandNode.load when it is
+	selected. The help is shown for subcommands the group already holds.
+	"""
+	if not hasattr(parser, "list_commands"):
+		return []
+	import click
+
+	ctx = click.Context(parser, info_name=path[-1] if path else parser.name, parent=parent)
+	loaded = getattr(parser, "commands", {})
+	nodes = []
+	for name in parser.list_commands(ctx):
+		command = loaded.get(name)
+		if command is not None and command.hidden:
+			continue
+		nodes.append(
+			CommandNode(
+				name=name,
+				help=command.get_short_help_str() if command is not None else "",
+				loader=partial(loadCommand, parser, ctx, name, (*path, name)),
+				values={pathKey((*path, name), COMMAND): name},
+			)
+		)
+	return nodes
+
+
+def actionToJson(
+	action: Any, widget: ItemType, other: dict | None = None, path: tuple[str, ...] = ()
+) -> Item:
 	"""Generate json for an action and set the widget - used by the application."""
 	nargs = ""
 	with contextlib.suppress(AttributeError):
@@ -38,41 +100,83 @@ def actionToJson(action: Any, widget: ItemType, other: dict | None = None) -> It
 		display_name=action.name,
 		help=action.help,
 		commands=commands,
-		dest=action.callback or commands[0],
+		dest=action.callback or pathKey(path, commands[0]),
 		default=action.default,
-		additional_properties={"nargs": nargs, **(other or {})},
+		additional_properties={
+			"nargs": nargs,
+			"is_flag": getattr(action, "is_flag", False),
+			"secondary_opts": action.secondary_opts,
+			**(other or {}),
+		},
 	)
 
 
-def categorize(actions: list[Any]) -> Generator[Item, None, None]:
+def categorize(actions: list[Any], path: tuple[str, ...] = ()) -> Generator[Item, None, None]:
 	"""Catergorise each action and generate json."""
 	import click
 
 	for action in actions:
 		if isinstance(action.type, click.Choice):
-			yield actionToJson(action, ItemType.Choice, {"choices": action.type.choices})
+			yield actionToJson(action, ItemType.Choice, {"choices": action.type.choices}, path)
 		elif isinstance(action.type, click.types.IntParamType):
-			yield actionToJson(action, ItemType.Int)
+			yield actionToJson(action, ItemType.Int, path=path)
 		elif isinstance(action.type, click.types.FloatParamType):
-			yield actionToJson(action, ItemType.Float)
+			yield actionToJson(action, ItemType.Float, path=path)
 		elif isinstance(action.type, click.types.BoolParamType):
-			yield actionToJson(action, ItemType.Bool)
+			yield actionToJson(action, ItemType.Bool, path=path)
 		elif isinstance(action.type, click.types.Path):
-			yield actionToJson(action, ItemType.Path)
+			yield actionToJson(action, ItemType.Path, path=path)
 		else:
-			yield actionToJson(action, ItemType.Text)
+			yield actionToJson(action, ItemType.Text, path=path)
+
 
+def fingerprint(parser: Any, path: tuple[str, ...] = ()) -> tuple[Any, ...]:
+	"""Describe everything about a parser that affects the result of convert.
 
-def convert(parser: Any) -> ParserRep:
+	Used as the key for the build spec cache, path is that of a subcommand (the dests are
+	prefixed with it).
+	"""
+
+	def describe(param: Any) -> Any:
+		# click>=8 can describe a param, type reprs may contain memory addresses
+		if hasattr(param, "to_info_dict"):
+			return repr(param.to_info_dict())
+		return (
+			param.name,
+			param.opts,
+			param.secondary_opts,
+			getattr(param, "is_flag", False),
+			repr(param.default),
+		)
+
+	return (
+		parser.name,
+		path,
+		list(getattr(parser, "commands", {})),
+		[describe(param) for param in parser.params],
+	)
+
+
+def convert(parser: Any, path: tuple[str, ...] = (), parent: Any = None) -> ParserRep:
 	"""Convert click to a dict.
 
+	Subcommands of a group are not converted, see buildCommandNodes.
+
 	Args:
 	----
 		parser (click.core.Command): click parser
+		path (tuple[str, ...], optional): names of the subcommands leading to this one.
+		Defaults to () for the program.
+		parent (click.Context, optional): context of the group this is a subcommand of.
+		Defaults to None.
 
 	Returns:
 	-------
 		ParserRep: dictionary representing parser object
 
 	"""
-	return ParserRep(parser_description="", widgets=extract(parser))
+	return ParserRep(
+		parser_description="",
+		widgets=extract(parser, path),
+		subcommands=buildCommandNodes(parser, path, parent),
+	)
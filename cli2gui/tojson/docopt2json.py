@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import re
 from typing import Any, Iterator
 
@@ -54,23 +55,83 @@ def categorize(
 
 def extract(parser: Any) -> list[Group]:
 	"""Get the actions as json for the parser."""
+	sections = tokenize(parser)
 	return [
 		Group(
 			name="Positional Arguments",
-			arg_items=list(categorize(parsePos(parser), isPos=True)),
+			arg_items=list(categorize(positionals(sections[ARGUMENTS]), isPos=True)),
+			groups=[],
+		),
+		Group(
+			name="Optional Arguments",
+			arg_items=list(categorize(options(sections[OPTIONS]))),
 			groups=[],
 		),
-		Group(name="Optional Arguments", arg_items=list(categorize(parseOpt(parser))), groups=[]),
 	]
 
 
+OPTIONS = "options:"
+ARGUMENTS = "arguments:"
+
+
+@functools.cache
+def headerPattern(name: str) -> re.Pattern[str]:
+	"""Get the (compiled) pattern for the header line of a section, eg. "Options:"."""
+	return re.compile(re.escape(name), re.IGNORECASE)
+
+
+DEFAULT_PATTERN = re.compile(re.escape("[default: "), re.IGNORECASE)
+
+
+def tokenize(source: str, names: tuple[str, ...] = (OPTIONS, ARGUMENTS)) -> dict[str, list[str]]:
+	"""Split a usage text into sections in a single pass over its lines, as docopt does.
+
+	A section starts at any line containing its name (eg. "options:") and takes every
+	following line that starts with a space or tab. Each name is tracked on its own so
+	sections of different names can overlap. Each line is read once, so this takes time
+	linear in the length of the text.
+
+	:param str source: the usage text
+	:param tuple[str, ...] names: section names. Defaults to (OPTIONS, ARGUMENTS)
+	:return dict[str, list[str]]: the (stripped) sections for each name
+	"""
+	lines = source.split("\n")
+	sections: dict[str, list[str]] = {name: [] for name in names}
+	# Line the open section of each name starts at, None if not in one
+	starts: dict[str, int | None] = dict.fromkeys(names)
+	for index, line in enumerate(lines):
+		indented = line.startswith((" ", "\t"))
+		for name in names:
+			start = starts[name]
+			if start is not None:
+				if indented:
+					continue
+				sections[name].append("\n".join(lines[start:index]).strip())
+			starts[name] = index if headerPattern(name).search(line) else None
+	for name, start in starts.items():
+		if start is not None:
+			sections[name].append("\n".join(lines[start:]).strip())
+	return sections
+
+
 def parseSection(name: str, source: str) -> list[str]:
 	"""Taken from docopt."""
-	pattern = re.compile(
-		"^([^\n]*" + name + "[^\n]*\n?(?:[ \t].*?(?:\n|$))*)",
-		re.IGNORECASE | re.MULTILINE,
-	)
-	return [s.strip() for s in pattern.findall(source)]
+	return tokenize(source, (name,))[name]
+
+
+def defaultValue(description: str) -> str:
+	"""Get the value of the first "[default: value]" in an option description.
+
+	Matches as docopt does (the value runs to the last "]" on the line), without the regex
+	backtracking over every "[default: " on a line that has no "]".
+	"""
+	for line in description.split("\n"):
+		matched = DEFAULT_PATTERN.search(line)
+		if matched is not None:
+			end = line.rfind("]")
+			if end >= matched.end():
+				return line[matched.end() : end]
+	return ""
 
 
 def parse(optionDescription: str) -> tuple[str, str, int, Any, str]:
@@ -86,27 +147,43 @@ def parse(optionDescription: str) -> tuple[str, str, int, Any, str]:
 		else:
 			argcount = 1
 	if argcount > 0:
-		matched = re.findall(r"\[default: (.*)\]", description, flags=re.IGNORECASE)
-		value = matched[0] if matched else ""
+		value = defaultValue(description)
 	return (short, long, argcount, value, description.strip())
 
 
-def parseOpt(doc: Any) -> list[tuple[str, str, int, Any, str]]:
-	"""Parse an option help text, adapted from docopt."""
-	defaults = []
-	for _section in parseSection("options:", doc):
-		_, _, section = _section.partition(":")
-		split = re.split(r"\n[ \t]*(-\S+?)", "\n" + section)[1:]
-		split = [s1 + s2 for s1, s2 in zip(split[::2], split[1::2])]
-		options = [parse(s) for s in split if s.startswith("-")]
-		defaults += options
-	return defaults
+def splitOptions(section: str) -> Iterator[str]:
+	"""Split the body of an options section into the text of each option.
 
+	An option starts at a line whose first non blank is "-" followed by a non space, the
+	lines after it (up to the next option) are part of its description.
 
-def parsePos(doc: str) -> list[tuple[str, str]]:
-	"""Parse positional arguments from docstring."""
+	:param str section: the section, less the header up to the first ":"
+	:yield str: the text of each option, from its first "-"
+	"""
+	current: list[str] = []
+	for line in section.split("\n"):
+		stripped = line.lstrip(" \t")
+		if stripped[:1] == "-" and len(stripped) > 1 and not stripped[1].isspace():
+			if current:
+				yield "\n".join(current)
+			current = [stripped]
+		elif current:
+			current.append(line)
+	if current:
+		yield "\n".join(current)
+
+
+def options(sections: list[str]) -> list[tuple[str, str, int, Any, str]]:
+	"""Parse the options in each options section."""
+	return [
+		parse(option) for section in sections for option in splitOptions(section.partition(":")[2])
+	]
+
+
+def positionals(sections: list[str]) -> list[tuple[str, str]]:
+	"""Parse the positional argument of each arguments section."""
 	defaults = []
-	for _section in parseSection("arguments:", doc):
+	for _section in sections:
 		_, _, section = _section.partition(":")
 		defaults.append(
 			tuple(col.strip() for col in section.strip().partition("  ") if len(col.strip()) > 0)
@@ -114,6 +191,24 @@ def parsePos(doc: str) -> list[tuple[str, str]]:
 	return defaults
 
 
+def parseOpt(doc: Any) -> list[tuple[str, str, int, Any, str]]:
+	"""Parse an option help text, adapted from docopt."""
+	return options(parseSection(OPTIONS, doc))
+
+
+def parsePos(doc: str) -> list[tuple[str, str]]:
+	"""Parse positional arguments from docstring."""
+	return positionals(parseSection(ARGUMENTS, doc))
+
+
+def fingerprint(parser: Any) -> str:
+	"""Describe everything about a parser that affects the result of convert.
+
+	Used as the key for the build spec cache, for docopt this is the docstring itself.
+	"""
+	return str(parser)
+
+
 def convert(parser: Any) -> ParserRep:
 	"""Convert getopt to a dict.
 
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from typing import Generator
+from typing import Any, Generator
 
 from cli2gui.models import Group, Item, ItemType, ParserRep
 
@@ -61,6 +61,14 @@ def process(
 	return [Group(name=groupName, arg_items=list(categorize(group)), groups=[])]
 
 
+def fingerprint(parser: tuple[list[str], list[str]]) -> Any:
+	"""Describe everything about a parser that affects the result of convert.
+
+	Used as the key for the build spec cache, for getopt these are the short and long args.
+	"""
+	return repr(parser)
+
+
 def convert(parser: tuple[list[str], list[str]]) -> ParserRep:
 	"""Convert getopt to a dict.
 
@@ -7,7 +7,7 @@ pylint and pylance both want me to not access protected methods - I know better
 from __future__ import annotations
 
 import optparse
-from typing import Generator
+from typing import Any, Generator
 
 from cli2gui.models import Group, Item, ItemType, ParserRep
 
@@ -70,6 +70,35 @@ def categorize(actions: list[optparse.Option]) -> Generator[Item, None, None]:
 			yield actionToJson(action, ItemType.Text)
 
 
+def fingerprint(parser: optparse.OptionParser) -> tuple[Any, ...]:
+	"""Describe everything about a parser that affects the result of convert.
+
+	Used as the key for the build spec cache.
+	"""
+
+	def describe(options: list[optparse.Option]) -> list[tuple[Any, ...]]:
+		return [
+			(
+				option._long_opts,
+				option._short_opts,
+				option.action,
+				option.dest,
+				option.type,
+				option.nargs,
+				repr(option.choices),  # type: ignore[general-type-issues]
+				repr(option.default),
+				option.help,
+				option.metavar,
+			)
+			for option in options
+		]
+
+	return (
+		describe(parser.option_list),
+		[(group.title, describe(group.option_list)) for group in parser.option_groups],
+	)
+
+
 def convert(parser: optparse.OptionParser) -> ParserRep:
 	"""Convert argparse to a dict.
 
@@ -0,0 +1,160 @@
+"""Record how long each phase of cli2gui takes, written as a Chrome trace.
+
+Off unless CLI2GUI_TRACE is set to a file path, or trace_file is passed to the decorator.
+Spans are kept in memory and written to the file when the program exits, open it in
+https://ui.perfetto.dev or chrome://tracing. Recorded spans:
+
+- decorator: the decorated function (or Click2Gui) from its call until it returns or exits
+- createFromParser, and convert with the converter in cli2gui.tojson (including the
+subcommands converted when selected) and whether the build spec cache was hit
+- get_base24_theme and loadBackend (importing the gui)
+- addItemsAndGroups and buildRows (dearpygui builds the rows as they scroll into view)
+- first frame: the first frame drawn (dearpygui) or the window being finalized (pysimplegui)
+- argFormat and run_function (for each run, on the worker thread)
+
+Batch rows run in worker processes, which are not traced.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+TRACE_ENV = "CLI2GUI_TRACE"
+
+_lock = threading.Lock()
+# Complete ("X") events of the Trace Event Format, and the name of each thread seen
+_events: list[dict[str, Any]] = []
+_threads: dict[int, str] = {}
+# File to write to, None while tracing is off
+_state: dict[str, Any] = {"path": None, "registered": False}
+
+Function = TypeVar("Function", bound=Callable[..., Any])
+
+
+def enabled() -> bool:
+	"""Is tracing on."""
+	return _state["path"] is not None
+
+
+def enable(path: str | Path) -> None:
+	"""Start recording spans, written to path when the program exits (see write).
+
+	:param str | Path path: file to write the trace to
+	"""
+	with _lock:
+		_state["path"] = str(path)
+		if not _state["registered"]:
+			atexit.register(write)
+			_state["registered"] = True
+
+
+def enableFromEnvironment() -> None:
+	"""Enable tracing if CLI2GUI_TRACE is set, in the main process only (so batch worker
+	processes do not overwrite the trace).
+	"""
+	import multiprocessing
+
+	path = os.environ.get(TRACE_ENV, "")
+	if path and multiprocessing.parent_process() is None:
+		enable(path)
+
+
+def now() -> float:
+	"""Get the time in microseconds, the unit of the trace."""
+	return time.perf_counter_ns() / 1000
+
+
+def record(name: str, start: float, args: dict[str, Any] | None = None) -> None:
+	"""Record a span that started at start (from now) and ends now.
+
+	:param str name: name of the span
+	:param float start: start time from now()
+	:param dict[str, Any] | None args: shown with the span. Defaults to None
+	"""
+	end = now()
+	ident = threading.get_ident()
+	event = {
+		"name": name,
+		"cat": "cli2gui",
+		"ph": "X",
+		"ts": start,
+		"dur": end - start,
+		"pid": os.getpid(),
+		"tid": ident,
+		"args": args or {},
+	}
+	with _lock:
+		_events.append(event)
+		_threads[ident] = threading.current_thread().name
+
+
+@contextlib.contextmanager
+def span(name: str, **args: Any) -> Iterator[dict[str, Any]]:
+	"""Record the time taken by the body of the with block, if tracing is on.
+
+	:param str name: name of the span
+	:param Any args: shown with the span
+	:yield dict[str, Any]: the args, more can be added in the with block
+	"""
+	if _state["path"] is None:
+		yield args
+		return
+	start = now()
+	try:
+		yield args
+	finally:
+		record(name, start, args)
+
+
+def traced(name: str) -> Callable[[Function], Function]:
+	"""Decorate a function to record a span for each call, if tracing is on.
+
+	:param str name: name of the span
+	:return Callable[[Function], Function]: the decorator
+	"""
+
+	def decorate(function: Function) -> Function:
+		@functools.wraps(function)
+		def wrapper(*args: Any, **kwargs: Any) -> Any:
+			if _state["path"] is None:
+				return function(*args, **kwargs)
+			start = now()
+			try:
+				return function(*args, **kwargs)
+			finally:
+				record(name, start)
+
+		return wrapper  # type: ignore[return-value]
+
+	return decorate
+
+
+def write(path: str | Path | None = None) -> None:
+	"""Write the spans recorded so far as a Chrome trace (json).
+
+	:param str | Path | None path: file to write to. Defaults to the file given to enable
+	"""
+	path = path or _state["path"]
+	if path is None:
+		return
+	with _lock:
+		events = list(_events)
+		threads = dict(_threads)
+	pid = os.getpid()
+	metadata = [
+		{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "cli2gui"}},
+		*(
+			{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+			for tid, name in threads.items()
+		),
+	]
+	trace = {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+	Path(path).write_text(json.dumps(trace), encoding="utf-8")
@@ -0,0 +1,46 @@
+"""Tests for argparse2json, run with: python -m pytest tests/argparse/test_argparse2json.py"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import warnings
+from pathlib import Path
+
+THISDIR = str(Path(__file__).resolve().parent)
+sys.path.insert(0, str(Path(THISDIR).parent.parent))
+from cli2gui.tojson import argparse2json
+
+
+def nestedParser(title: str = "inner") -> argparse.ArgumentParser:
+	"""Get a parser with an argument group nested in another."""
+	parser = argparse.ArgumentParser(prog="nested")
+	outer = parser.add_argument_group("outer")
+	outer.add_argument("--outer")
+	with warnings.catch_warnings():
+		# Nesting argument groups is deprecated since python 3.11
+		warnings.simplefilter("ignore", DeprecationWarning)
+		inner = outer.add_argument_group(title)
+	inner.add_argument("--inner")
+	return parser
+
+
+def test_fingerprint_equal() -> None:
+	"""Parsers built the same way have the same fingerprint."""
+	assert argparse2json.fingerprint(nestedParser()) == argparse2json.fingerprint(nestedParser())
+
+
+def test_fingerprint_nested_groups() -> None:
+	"""Changes to a nested group change the fingerprint, so a cached spec is not reused."""
+	renamed = nestedParser(title="renamed")
+	assert argparse2json.fingerprint(renamed) != argparse2json.fingerprint(nestedParser())
+
+
+def test_convert_nested_groups() -> None:
+	"""Nested groups are converted to nested Groups."""
+	outer = next(
+		group for group in argparse2json.convert(nestedParser()).widgets if group.name == "outer"
+	)
+	assert [item.dest for item in outer.arg_items] == ["outer"]
+	assert [group.name for group in outer.groups] == ["inner"]
+	assert [item.dest for item in outer.groups[0].arg_items] == ["inner"]
@@ -0,0 +1,49 @@
+"""Tests a parser with subcommands served to a web browser.
+
+Open the address printed on start, run this on a headless machine and forward the port
+with ssh -L to use it from another.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+THISDIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(THISDIR.parent.parent))
+from cli2gui import Cli2Gui
+
+
+def handle(args: argparse.Namespace) -> None:
+	"""Handle the args, printing a line every so often to show the output streaming."""
+	for step in range(args.steps):
+		print(f"step {step + 1}/{args.steps} - {args}")
+		time.sleep(0.5)
+
+
+@Cli2Gui(
+	run_function=handle,
+	menu={"File": f"{THISDIR}/file.md"},
+	gui="browser",
+)
+def cli() -> None:
+	"""Cli entrypoint."""
+	parser = argparse.ArgumentParser(description="this is an example parser served to a browser")
+	parser.add_argument("--steps", type=int, default=5, help="lines to print")
+	parser.add_argument("--verbose", action="store_true", help="print more")
+	commands = parser.add_subparsers(dest="command", help="command to run")
+
+	build = commands.add_parser("build", help="build the project")
+	build.add_argument("target", help="target to build")
+	build.add_argument("--mode", choices=["debug", "release"], help="build mode")
+
+	clean = commands.add_parser("clean", help="remove build files")
+	clean.add_argument("--all", action="store_true", help="remove everything")
+
+	args = parser.parse_args()
+	handle(args)
+
+
+cli()
@@ -0,0 +1,49 @@
+import argparse
+import sys
+from pathlib import Path
+
+THISDIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(THISDIR.parent.parent))
+from cli2gui import Cli2Gui
+
+
+def run(args: argparse.Namespace) -> None:
+	print(args)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="this is an example parser with nested commands")
+	parser.add_argument("--verbose", action="store_true", help="print more")
+	commands = parser.add_subparsers(dest="command", help="command to run")
+
+	remote = commands.add_parser("remote", help="manage remotes")
+	remote.add_argument("--timeout", type=int, default=30, help="timeout in seconds")
+	remoteCommands = remote.add_subparsers(dest="remote_command")
+
+	add = remoteCommands.add_parser("add", aliases=["new"], help="add a remote")
+	add.add_argument("name", help="name of the remote")
+	add.add_argument("url", help="url of the remote")
+	add.set_defaults(action="add")
+
+	remove = remoteCommands.add_parser("remove", help="remove a remote")
+	remove.add_argument("name", help="name of the remote")
+	remove.add_argument("--force", action="store_true", help="remove even if in use")
+	remove.set_defaults(action="remove")
+
+	log = commands.add_parser("log", help="show the log")
+	log.add_argument("--limit", type=int, default=10, help="number of entries")
+	log.add_argument("--output", type=argparse.FileType("w"), help="write the log here")
+
+	args = parser.parse_args()
+	run(args)
+
+
+decorator_function = Cli2Gui(
+	run_function=run,
+	auto_enable=True,
+)
+
+gui = decorator_function(main)
+
+if __name__ == "__main__":
+	gui()
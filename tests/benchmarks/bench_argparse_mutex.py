@@ -0,0 +1,90 @@
+"""Benchmark how argparse2json scales with the number of actions and mutex groups.
+
+For each size, a parser is generated with that many actions spread over a few argument
+groups, with every tenth action starting a mutually exclusive group of three. Times
+argparse2json.reapplyMutexGroups on its own and the whole of argparse2json.convert.
+
+Run with: python tests/benchmarks/bench_argparse_mutex.py [--sizes 10 100 ...] [--repeat N]
+Prints one json object per line.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+THISDIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(THISDIR.parent.parent))
+
+from cli2gui.tojson import argparse2json
+
+
+def makeParser(count: int) -> argparse.ArgumentParser:
+	"""Build a parser with count actions, about a third of which are in mutex groups."""
+	parser = argparse.ArgumentParser(prog="bench", add_help=False)
+	groups = [parser.add_argument_group(f"group {index}") for index in range(4)]
+	index = 0
+	while index < count:
+		group = groups[index % len(groups)]
+		if index % 10 == 0:
+			mutex = group.add_mutually_exclusive_group()
+			for _ in range(min(3, count - index)):
+				mutex.add_argument(f"--mutex-{index}", action="store_true")
+				index += 1
+		else:
+			group.add_argument(f"--arg-{index}")
+			index += 1
+	return parser
+
+
+def timeit(function: object, repeat: int) -> float:
+	"""Get the median time of repeat calls to function."""
+	times = []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		function()
+		times.append(time.perf_counter() - start)
+	return statistics.median(times)
+
+
+def main() -> None:
+	"""Run the benchmark."""
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+	parser.add_argument("--repeat", type=int, default=5)
+	args = parser.parse_args()
+
+	for size in args.sizes:
+		benchParser = makeParser(size)
+		mutexGroups = benchParser._mutually_exclusive_groups  # noqa: SLF001
+
+		def reapply(benchParser: argparse.ArgumentParser = benchParser) -> None:
+			rawGroups = [
+				argparse2json.extractRawGroups(group)
+				for group in benchParser._action_groups  # noqa: SLF001
+				if group._group_actions  # noqa: SLF001
+			]
+			argparse2json.reapplyMutexGroups(benchParser._mutually_exclusive_groups, rawGroups)  # noqa: SLF001
+
+		print(
+			json.dumps(
+				{
+					"bench": "argparse_mutex",
+					"actions": size,
+					"mutex_groups": len(mutexGroups),
+					"reapply_median_s": timeit(reapply, args.repeat),
+					"convert_median_s": timeit(
+						lambda benchParser=benchParser: argparse2json.convert(benchParser),
+						args.repeat,
+					),
+				}
+			)
+		)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,85 @@
+"""Benchmark the cost of loading each GUI backend.
+
+Each measurement runs in a fresh interpreter so import caches do not carry over. "eager"
+imports both wrappers up front (what cli2gui.application.application used to do), "lazy"
+loads only the selected backend through cli2gui.gui.registry.
+
+Run with: python tests/benchmarks/bench_backends.py [--repeat N]
+Prints one json object per line.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+THISDIR = Path(__file__).resolve().parent
+ROOT = str(THISDIR.parent.parent)
+
+EAGER = """
+import time
+t = time.perf_counter()
+import cli2gui.application.application
+from cli2gui.gui.dearpygui_wrapper import DearPyGuiWrapper
+from cli2gui.gui.pysimplegui_wrapper import PySimpleGUIWrapper
+print(time.perf_counter() - t)
+"""
+
+LAZY = """
+import time
+t = time.perf_counter()
+import cli2gui.application.application
+from cli2gui.gui import registry
+registry.loadBackend({gui!r})
+print(time.perf_counter() - t)
+"""
+
+
+def measure(code: str, repeat: int) -> dict[str, float] | None:
+	"""Run code in a fresh interpreter repeat times, code prints the time it took."""
+	times = []
+	for _ in range(repeat):
+		proc = subprocess.run(
+			[sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT, check=False
+		)
+		if proc.returncode != 0:
+			return None
+		times.append(float(proc.stdout.strip().splitlines()[-1]))
+	return {"median_s": statistics.median(times), "min_s": min(times)}
+
+
+def main() -> None:
+	"""Run the benchmark."""
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--repeat", type=int, default=5)
+	args = parser.parse_args()
+
+	print(
+		json.dumps(
+			{
+				"bench": "backend_load",
+				"mode": "eager",
+				**(measure(EAGER, args.repeat) or {"skipped": True}),
+			}
+		)
+	)
+	for gui in ("dearpygui", "freesimplegui", "pysimplegui"):
+		result = measure(LAZY.format(gui=gui), args.repeat)
+		print(
+			json.dumps(
+				{
+					"bench": "backend_load",
+					"mode": "lazy",
+					"gui": gui,
+					**(result or {"skipped": True}),
+				}
+			)
+		)
+
+
+if __name__ == "__main__":
+	main()
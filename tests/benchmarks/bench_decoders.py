@@ -0,0 +1,105 @@
+"""Benchmark formatting the values of a form for the run_function.
+
+Compares keys that encode the type of each item (dest, SEP and type, parsed into a decoder
+on every run) with plain dest keys and a table of decoders built once with
+application2args.buildDecoders. Both produce the same argparse.Namespace.
+
+Run with: python tests/benchmarks/bench_decoders.py [--sizes 10 100 ...] [--repeat N]
+Prints one json object per line.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+THISDIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(THISDIR.parent.parent))
+
+from cli2gui.application import application2args
+from cli2gui.models import SEP, Group, Item, ItemType, ParserType
+
+TYPES = [ItemType.Text, ItemType.Int, ItemType.Bool, ItemType.Float, ItemType.Path]
+VALUES = {
+	ItemType.Text: "text",
+	ItemType.Int: "42",
+	ItemType.Bool: True,
+	ItemType.Float: "1.5",
+	ItemType.Path: "some/path",
+}
+
+
+def makeItems(count: int) -> list[Item]:
+	"""Build count items of mixed types."""
+	return [
+		Item(
+			type=TYPES[index % len(TYPES)],
+			display_name=f"arg_{index}",
+			commands=[f"--arg-{index}"],
+			help="",
+			dest=f"arg_{index}",
+			default=None,
+		)
+		for index in range(count)
+	]
+
+
+def timeit(function: Any, repeat: int) -> float:
+	"""Get the median time of repeat calls to function."""
+	times = []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		function()
+		times.append(time.perf_counter() - start)
+	return statistics.median(times)
+
+
+def main() -> None:
+	"""Run the benchmark."""
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+	parser.add_argument("--repeat", type=int, default=20)
+	args = parser.parse_args()
+
+	for size in args.sizes:
+		items = makeItems(size)
+		groups = [Group(name="arguments", arg_items=items, groups=[])]
+		encoded = {f"{item.dest}{SEP}{item.type}": VALUES[item.type] for item in items}
+		plain = {item.dest: VALUES[item.type] for item in items}
+		decoders = application2args.buildDecoders(groups)
+		assert application2args.argFormat(encoded, ParserType.ARGPARSE) == (
+			application2args.argFormat(plain, ParserType.ARGPARSE, decoders)
+		)
+
+		print(
+			json.dumps(
+				{
+					"bench": "decoders",
+					"items": size,
+					"string_keys_median_s": timeit(
+						lambda encoded=encoded: application2args.argFormat(
+							encoded, ParserType.ARGPARSE
+						),
+						args.repeat,
+					),
+					"decoders_median_s": timeit(
+						lambda plain=plain, decoders=decoders: application2args.argFormat(
+							plain, ParserType.ARGPARSE, decoders
+						),
+						args.repeat,
+					),
+					"build_decoders_s": timeit(
+						lambda groups=groups: application2args.buildDecoders(groups), args.repeat
+					),
+				}
+			)
+		)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,73 @@
+"""Benchmark how docopt2json scales with the size of the usage text.
+
+For each size, a usage text with that many options is generated (as bench_startup does)
+along with texts that are slow for a backtracking regex (a line of unclosed
+"[default: ", a long indented line, many headers). Times docopt2json.tokenize on its
+own and the whole of docopt2json.convert.
+
+Run with: python tests/benchmarks/bench_docopt.py [--sizes 100 1000 ...] [--repeat N]
+Prints one json object per line.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+THISDIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(THISDIR.parent.parent))
+
+from cli2gui.tojson import docopt2json
+from tests.benchmarks.bench_startup import makeDocopt
+
+TEXTS: dict[str, Callable[[int], str]] = {
+	"generated": lambda count: makeDocopt(count)["selfParser"],
+	"unclosed_defaults": lambda count: "Options:\n  --a=<x>  " + "[default: " * count + "\n",
+	"long_indented_line": lambda count: "Options:\n  --a  x\n" + " " * (count * 40) + "\n",
+	"many_headers": lambda count: "Options:\n" * count,
+}
+
+
+def timeit(function: Callable[[], Any], repeat: int) -> float:
+	"""Get the median time of repeat calls to function."""
+	times = []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		function()
+		times.append(time.perf_counter() - start)
+	return statistics.median(times)
+
+
+def main() -> None:
+	"""Run the benchmark."""
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+	parser.add_argument("--texts", nargs="+", choices=list(TEXTS), default=list(TEXTS))
+	parser.add_argument("--repeat", type=int, default=10)
+	args = parser.parse_args()
+
+	for name in args.texts:
+		for size in args.sizes:
+			text = TEXTS[name](size)
+			tokenize = timeit(lambda text=text: docopt2json.tokenize(text), args.repeat)
+			convert = timeit(lambda text=text: docopt2json.convert(text), args.repeat)
+			print(
+				json.dumps(
+					{
+						"text": name,
+						"size": size,
+						"chars": len(text),
+						"tokenize_ms": round(tokenize * 1000, 3),
+						"convert_ms": round(convert * 1000, 3),
+					}
+				)
+			)
+
+
+if __name__ == "__main__":
+	main()
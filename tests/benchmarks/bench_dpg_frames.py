@@ -0,0 +1,161 @@
+"""Benchmark dearpygui frame time as the number of arguments grows.
+
+Each size runs in a fresh interpreter which builds a form with that many arguments, of
+mixed types and help of one to three lines (so rows differ in height), and records:
+
+- layout_s: time to create the primary window (only the rows in view are built)
+- widgets: number of dpg items once laid out, and widgets_max the most while scrolling
+- scroll_median_s / scroll_max_s: time to show the rows in view (RowList.update) for each
+step of scrolling the list from top to bottom
+- frame_median_s / frame_max_s: frame time (with buildRows) for each step of the same
+scroll
+
+Frames need a display; run headless on Linux with:
+
+	xvfb-run -a python tests/benchmarks/bench_dpg_frames.py
+
+Without one frame times are null. Prints one json object per size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+THISDIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(THISDIR.parent.parent))
+
+
+def makeBuildSpec(count: int) -> Any:
+	"""Build a FullBuildSpec with count arguments of mixed types."""
+	from cli2gui.models import FullBuildSpec, Group, Item, ItemType
+
+	types = [ItemType.Text, ItemType.Int, ItemType.Bool, ItemType.Float, ItemType.File]
+	items = [
+		Item(
+			type=types[index % len(types)],
+			display_name=f"arg_{index}",
+			commands=[f"--arg-{index}"],
+			help="\n".join(f"help for argument {index}" for _ in range(1 + index % 3)),
+			dest=f"arg_{index}",
+			default=None,
+		)
+		for index in range(count)
+	]
+	return FullBuildSpec(
+		run_function=print,
+		parser="argparse",
+		gui="dearpygui",
+		theme="",
+		darkTheme="",
+		image="",
+		program_name="bench",
+		program_description="",
+		max_args_shown=5,
+		menu="",
+		parser_description="",
+		widgets=[Group(name="arguments", arg_items=items, groups=[])],
+	)
+
+
+def child(count: int, frames: int) -> dict[str, Any]:
+	"""Time the layout and frames for one size, in this (fresh) interpreter."""
+	import dearpygui.dearpygui as dpg
+
+	from cli2gui.gui import helpers
+	from cli2gui.gui.dearpygui_wrapper import DearPyGuiWrapper
+
+	buildSpec = makeBuildSpec(count)
+	wrapper = DearPyGuiWrapper(helpers.get_base24_theme("", ""))
+	wrapper.setupContext()
+	start = time.perf_counter()
+	close = wrapper.createWindow(
+		buildSpec,
+		lambda: None,
+		lambda _values, _decoders: None,
+		lambda _values, _decoders, _path: [],
+	)
+	result: dict[str, Any] = {"layout_s": time.perf_counter() - start}
+
+	result["widgets"] = len(dpg.get_all_items())
+
+	# Scroll the list from top to bottom in steps
+	rowList = wrapper.rowLists[0]
+	steps = [
+		(rowList.contentHeight - rowList.height) * step / max(1, frames - 1)
+		for step in range(frames)
+	]
+	scrollTimes = []
+	widgets = 0
+	for scroll in steps:
+		start = time.perf_counter()
+		rowList.update(scroll)
+		scrollTimes.append(time.perf_counter() - start)
+		widgets = max(widgets, len(dpg.get_all_items()))
+	result.update(
+		{
+			"widgets_max": widgets,
+			"scroll_median_s": statistics.median(scrollTimes),
+			"scroll_max_s": max(scrollTimes),
+			"frame_median_s": None,
+			"frame_max_s": None,
+		}
+	)
+
+	display = sys.platform in ("win32", "darwin") or bool(
+		os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")
+	)
+	if display:
+		wrapper.showViewport(buildSpec, close)
+		dpg.render_dearpygui_frame()
+		frameTimes = []
+		for scroll in steps:
+			dpg.set_y_scroll(rowList.window, scroll)
+			start = time.perf_counter()
+			wrapper.buildRows()
+			dpg.render_dearpygui_frame()
+			frameTimes.append(time.perf_counter() - start)
+		result.update(
+			{"frame_median_s": statistics.median(frameTimes), "frame_max_s": max(frameTimes)}
+		)
+	dpg.destroy_context()
+	return {"display": display, **result}
+
+
+def main() -> None:
+	"""Run each size in a fresh interpreter."""
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+	parser.add_argument(
+		"--frames", type=int, default=120, help="scroll steps (frames) to time per size"
+	)
+	parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+	args = parser.parse_args()
+
+	if args.child is not None:
+		print(json.dumps(child(args.child, args.frames)))
+		return
+
+	for size in args.sizes:
+		proc = subprocess.run(
+			[sys.executable, __file__, "--child", str(size), "--frames", str(args.frames)],
+			capture_output=True,
+			text=True,
+			check=False,
+		)
+		try:
+			result = json.loads(proc.stdout.strip().splitlines()[-1])
+		except (IndexError, json.JSONDecodeError):
+			result = {"status": "error", "reason": proc.stderr.strip()[-500:]}
+		print(json.dumps({"bench": "dpg_frames", "args": size, **result}), flush=True)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,75 @@
+"""Benchmark the overhead of cli2gui when the GUI is disabled (no --cli2gui).
+
+Each scenario runs in a fresh interpreter and reports the time spent inside the scenario
+(perf_counter) along with the wall time of the whole process, compared with a bare
+interpreter running "pass".
+
+Run with: python tests/benchmarks/bench_import.py [--repeat N]
+Prints one json object per line.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+THISDIR = Path(__file__).resolve().parent
+ROOT = str(THISDIR.parent.parent)
+
+SCENARIOS = {
+	"bare": "import time\nt = time.perf_counter()\npass\nprint(time.perf_counter() - t)",
+	"import": """
+import time
+t = time.perf_counter()
+import cli2gui
+print(time.perf_counter() - t)
+""",
+	"decorated_disabled": """
+import time
+t = time.perf_counter()
+from cli2gui import Cli2Gui
+
+@Cli2Gui(run_function=print)
+def cli():
+	return None
+
+cli()
+print(time.perf_counter() - t)
+""",
+}
+
+
+def measure(code: str, repeat: int) -> dict[str, float]:
+	"""Run code in a fresh interpreter repeat times, code prints the time it took."""
+	inner, wall = [], []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		proc = subprocess.run(
+			[sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT, check=True
+		)
+		wall.append(time.perf_counter() - start)
+		inner.append(float(proc.stdout.strip().splitlines()[-1]))
+	return {"median_s": statistics.median(inner), "wall_median_s": statistics.median(wall)}
+
+
+def main() -> None:
+	"""Run the benchmark."""
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--repeat", type=int, default=10)
+	args = parser.parse_args()
+
+	bare = None
+	for name, code in SCENARIOS.items():
+		result = measure(code, args.repeat)
+		bare = bare or result
+		result["wall_overhead_s"] = result["wall_median_s"] - bare["wall_median_s"]
+		print(json.dumps({"bench": "import", "scenario": name, **result}))
+
+
+if __name__ == "__main__":
+	main()
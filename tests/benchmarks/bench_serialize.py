@@ -0,0 +1,111 @@
+"""Benchmark loading a build spec from json against converting the parser.
+
+For each parser and size a parser with that many arguments is converted
+(decorators.createFromParser, with the build spec cache disabled), written with
+serialize.dumps and read back with serialize.loads, using orjson if installed and json.
+
+argparse converts in a few microseconds per argument, so loading is mostly of use for the
+slower converters (eg. docopt, which parses the usage text) and for tools other than
+cli2gui that want the spec without importing the program.
+
+Run with: python tests/benchmarks/bench_serialize.py [--sizes 10 100 ...] [--repeat N]
+Prints one json object per line.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+THISDIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(THISDIR.parent.parent))
+os.environ["CLI2GUI_NO_CACHE"] = "1"
+
+from cli2gui import serialize
+from cli2gui.decorators import createFromParser
+from cli2gui.models import BuildSpec
+from tests.benchmarks.bench_startup import makeParser
+
+
+def timeit(function: Any, repeat: int) -> float:
+	"""Get the median time of repeat calls to function."""
+	times = []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		function()
+		times.append(time.perf_counter() - start)
+	return statistics.median(times)
+
+
+def stdlibJson() -> tuple[Any, Any]:
+	"""Get the json dumps/ loads that serialize falls back to without orjson."""
+	return (
+		lambda data: json.dumps(data, separators=(",", ":"), sort_keys=True).encode("utf-8"),
+		json.loads,
+	)
+
+
+def main() -> None:
+	"""Run the benchmark."""
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+	parser.add_argument("--parsers", nargs="+", default=["argparse", "docopt"])
+	parser.add_argument("--repeat", type=int, default=20)
+	args = parser.parse_args()
+
+	for parserName in args.parsers:
+		for size in args.sizes:
+			print(json.dumps(bench(parserName, size, args.repeat)), flush=True)
+
+
+def bench(parserName: str, size: int, repeat: int) -> dict[str, Any]:
+	"""Time converting, dumping and loading one parser."""
+	buildSpec = BuildSpec(
+		run_function=print,
+		parser=parserName,
+		gui="dearpygui",
+		theme="",
+		darkTheme="",
+		image="",
+		program_name="bench",
+		program_description="",
+		max_args_shown=5,
+		menu="",
+	)
+	source = makeParser(parserName, size)["selfParser"]
+
+	def convert() -> Any:
+		return createFromParser(source, (), {}, "bench", buildSpec)
+
+	spec = convert()
+	data = serialize.dumps(spec)
+	assert serialize.loads(data).widgets == spec.widgets
+	result: dict[str, Any] = {
+		"bench": "serialize",
+		"parser": parserName,
+		"args": size,
+		"bytes": len(data),
+		"convert_s": timeit(convert, repeat),
+	}
+	orjsonInstalled = serialize.jsonLib()[1] is not json.loads
+	for name, (dumps, loads) in (
+		("orjson" if orjsonInstalled else "json", serialize.jsonLib()),
+		("json", stdlibJson()),
+	):
+		result[f"{name}_dumps_s"] = timeit(
+			lambda dumps=dumps: dumps(serialize.encodeSpec(spec)), repeat
+		)
+		result[f"{name}_loads_s"] = timeit(
+			lambda loads=loads: serialize.decodeSpec(loads(data)), repeat
+		)
+	return result
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,321 @@
+"""End to end start-up benchmark for every parser x gui combination.
+
+Each combination runs in a fresh interpreter, which records how long each phase takes:
+
+- import: import cli2gui (decorators, helpers and the backend registry)
+- conversion: decorators.createFromParser (the build spec cache is disabled unless --cache)
+- theme: helpers.get_base24_theme (loads --theme if given)
+- backend: load the gui backend through the registry and create the wrapper
+- layout: build the widgets (dpg: context + primary window, psg: createLayout, browser:
+  renderPage)
+- first_frame: show the window and draw one frame (needs a display, else null), for the
+  browser start the server and get the page once
+
+These follow the order of a real launch.
+
+The parsers are generated here (rather than using the scenarios in tests/<parser>/, which
+launch a window on import) with --args arguments each.
+
+Run headless on Linux under a virtual framebuffer with:
+
+	xvfb-run -a python tests/benchmarks/bench_startup.py --output startup.json
+
+Prints one json object per combination, and writes them all to --output if given.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import urllib.parse
+from pathlib import Path
+from typing import Any
+
+THISDIR = Path(__file__).resolve().parent
+ROOT = str(THISDIR.parent.parent)
+sys.path.insert(0, ROOT)
+
+PARSERS = ["argparse", "dephell_argparse", "optparse", "docopt", "getopt", "click"]
+GUIS = ["dearpygui", "freesimplegui", "pysimplegui", "pysimpleguiqt", "pysimpleguiweb", "browser"]
+
+# Kinds of argument makeArgparse adds, in turn
+TEXT, INT, FLAG, CHOICE, FILE = range(5)
+KINDS = 5
+
+
+def makeArgparse(count: int, module: Any = argparse) -> dict[str, Any]:
+	"""Build an argparse (or dephell_argparse) parser with count arguments."""
+	cls = module.ArgumentParser if module is argparse else module.Parser
+	parser = cls(prog="bench", description="benchmark parser")
+	group = parser.add_argument_group("group")
+	mutex = group.add_mutually_exclusive_group()
+	mutex.add_argument("--mutex-a", action="store_true", help="mutex a")
+	mutex.add_argument("--mutex-b", action="store_true", help="mutex b")
+	for index in range(count):
+		kind = index % KINDS
+		if kind == TEXT:
+			parser.add_argument(f"--text-{index}", help=f"text {index}")
+		elif kind == INT:
+			parser.add_argument(f"--int-{index}", type=int, default=index, help="int")
+		elif kind == FLAG:
+			parser.add_argument(f"--flag-{index}", action="store_true", help="flag")
+		elif kind == CHOICE:
+			parser.add_argument(f"--choice-{index}", choices=["a", "b", "c"], help="choice")
+		else:
+			parser.add_argument(f"--file-{index}", type=argparse.FileType("r"), help="file")
+	return {"selfParser": parser, "argsParser": ()}
+
+
+def makeOptparse(count: int) -> dict[str, Any]:
+	"""Build an optparse parser with count arguments."""
+	import optparse
+
+	parser = optparse.OptionParser()
+	for index in range(count):
+		if index % 2:
+			parser.add_option(f"--flag-{index}", action="store_true", help="flag")
+		else:
+			parser.add_option(f"--text-{index}", help="text")
+	return {"selfParser": parser, "argsParser": ()}
+
+
+def makeDocopt(count: int) -> dict[str, Any]:
+	"""Build a docopt usage text with count options."""
+	options = "\n".join(
+		f"  --opt-{index}=<v>    option {index} [default: {index}]"
+		if index % 2
+		else f"  --flag-{index}    flag {index}"
+		for index in range(count)
+	)
+	doc = f"Usage:\n  bench [options] PATH\n\nArguments:\n  PATH    a path\n\nOptions:\n{options}\n"
+	return {"selfParser": doc, "argsParser": ()}
+
+
+def makeGetopt(count: int) -> dict[str, Any]:
+	"""Build getopt short and long args, count in total."""
+	letters = "abcdefghijklmnopqrstuvwxyz"
+	short = "".join(
+		letters[index % 26] + (":" if index % 2 else "") for index in range(min(26, count))
+	)
+	long = [f"long-{index}" + ("=" if index % 2 else "") for index in range(max(0, count - 26))]
+	return {"selfParser": [], "argsParser": (short, long)}
+
+
+def makeClick(count: int) -> dict[str, Any]:
+	"""Build a click command with count options."""
+	import click
+
+	params = []
+	for index in range(count):
+		if index % 3 == 0:
+			params.append(click.Option([f"--count-{index}"], default=1, help="int"))
+		elif index % 3 == 1:
+			params.append(click.Option([f"--name-{index}"], help="text"))
+		else:
+			params.append(click.Option([f"--choice-{index}"], type=click.Choice(["a", "b"])))
+	return {"runFunction": click.Command("bench", params=params, callback=lambda **_: None)}
+
+
+def makeParser(parser: str, count: int) -> dict[str, Any]:
+	"""Build the parser for a parser type."""
+	if parser == "dephell_argparse":
+		import dephell_argparse
+
+		return makeArgparse(count, dephell_argparse)
+	return {
+		"argparse": makeArgparse,
+		"optparse": makeOptparse,
+		"docopt": makeDocopt,
+		"getopt": makeGetopt,
+		"click": makeClick,
+	}[parser](count)
+
+
+def hasDisplay() -> bool:
+	"""Can a window be shown."""
+	return sys.platform in ("win32", "darwin") or bool(
+		os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")
+	)
+
+
+async def getPage(wrapper: Any, fullSpec: Any) -> None:
+	"""Start the server of the browser gui and get the page once."""
+	await wrapper.start(fullSpec, lambda _values, _decoders: None)
+	try:
+		url = urllib.parse.urlsplit(wrapper.url)
+		reader, writer = await asyncio.open_connection(url.hostname, url.port)
+		writer.write(f"GET /?{url.query} HTTP/1.1\r\nHost: {url.netloc}\r\n\r\n".encode())
+		await writer.drain()
+		await reader.read()
+		writer.close()
+	finally:
+		await wrapper.close()
+
+
+def child(parser: str, gui: str, count: int, theme: str) -> dict[str, Any]:
+	"""Time each phase for one combination, in this (fresh) interpreter."""
+	phases: dict[str, float | None] = {}
+	clock = time.perf_counter()
+
+	def mark(phase: str) -> None:
+		nonlocal clock
+		now = time.perf_counter()
+		phases[phase] = now - clock
+		clock = now
+
+	try:
+		source = makeParser(parser, count)
+	except ImportError as error:
+		return {"status": "skipped", "reason": str(error)}
+	clock = time.perf_counter()
+
+	from cli2gui.decorators import createFromParser
+	from cli2gui.gui import helpers, registry
+	from cli2gui.models import BuildSpec
+
+	mark("import")
+
+	guiName = gui.replace("pysimplegui", "psg").replace("freesimplegui", "fsg")
+	buildSpec = BuildSpec(
+		run_function=source.get("runFunction", print),
+		parser=parser,
+		gui=guiName,
+		theme="",
+		darkTheme="",
+		image="",
+		program_name="bench",
+		program_description="",
+		max_args_shown=5,
+		menu="",
+	)
+	fullSpec = createFromParser(
+		source.get("selfParser"), source.get("argsParser", ()), {}, "bench", buildSpec
+	)
+	mark("conversion")
+
+	base24Theme = helpers.get_base24_theme(theme, theme)
+	mark("theme")
+
+	try:
+		wrapper = registry.loadBackend(gui)(base24Theme, guiName)
+	except ImportError as error:
+		return {"status": "skipped", "reason": str(error)}
+	mark("backend")
+
+	display = hasDisplay()
+	if gui == "dearpygui":
+		import dearpygui.dearpygui as dpg
+
+		wrapper.setupContext()
+		close = wrapper.createWindow(
+			fullSpec,
+			lambda: None,
+			lambda _values, _decoders: None,
+			lambda _values, _decoders, _path: [],
+		)
+		mark("layout")
+		if display:
+			wrapper.showViewport(fullSpec, close)
+			dpg.render_dearpygui_frame()
+			mark("first_frame")
+		dpg.destroy_context()
+	elif gui == "browser":
+		wrapper.renderPage(fullSpec, "")
+		mark("layout")
+		asyncio.run(getPage(wrapper, fullSpec))
+		mark("first_frame")
+	else:
+		layout = wrapper.createLayout(buildSpec=fullSpec, menu="")
+		mark("layout")
+		if display:
+			window = wrapper.sg.Window("bench", layout, finalize=True)
+			window.read(timeout=0)
+			mark("first_frame")
+			window.close()
+	phases.setdefault("first_frame", None)
+	return {
+		"status": "ok",
+		"display": display,
+		"items": sum(len(group.arg_items) for group in fullSpec.widgets),
+		"phases": phases,
+	}
+
+
+def main() -> None:
+	"""Run every combination in a fresh interpreter and collect the results."""
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--parsers", nargs="+", default=PARSERS, choices=PARSERS)
+	parser.add_argument("--guis", nargs="+", default=GUIS, choices=GUIS)
+	parser.add_argument("--args", type=int, default=50, help="arguments per parser")
+	parser.add_argument("--theme", default="", help="base24 scheme file to load")
+	parser.add_argument("--cache", action="store_true", help="use the build spec and theme caches")
+	parser.add_argument("--output", help="write all results to this json file")
+	parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+	args = parser.parse_args()
+
+	if args.child:
+		print(json.dumps(child(args.child[0], args.child[1], args.args, args.theme)))
+		return
+
+	env = dict(os.environ)
+	if not args.cache:
+		env["CLI2GUI_NO_CACHE"] = "1"
+	results = []
+	for parserName in args.parsers:
+		for gui in args.guis:
+			start = time.perf_counter()
+			proc = subprocess.run(
+				[
+					sys.executable,
+					__file__,
+					"--child",
+					parserName,
+					gui,
+					"--args",
+					str(args.args),
+					"--theme",
+					args.theme,
+				],
+				capture_output=True,
+				text=True,
+				env=env,
+				check=False,
+			)
+			wall = time.perf_counter() - start
+			try:
+				result = json.loads(proc.stdout.strip().splitlines()[-1])
+			except (IndexError, json.JSONDecodeError):
+				result = {"status": "error", "reason": proc.stderr.strip()[-500:]}
+			result = {
+				"bench": "startup",
+				"parser": parserName,
+				"gui": gui,
+				"args": args.args,
+				"process_wall_s": wall,
+				**result,
+			}
+			results.append(result)
+			print(json.dumps(result), flush=True)
+
+	if args.output:
+		Path(args.output).write_text(
+			json.dumps(
+				{
+					"python": platform.python_version(),
+					"platform": platform.platform(),
+					"results": results,
+				},
+				indent=2,
+			),
+			encoding="utf-8",
+		)
+
+
+if __name__ == "__main__":
+	main()
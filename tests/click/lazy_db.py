@@ -0,0 +1,27 @@
+"""Subcommands of tests/click/test_group.py, imported when db is selected."""
+
+from __future__ import annotations
+
+import click
+
+
+@click.group()
+@click.option("--url", default="sqlite://", help="Database to use.")
+def db(url: str) -> None:
+	"""Manage the database."""
+	click.echo(f"url={url}")
+
+
+@db.command()
+@click.option("--dry-run", is_flag=True, default=False, help="Only print the changes.")
+@click.option("--steps", type=int, default=1, help="Number of migrations to run.")
+def migrate(*, dry_run: bool, steps: int) -> None:
+	"""Run the migrations."""
+	click.echo(f"migrate steps={steps} dry_run={dry_run}")
+
+
+@db.command()
+@click.option("--count", type=int, default=10, help="Rows to add.")
+def seed(count: int) -> None:
+	"""Add example rows."""
+	click.echo(f"seed count={count}")
@@ -0,0 +1,56 @@
+"""Tests a group with nested groups, whose subcommands are imported when selected.
+
+LazyGroup is from https://click.palletsprojects.com/en/8.1.x/complex/#lazily-loading-subcommands
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from pathlib import Path
+from typing import Any
+
+import click
+
+THISDIR = str(Path(__file__).resolve().parent)
+sys.path.insert(0, str(Path(THISDIR).parent.parent))
+from cli2gui import Click2Gui
+
+
+class LazyGroup(click.Group):
+	def __init__(
+		self, *args: Any, lazy_subcommands: dict[str, str] | None = None, **kwargs: Any
+	) -> None:
+		super().__init__(*args, **kwargs)
+		# {command name: "module.command object"}
+		self.lazy_subcommands = lazy_subcommands or {}
+
+	def list_commands(self, ctx: click.Context) -> list[str]:
+		return sorted([*super().list_commands(ctx), *self.lazy_subcommands])
+
+	def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+		if cmd_name in self.lazy_subcommands:
+			modname, _, cmdname = self.lazy_subcommands[cmd_name].rpartition(".")
+			return getattr(importlib.import_module(modname), cmdname)
+		return super().get_command(ctx, cmd_name)
+
+
+@click.group(cls=LazyGroup, lazy_subcommands={"db": "tests.click.lazy_db.db"})
+@click.option("--verbose", is_flag=True, default=False, help="Print more.")
+def cli(*, verbose: bool) -> None:
+	"""Manage the app."""
+	click.echo(f"verbose={verbose}")
+
+
+@cli.command()
+@click.option("--count", default=1, help="Number of greetings.")
+@click.option("--shout/--no-shout", default=True, help="Greet in upper case.")
+def hello(count: int, *, shout: bool) -> None:
+	"""Greet COUNT times."""
+	for _index in range(count):
+		click.echo("HELLO!" if shout else "Hello!")
+
+
+Click2Gui(run_function=cli)
+# ⬇️ This is how you call the function without a GUI
+# cli()
@@ -0,0 +1,86 @@
+"""Tests for docopt2json, run with: python -m pytest tests/docopt/test_docopt2json.py"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+THISDIR = str(Path(__file__).resolve().parent)
+sys.path.insert(0, str(Path(THISDIR).parent.parent))
+from cli2gui.tojson import docopt2json
+
+USAGE = """
+usage:
+  simple.py [-h] [--store STORE] [--count] PATH
+
+Arguments:
+  PATH            positional arg
+
+Options:
+  -h, --help            show this help message and exit
+  -s, --store STORE     optional arg store [default: store me]
+  --count               optional arg count
+  --choices {choice1,choice2}
+						optional arg store with choices
+"""
+
+# Inputs that a backtracking regex can be slow on (with the regex for defaults, the unclosed
+# defaults took 25s), the tokenizer is linear in each
+PATHOLOGICAL = {
+	"unclosed defaults": "Options:\n  --a=<x>  " + "[default: " * 20_000 + "\n",
+	"long indented line": "Options:\n  --a  x\n" + " " * 200_000 + "\n",
+	"long line of tabs": "Options:\n" + "\t" * 200_000 + "x\n",
+	"many headers": "Options:\n" * 20_000,
+	"many dashes": "Options:\n  " + "-" * 200_000 + "\n",
+	"header words": "options: " * 20_000 + "\n",
+}
+
+
+def test_sections() -> None:
+	"""Sections run from the header to the first line that is not indented."""
+	assert docopt2json.tokenize(USAGE) == {
+		docopt2json.OPTIONS: [USAGE[USAGE.index("Options:") :].strip()],
+		docopt2json.ARGUMENTS: ["Arguments:\n  PATH            positional arg"],
+	}
+	assert docopt2json.parseSection("options:", "OPTIONS:\n  -a\n\n  -b") == ["OPTIONS:\n  -a"]
+
+
+def test_options() -> None:
+	"""Options with short and long names, arguments, defaults and wrapped help."""
+	assert docopt2json.parseOpt(USAGE) == [
+		("-h", "--help", 0, False, "show this help message and exit"),
+		("-s", "--store", 1, "store me", "optional arg store [default: store me]"),
+		("", "--count", 0, False, "optional arg count"),
+		("", "--choices", 1, "", ""),
+	]
+
+
+def test_positionals() -> None:
+	"""The positional argument of each arguments section."""
+	assert docopt2json.parsePos(USAGE) == [("PATH", "positional arg")]
+
+
+@pytest.mark.parametrize(
+	("description", "value"),
+	[
+		("[default: 1]", "1"),
+		("[DEFAULT: a] and [default: b]", "a] and [default: b"),
+		("[default: a\n[default: b]", "b"),
+		("[default: ", ""),
+		("no default", ""),
+	],
+)
+def test_default_value(description: str, value: str) -> None:
+	"""The value runs to the last "]" on the line, as with the docopt regex."""
+	assert docopt2json.defaultValue(description) == value
+
+
+@pytest.mark.parametrize("name", list(PATHOLOGICAL))
+def test_pathological(name: str) -> None:
+	"""Inputs that backtrack in a regex are parsed in well under a second."""
+	start = time.perf_counter()
+	docopt2json.convert(PATHOLOGICAL[name])
+	assert time.perf_counter() - start < 1
@@ -0,0 +1,66 @@
+"""Tests for the decorators, run with: python -m pytest tests/test_decorators.py"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing  # noqa: F401 (sets __mp_main__, as in a tool that uses it)
+import sys
+import types
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+THISDIR = str(Path(__file__).resolve().parent)
+sys.path.insert(0, str(Path(THISDIR).parent))
+from cli2gui import decorators
+from cli2gui.application import application
+
+
+@pytest.fixture
+def runs(monkeypatch: pytest.MonkeyPatch) -> list[Any]:
+	"""Run with --cli2gui, recording the build spec of each application.run."""
+	built: list[Any] = []
+	monkeypatch.setattr(sys, "argv", ["tool", decorators.DO_COMMAND])
+	monkeypatch.setattr(application, "run", built.append)
+	return built
+
+
+def decorated() -> Any:
+	"""Get a decorated argparse tool."""
+
+	@decorators.Cli2Gui(run_function=print)
+	def cli() -> None:
+		parser = argparse.ArgumentParser()
+		parser.add_argument("--count", type=int, help="count")
+		parser.parse_args()
+
+	return cli
+
+
+def test_runs_gui(runs: list[Any]) -> None:
+	"""The parser call builds a spec and runs the gui."""
+	decorated()()
+	assert len(runs) == 1
+	assert [item.dest for item in runs[0].widgets[0].arg_items] == ["count"]
+
+
+def test_click_runs_gui(runs: list[Any]) -> None:
+	"""Click2Gui runs the gui."""
+	click = pytest.importorskip("click")
+
+	@click.command()
+	@click.option("--count", type=int, default=1)
+	def cli(count: int) -> None:
+		print(count)
+
+	decorators.Click2Gui(run_function=cli)
+	assert len(runs) == 1
+
+
+def test_worker_import(runs: list[Any], monkeypatch: pytest.MonkeyPatch) -> None:
+	"""A spawned worker importing the tool again does not run the gui."""
+	monkeypatch.setitem(sys.modules, "__mp_main__", types.ModuleType("__mp_main__"))
+	assert decorators.isWorkerImport()
+	assert decorated()() is None
+	assert runs == []
@@ -0,0 +1,54 @@
+"""Tests for the inspector, run with: python -m pytest tests/test_inspector.py"""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+THISDIR = str(Path(__file__).resolve().parent)
+sys.path.insert(0, str(Path(THISDIR).parent))
+from cli2gui import inspector
+
+
+def inspect(capsys: pytest.CaptureFixture[str], target: str) -> dict[str, Any]:
+	"""Run python -m cli2gui inspect --json on a target, without the layout phase."""
+	assert inspector.main(["inspect", "--json", "--no-layout", target]) == 0
+	return json.loads(capsys.readouterr().out)
+
+
+def test_argparse(capsys: pytest.CaptureFixture[str]) -> None:
+	"""A decorated function is called until it parses its arguments."""
+	report = inspect(capsys, "tests.argparse.test_simple:cli")
+	assert report["parser"] == "argparse"
+	assert report["program_name"] == "test_simple"
+	assert report["items_by_type"] == {"Text": 3, "Bool": 2, "File": 1, "Int": 1, "Choice": 1}
+	assert report["timings_s"]["layout"] is None
+
+
+def test_click(capsys: pytest.CaptureFixture[str]) -> None:
+	"""A click tool that runs the gui when it is imported."""
+	pytest.importorskip("click")
+	report = inspect(capsys, "tests.click.test_simple")
+	assert report["parser"] == "click"
+	assert report["program_name"] == "test_simple"
+	assert report["items_by_type"] == {"Int": 1, "Text": 1}
+
+
+def test_restores_state(capsys: pytest.CaptureFixture[str]) -> None:
+	"""sys.argv and application.run are restored, so the tool is not left stubbed."""
+	from cli2gui.application import application
+
+	argv, run = list(sys.argv), application.run
+	inspect(capsys, "tests.argparse.test_simple:cli")
+	assert sys.argv == argv
+	assert application.run is run
+
+
+def test_no_spec(capsys: pytest.CaptureFixture[str]) -> None:
+	"""A module that does not build a spec on import is reported, not raised."""
+	assert inspector.main(["inspect", "json"]) == 1
+	assert "did not build a spec" in capsys.readouterr().err
@@ -0,0 +1,88 @@
+"""Tests for intercepting parser calls, run with: python -m pytest tests/test_interception.py"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+THISDIR = str(Path(__file__).resolve().parent)
+sys.path.insert(0, str(Path(THISDIR).parent))
+from cli2gui import decorators, interception
+from cli2gui.application import application
+
+ORIGINAL = vars(argparse.ArgumentParser)["parse_args"]
+
+
+def countParser() -> argparse.ArgumentParser:
+	"""Get a parser with a single --count option."""
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--count", type=int)
+	return parser
+
+
+def test_other_threads(monkeypatch: pytest.MonkeyPatch) -> None:
+	"""A thread parsing while a decorated call is running gets the original parse_args."""
+	built: list[Any] = []
+	monkeypatch.setattr(sys, "argv", ["tool", decorators.DO_COMMAND])
+	monkeypatch.setattr(application, "run", built.append)
+	parsed: list[Any] = []
+
+	@decorators.Cli2Gui(run_function=print)
+	def cli() -> None:
+		thread = threading.Thread(
+			target=lambda: parsed.append(countParser().parse_args(["--count", "2"]))
+		)
+		thread.start()
+		thread.join()
+		countParser().parse_args()
+
+	cli()
+	assert parsed == [argparse.Namespace(count=2)]
+	assert len(built) == 1
+
+
+def test_handler_per_context() -> None:
+	"""Only calls made in the context get the handler, the innermost one when nested."""
+	with interception.intercept(lambda *_args: "outer"):
+		assert countParser().parse_args([]) == "outer"
+		with interception.intercept(lambda *_args: "inner"):
+			assert countParser().parse_args([]) == "inner"
+		assert countParser().parse_args([]) == "outer"
+	assert countParser().parse_args([]) == argparse.Namespace(count=None)
+
+
+def test_reference_counting() -> None:
+	"""The wrappers stay installed until the last user uninstalls them."""
+	interception.install()
+	interception.install()
+	try:
+		interception.uninstall()
+		assert vars(argparse.ArgumentParser)["parse_args"] is not ORIGINAL
+	finally:
+		interception.uninstall()
+	assert vars(argparse.ArgumentParser)["parse_args"] is ORIGINAL
+	# Installed again from scratch by the next user
+	with interception.intercept(lambda *_args: "handled"):
+		assert countParser().parse_args([]) == "handled"
+	assert vars(argparse.ArgumentParser)["parse_args"] is ORIGINAL
+
+
+def test_inherited_attribute(monkeypatch: pytest.MonkeyPatch) -> None:
+	"""A parser function a class inherits is deleted from the class on uninstall, rather
+	than set on it (eg. dephell_argparse.Parser inherits parse_args).
+	"""
+
+	class Parser(argparse.ArgumentParser):
+		pass
+
+	monkeypatch.setattr(interception, "targets", lambda: [(Parser, "parse_args")])
+	with interception.intercept(lambda *_args: "handled"):
+		assert "parse_args" in vars(Parser)
+		assert Parser().parse_args([]) == "handled"
+	assert "parse_args" not in vars(Parser)
+	assert Parser.parse_args is ORIGINAL
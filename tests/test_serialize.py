@@ -0,0 +1,117 @@
+"""Tests for build spec serialization, run with: python -m pytest tests/test_serialize.py"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+THISDIR = str(Path(__file__).resolve().parent)
+sys.path.insert(0, str(Path(THISDIR).parent))
+from cli2gui import serialize
+from cli2gui.decorators import createFromParser
+from cli2gui.models import BuildSpec, FullBuildSpec
+
+
+@pytest.fixture(autouse=True)
+def noCache(monkeypatch: pytest.MonkeyPatch) -> None:
+	"""Convert the parsers every time, without writing to the build spec cache."""
+	monkeypatch.setenv("CLI2GUI_NO_CACHE", "1")
+
+
+def convert(parser: argparse.ArgumentParser) -> FullBuildSpec:
+	"""Convert an argparse parser to a build spec."""
+	buildSpec = BuildSpec(
+		run_function=print,
+		parser="argparse",
+		gui="dearpygui",
+		theme="",
+		darkTheme="",
+		image="",
+		program_name="test",
+		program_description="",
+		max_args_shown=5,
+		menu="",
+	)
+	return createFromParser(parser, (), {}, "test", buildSpec)
+
+
+def defaults(spec: FullBuildSpec) -> dict[str, Any]:
+	"""Get the default of each item of a spec, by dest."""
+	return {item.dest: item.default for group in spec.widgets for item in group.arg_items}
+
+
+@pytest.mark.parametrize(
+	"value",
+	[
+		"text",
+		1.5,
+		None,
+		[1, "two"],
+		(1, (2, 3)),
+		Path("some/file.txt"),
+		{"key": (1, 2)},
+		{1: "int key", (2, 3): "tuple key"},
+		{"$type": "not a tag"},
+	],
+)
+def test_value_round_trip(value: Any) -> None:
+	"""Values json has no type for are tagged and decoded to an equal value."""
+	assert serialize.decodeValue(serialize.encodeValue(value)) == value
+
+
+@pytest.mark.parametrize("name", serialize.STDIO_NAMES)
+def test_stdio_round_trip(name: str) -> None:
+	"""The standard streams are stored by name, and loaded as the current stream."""
+	encoded = serialize.encodeValue(getattr(sys, name))
+	assert encoded == {"$type": "stdio", "value": name}
+	assert serialize.decodeValue(encoded) is getattr(sys, name)
+	assert serialize.encodeValue(getattr(sys, f"__{name}__")) == encoded
+
+
+def test_unknown_value() -> None:
+	"""Other objects cannot be stored."""
+	with pytest.raises(TypeError, match="Cannot store a object"):
+		serialize.encodeValue(object())
+	with pytest.raises(ValueError, match="Unknown \\$type"):
+		serialize.decodeValue({"$type": "stdio", "value": "stdlog"})
+
+
+def test_file_type_default_stdout() -> None:
+	"""A spec with a FileType("w") argument defaulting to sys.stdout dumps and loads."""
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--out", type=argparse.FileType("w"), default=sys.stdout)
+	parser.add_argument("--size", type=int, nargs=2, default=(1, 2))
+	parser.add_argument("--mode", choices=["fast", "slow"], default="fast")
+	spec = convert(parser)
+	loaded = serialize.loads(serialize.dumps(spec))
+	assert loaded.widgets == spec.widgets
+	assert defaults(loaded) == {"out": sys.stdout, "size": (1, 2), "mode": "fast"}
+
+
+def test_spec_round_trip(tmp_path: Path) -> None:
+	"""A spec with subcommands is written to a file and read back whole."""
+	parser = argparse.ArgumentParser(description="tool")
+	parser.add_argument("--verbose", action="store_true")
+	commands = parser.add_subparsers(dest="command")
+	add = commands.add_parser("add", help="add a file")
+	add.add_argument("file", type=Path)
+	spec = convert(parser)
+	serialize.dump(spec, tmp_path / "spec.json")
+	loaded = serialize.load(tmp_path / "spec.json", resolve=True)
+	assert loaded.run_function is print
+	assert loaded.parser_description == spec.parser_description
+	assert loaded.widgets == spec.widgets
+	assert [node.name for node in loaded.subcommands] == ["add"]
+	assert loaded.subcommands[0].load().widgets == spec.subcommands[0].load().widgets
+
+
+def test_newer_version() -> None:
+	"""Documents from a newer version are rejected."""
+	document = serialize.encodeSpec(convert(argparse.ArgumentParser()))
+	document["version"] = serialize.SCHEMA_VERSION + 1
+	with pytest.raises(ValueError, match="not supported"):
+		serialize.decodeSpec(document)